@@ -0,0 +1,60 @@
+"""
+Compara la memoria por usuario y el costo de user_exists entre el diccionario
+original de UserManager y CompactStorage
+
+Uso: python benchmark_storage.py [numero_de_usuarios]
+"""
+import base64
+import hashlib
+import os
+import sys
+import timeit
+import tracemalloc
+from storage import CompactStorage, InMemoryStorage
+
+
+def sha256_hex(i):
+    return hashlib.sha256(f"clave{i}".encode()).hexdigest()
+
+
+def scrypt_encoded(i):
+    # Mismo formato que ScryptHasher sin pagar la KDF en cada usuario
+    salt = base64.b64encode(os.urandom(16)).decode().rstrip("=")
+    digest = base64.b64encode(os.urandom(32)).decode().rstrip("=")
+    return f"scrypt$16384$8$1${salt}${digest}"
+
+
+def measure(factory, n, make_hash):
+    usernames = [f"usuario_{i:08d}" for i in range(n)]
+    hashes = [make_hash(i) for i in range(n)]
+    tracemalloc.start()
+    storage = factory()
+    for username, hashed in zip(usernames, hashes):
+        # Copias nuevas para contar las cadenas que retiene el almacenamiento
+        storage["".join(username)] = "".join(hashed)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    misses = [f"intruso_{i:08d}" for i in range(1000)]
+    hits = usernames[:1000]
+    miss_time = timeit.timeit(lambda: [m in storage for m in misses], number=10) / 10_000
+    hit_time = timeit.timeit(lambda: [h in storage for h in hits], number=10) / 10_000
+    return size / n, hit_time * 1e6, miss_time * 1e6
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    cases = [
+        ("dict + sha256 hex (original)", dict, sha256_hex),
+        ("InMemoryStorage + scrypt", InMemoryStorage, scrypt_encoded),
+        ("CompactStorage + sha256", lambda: CompactStorage(n), sha256_hex),
+        ("CompactStorage + scrypt", lambda: CompactStorage(n), scrypt_encoded),
+    ]
+    print(f"{n} usuarios")
+    print(f"{'almacenamiento':32} {'bytes/usuario':>14} {'existe (us)':>12} {'no existe (us)':>15}")
+    for name, factory, make_hash in cases:
+        per_user, hit, miss = measure(factory, n, make_hash)
+        print(f"{name:32} {per_user:14.1f} {hit:12.3f} {miss:15.3f}")
+
+
+if __name__ == "__main__":
+    main()
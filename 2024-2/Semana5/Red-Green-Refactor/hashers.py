@@ -0,0 +1,268 @@
+"""
+Funciones de derivación de claves (KDF) para almacenar contraseñas
+
+Cada hasher produce una cadena codificada con el algoritmo, sus parámetros,
+la sal y el hash, por ejemplo:
+
+    scrypt$16384$8$1$<sal>$<hash>
+    pbkdf2_sha256$600000$<sal>$<hash>
+
+Así se puede verificar una contraseña con los parámetros con los que fue
+guardada y detectar cuándo conviene actualizarla a los parámetros actuales.
+"""
+import base64
+import hashlib
+import hmac
+import os
+import struct
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+
+
+def _b64encode(data):
+    return base64.b64encode(data).decode("ascii").rstrip("=")
+
+
+def _b64decode(text):
+    return base64.b64decode(text + "=" * (-len(text) % 4))
+
+
+class PasswordHasher(ABC):
+    """Interfaz común de los hashers de contraseñas"""
+
+    algorithm = None
+
+    @abstractmethod
+    def hash(self, password, salt=None):
+        """Devuelve la contraseña derivada y codificada con sus parámetros"""
+
+    @abstractmethod
+    def verify(self, password, encoded):
+        """Devuelve True si la contraseña corresponde al hash codificado
+
+        Un hash mal formado no corresponde a ninguna contraseña: devuelve False.
+        """
+
+    @abstractmethod
+    def params(self, encoded=None):
+        """Devuelve los parámetros del hash codificado o, sin él, los actuales"""
+
+    def needs_update(self, encoded):
+        """Devuelve True si el hash no usa este algoritmo o sus parámetros"""
+        if identify_algorithm(encoded) != self.algorithm:
+            return True
+        return self.params(encoded) != self.params()
+
+
+class SHA256Hasher(PasswordHasher):
+    """SHA-256 sin sal, el formato heredado (solo para verificar y migrar)"""
+
+    algorithm = "sha256"
+
+    def hash(self, password, salt=None):
+        return hashlib.sha256(password.encode()).hexdigest()
+
+    def verify(self, password, encoded):
+        try:
+            return hmac.compare_digest(self.hash(password), encoded)
+        except TypeError:
+            # compare_digest rechaza cadenas con caracteres no ASCII
+            return False
+
+    def params(self, encoded=None):
+        return ()
+
+
+class PBKDF2Hasher(PasswordHasher):
+    """PBKDF2-HMAC-SHA256 con sal aleatoria"""
+
+    algorithm = "pbkdf2_sha256"
+
+    def __init__(self, iterations=600_000, salt_size=16):
+        self.iterations = iterations
+        self.salt_size = salt_size
+
+    def hash(self, password, salt=None):
+        salt = salt if salt is not None else os.urandom(self.salt_size)
+        digest = self._derive(password, salt, self.iterations)
+        return f"{self.algorithm}${self.iterations}${_b64encode(salt)}${_b64encode(digest)}"
+
+    def verify(self, password, encoded):
+        try:
+            _, iterations, salt, digest = encoded.split("$")
+            expected = _b64decode(digest)
+            candidate = self._derive(password, _b64decode(salt), int(iterations))
+        except ValueError:
+            return False
+        return hmac.compare_digest(candidate, expected)
+
+    def params(self, encoded=None):
+        if encoded is None:
+            return (self.iterations,)
+        return (int(encoded.split("$")[1]),)
+
+    @staticmethod
+    def _derive(password, salt, iterations):
+        return hashlib.pbkdf2_hmac("sha256", password.encode(), salt, iterations)
+
+
+class ScryptHasher(PasswordHasher):
+    """scrypt, una KDF que además de lenta es costosa en memoria"""
+
+    algorithm = "scrypt"
+
+    def __init__(self, n=2**14, r=8, p=1, salt_size=16, dklen=32):
+        self.n = n
+        self.r = r
+        self.p = p
+        self.salt_size = salt_size
+        self.dklen = dklen
+
+    def hash(self, password, salt=None):
+        salt = salt if salt is not None else os.urandom(self.salt_size)
+        digest = self._derive(password, salt, self.n, self.r, self.p, self.dklen)
+        return (f"{self.algorithm}${self.n}${self.r}${self.p}$"
+                f"{_b64encode(salt)}${_b64encode(digest)}")
+
+    def verify(self, password, encoded):
+        try:
+            _, n, r, p, salt, digest = encoded.split("$")
+            expected = _b64decode(digest)
+            candidate = self._derive(password, _b64decode(salt),
+                                     int(n), int(r), int(p), len(expected))
+        except ValueError:
+            # También cubre parámetros que scrypt rechaza, como un n que no es potencia de 2
+            return False
+        return hmac.compare_digest(candidate, expected)
+
+    def params(self, encoded=None):
+        if encoded is None:
+            return (self.n, self.r, self.p, self.dklen)
+        _, n, r, p, _, digest = encoded.split("$")
+        return (int(n), int(r), int(p), len(_b64decode(digest)))
+
+    @staticmethod
+    def _derive(password, salt, n, r, p, dklen):
+        # maxmem debe cubrir los 128 * n * r bytes que usa el algoritmo
+        return hashlib.scrypt(password.encode(), salt=salt, n=n, r=r, p=p,
+                              maxmem=256 * n * r + 1024 * 1024, dklen=dklen)
+
+
+HASHERS = {
+    SHA256Hasher.algorithm: SHA256Hasher,
+    PBKDF2Hasher.algorithm: PBKDF2Hasher,
+    ScryptHasher.algorithm: ScryptHasher,
+}
+
+
+def identify_algorithm(encoded):
+    """Devuelve el nombre del algoritmo de un hash codificado"""
+    if "$" not in encoded:
+        return SHA256Hasher.algorithm
+    return encoded.split("$", 1)[0]
+
+
+_PACKED_ALGORITHMS = (SHA256Hasher.algorithm, PBKDF2Hasher.algorithm, ScryptHasher.algorithm)
+
+
+def pack_hash(encoded):
+    """Convierte un hash codificado en su forma binaria compacta
+
+    En lugar de hex o base64 se guardan los bytes crudos: un byte con el
+    algoritmo, sus parámetros como enteros, la sal y el hash. Los formatos
+    desconocidos se guardan tal cual tras el byte 0xFF.
+    """
+    algorithm = identify_algorithm(encoded)
+    if algorithm == SHA256Hasher.algorithm and len(encoded) == 64:
+        return b"\x00" + bytes.fromhex(encoded)
+    if algorithm == PBKDF2Hasher.algorithm:
+        _, iterations, salt, digest = encoded.split("$")
+        params = struct.pack(">I", int(iterations))
+    elif algorithm == ScryptHasher.algorithm:
+        _, n, r, p, salt, digest = encoded.split("$")
+        params = struct.pack(">IHH", int(n), int(r), int(p))
+    else:
+        return b"\xff" + encoded.encode()
+    salt = _b64decode(salt)
+    code = _PACKED_ALGORITHMS.index(algorithm)
+    return bytes([code]) + params + bytes([len(salt)]) + salt + _b64decode(digest)
+
+
+def unpack_hash(packed):
+    """Reconstruye el hash codificado a partir de pack_hash"""
+    code = packed[0]
+    if code == 0xFF:
+        return packed[1:].decode()
+    algorithm = _PACKED_ALGORITHMS[code]
+    if algorithm == SHA256Hasher.algorithm:
+        return packed[1:].hex()
+    if algorithm == PBKDF2Hasher.algorithm:
+        params = struct.unpack_from(">I", packed, 1)
+        offset = 5
+    else:
+        params = struct.unpack_from(">IHH", packed, 1)
+        offset = 9
+    salt_size = packed[offset]
+    salt = packed[offset + 1:offset + 1 + salt_size]
+    digest = packed[offset + 1 + salt_size:]
+    fields = [algorithm, *map(str, params), _b64encode(salt), _b64encode(digest)]
+    return "$".join(fields)
+
+
+class VerificationCache:
+    """Caché acotada y con expiración de verificaciones exitosas
+
+    Las entradas se indexan con un HMAC (con una clave propia del proceso) del
+    usuario, la contraseña y el hash almacenado, de modo que la caché nunca
+    guarda contraseñas en claro y cualquier cambio del hash la invalida.
+    """
+
+    def __init__(self, maxsize=1024, ttl=300.0, key=None, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._key = key if key is not None else os.urandom(32)
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _digest(self, username, password, encoded):
+        mac = hmac.new(self._key, digestmod=hashlib.sha256)
+        for part in (username, password, encoded):
+            data = part.encode()
+            mac.update(len(data).to_bytes(4, "big"))
+            mac.update(data)
+        return mac.digest()
+
+    def contains(self, username, password, encoded):
+        """Devuelve True si la verificación está en caché y no ha expirado"""
+        digest = self._digest(username, password, encoded)
+        with self._lock:
+            expires = self._entries.get(digest)
+            if expires is None:
+                return False
+            if expires <= self._clock():
+                del self._entries[digest]
+                return False
+            self._entries.move_to_end(digest)
+            return True
+
+    def add(self, username, password, encoded):
+        """Registra una verificación exitosa"""
+        if self.maxsize <= 0:
+            return
+        digest = self._digest(username, password, encoded)
+        with self._lock:
+            self._entries[digest] = self._clock() + self.ttl
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Vacía la caché"""
+        with self._lock:
+            self._entries.clear()
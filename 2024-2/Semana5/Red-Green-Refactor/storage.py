@@ -0,0 +1,319 @@
+"""
+Backends de almacenamiento de usuarios para UserManager
+
+Cada backend guarda pares (usuario, hash codificado) y ofrece, además del
+acceso individual, operaciones por lotes para importaciones masivas.
+"""
+import math
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from array import array
+from hashers import pack_hash, unpack_hash
+
+
+class UserStorage(ABC):
+    """Interfaz de almacenamiento de usuarios"""
+
+    @abstractmethod
+    def __contains__(self, username):
+        pass
+
+    @abstractmethod
+    def __getitem__(self, username):
+        pass
+
+    @abstractmethod
+    def __setitem__(self, username, hashed_password):
+        pass
+
+    @abstractmethod
+    def __len__(self):
+        pass
+
+    @abstractmethod
+    def existing(self, usernames):
+        """Devuelve el subconjunto de usernames que ya están almacenados"""
+
+    @abstractmethod
+    def insert_many(self, users):
+        """Inserta pares (usuario, hash) nuevos en una sola transacción"""
+
+
+class InMemoryStorage(UserStorage):
+    """Almacenamiento en un diccionario en memoria"""
+
+    def __init__(self):
+        self._users = {}
+
+    def __contains__(self, username):
+        return username in self._users
+
+    def __getitem__(self, username):
+        return self._users[username]
+
+    def __setitem__(self, username, hashed_password):
+        self._users[username] = hashed_password
+
+    def __len__(self):
+        return len(self._users)
+
+    def existing(self, usernames):
+        return self._users.keys() & set(usernames)
+
+    def insert_many(self, users):
+        self._users.update(users)
+
+
+class SQLiteStorage(UserStorage):
+    """Almacenamiento persistente en una base de datos SQLite"""
+
+    def __init__(self, path=":memory:"):
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS users ("
+                " username TEXT PRIMARY KEY,"
+                " password_hash TEXT NOT NULL)"
+            )
+
+    def __contains__(self, username):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM users WHERE username = ?", (username,)
+            ).fetchone()
+        return row is not None
+
+    def __getitem__(self, username):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT password_hash FROM users WHERE username = ?", (username,)
+            ).fetchone()
+        if row is None:
+            raise KeyError(username)
+        return row[0]
+
+    def __setitem__(self, username, hashed_password):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO users (username, password_hash) VALUES (?, ?)"
+                " ON CONFLICT(username) DO UPDATE SET password_hash = excluded.password_hash",
+                (username, hashed_password),
+            )
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM users").fetchone()[0]
+
+    def existing(self, usernames):
+        # Los candidatos van a una tabla temporal para resolverlos con un único JOIN
+        # en lugar de una consulta por usuario o un IN limitado en parámetros
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TEMP TABLE IF NOT EXISTS candidates (username TEXT PRIMARY KEY)"
+            )
+            self._conn.execute("DELETE FROM candidates")
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO candidates (username) VALUES (?)",
+                ((username,) for username in usernames),
+            )
+            rows = self._conn.execute(
+                "SELECT users.username FROM users JOIN candidates USING (username)"
+            ).fetchall()
+            self._conn.execute("DELETE FROM candidates")
+        return {row[0] for row in rows}
+
+    def insert_many(self, users):
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO users (username, password_hash) VALUES (?, ?)", users
+            )
+
+    def close(self):
+        """Cierra la conexión con la base de datos"""
+        self._conn.close()
+
+
+def _hash_pair(data):
+    # hash() de bytes es SipHash con semilla por proceso: rápido y suficiente
+    # para estructuras que solo viven en memoria
+    h = hash(data) & 0xFFFFFFFFFFFFFFFF
+    return h, (h >> 32) | 1
+
+
+class BloomFilter:
+    """Filtro de Bloom: indica si un elemento seguro no está o quizá está"""
+
+    def __init__(self, expected_items=1024, error_rate=0.01):
+        expected_items = max(1, expected_items)
+        self.num_bits = max(8, int(-expected_items * math.log(error_rate) / math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / expected_items * math.log(2)))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+
+    def _positions(self, h1, h2):
+        # Doble hashing: las k posiciones se derivan de dos hashes independientes
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add_hashes(self, h1, h2):
+        for position in self._positions(h1, h2):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def might_contain_hashes(self, h1, h2):
+        bits = self._bits
+        for position in self._positions(h1, h2):
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+    def add(self, data):
+        """Agrega bytes al filtro"""
+        self.add_hashes(*_hash_pair(data))
+
+    def might_contain(self, data):
+        """Devuelve False solo si los bytes nunca se agregaron"""
+        return self.might_contain_hashes(*_hash_pair(data))
+
+
+class CompactStorage(UserStorage):
+    """Almacenamiento en memoria compacto con prefiltro de Bloom
+
+    Los usuarios y sus hashes empaquetados (ver pack_hash) se guardan
+    consecutivos en un único bytearray; cada registro es
+    [largo usuario: 2 bytes][usuario UTF-8][largo hash: 1 byte][hash].
+    Un índice de direccionamiento abierto en un array de enteros apunta al
+    inicio de cada registro. Delante hay un filtro de Bloom, de modo que la
+    mayoría de los usuarios inexistentes se descartan sin tocar el índice.
+    Al cambiar un hash por otro de distinto largo el registro viejo queda
+    como basura, y el arena se compacta cuando la basura supera la mitad.
+    """
+
+    _EMPTY = -1
+    _MAX_LOAD = 0.7
+
+    def __init__(self, expected_users=1024, error_rate=0.01):
+        self._error_rate = error_rate
+        self._arena = bytearray()
+        self._slots = array("q")
+        self._count = 0
+        self._garbage = 0
+        self._lock = threading.RLock()
+        self._resize(expected_users)
+
+    def __len__(self):
+        return self._count
+
+    def __contains__(self, username):
+        with self._lock:
+            return self._lookup(username.encode()) != self._EMPTY
+
+    def __getitem__(self, username):
+        with self._lock:
+            offset = self._lookup(username.encode())
+            if offset == self._EMPTY:
+                raise KeyError(username)
+            packed = self._read_hash(offset)
+        return unpack_hash(packed)
+
+    def __setitem__(self, username, hashed_password):
+        name = username.encode()
+        packed = pack_hash(hashed_password)
+        if len(name) > 0xFFFF or len(packed) > 0xFF:
+            raise ValueError(f"El usuario '{username}' o su hash exceden el tamaño del registro")
+        with self._lock:
+            self._store(name, packed)
+
+    def existing(self, usernames):
+        return {username for username in set(usernames) if username in self}
+
+    def insert_many(self, users):
+        with self._lock:
+            for username, hashed_password in users:
+                self[username] = hashed_password
+
+    @property
+    def nbytes(self):
+        """Bytes ocupados por el arena, el índice y el filtro de Bloom"""
+        return (len(self._arena) + self._slots.itemsize * len(self._slots)
+                + len(self._bloom._bits))
+
+    def _store(self, name, packed):
+        h1, h2 = _hash_pair(name)
+        slot, offset = self._probe(h1, name)
+        if offset != self._EMPTY:
+            start = offset + 2 + len(name)
+            if self._arena[start] == len(packed):
+                # Mismo largo (p. ej. una nueva sal): se sobrescribe en el lugar
+                self._arena[start + 1:start + 1 + len(packed)] = packed
+                return
+            self._garbage += start + 1 + self._arena[start] - offset
+        else:
+            self._count += 1
+            self._bloom.add_hashes(h1, h2)
+        self._slots[slot] = self._append(name, packed)
+        if self._garbage * 2 > len(self._arena):
+            self._compact()
+        if self._count > len(self._slots) * self._MAX_LOAD:
+            self._resize(self._count * 2)
+
+    def _lookup(self, name):
+        """Devuelve el offset del registro del usuario o _EMPTY si no existe"""
+        h1, h2 = _hash_pair(name)
+        if not self._bloom.might_contain_hashes(h1, h2):
+            return self._EMPTY
+        return self._probe(h1, name)[1]
+
+    def _probe(self, h1, name):
+        """Devuelve (ranura, offset) del usuario o de la ranura libre donde iría"""
+        mask = len(self._slots) - 1
+        slot = h1 & mask
+        while True:
+            offset = self._slots[slot]
+            if offset == self._EMPTY or self._read_name(offset) == name:
+                return slot, offset
+            slot = (slot + 1) & mask
+
+    def _read_name(self, offset):
+        size = int.from_bytes(self._arena[offset:offset + 2], "little")
+        return self._arena[offset + 2:offset + 2 + size]
+
+    def _read_hash(self, offset):
+        start = offset + 2 + int.from_bytes(self._arena[offset:offset + 2], "little")
+        return bytes(self._arena[start + 1:start + 1 + self._arena[start]])
+
+    def _append(self, name, packed):
+        offset = len(self._arena)
+        self._arena += len(name).to_bytes(2, "little") + name + bytes([len(packed)]) + packed
+        return offset
+
+    def _compact(self):
+        """Copia solo los registros vigentes a un arena nuevo y actualiza el índice"""
+        arena = bytearray()
+        for slot, offset in enumerate(self._slots):
+            if offset == self._EMPTY:
+                continue
+            start = offset + 2 + int.from_bytes(self._arena[offset:offset + 2], "little")
+            self._slots[slot] = len(arena)
+            arena += self._arena[offset:start + 1 + self._arena[start]]
+        self._arena = arena
+        self._garbage = 0
+
+    def _resize(self, expected_users):
+        size = 8
+        while size * self._MAX_LOAD < expected_users:
+            size *= 2
+        slots = array("q", [self._EMPTY]) * size
+        bloom = BloomFilter(size, self._error_rate)
+        mask = size - 1
+        for offset in self._slots:
+            if offset == self._EMPTY:
+                continue
+            h1, h2 = _hash_pair(bytes(self._read_name(offset)))
+            slot = h1 & mask
+            while slots[slot] != self._EMPTY:
+                slot = (slot + 1) & mask
+            slots[slot] = offset
+            bloom.add_hashes(h1, h2)
+        self._slots = slots
+        self._bloom = bloom
@@ -0,0 +1,94 @@
+import pytest
+from hashers import (PBKDF2Hasher, ScryptHasher, SHA256Hasher, VerificationCache,
+                     identify_algorithm, pack_hash, unpack_hash)
+
+@pytest.mark.parametrize("hasher", [
+    PBKDF2Hasher(iterations=1000),
+    ScryptHasher(n=2**10),
+    SHA256Hasher(),
+])
+def test_verificar_contraseña(hasher):
+    # Arrange
+    encoded = hasher.hash("securepassword123")
+    
+    # Act & Assert
+    assert identify_algorithm(encoded) == hasher.algorithm
+    assert hasher.verify("securepassword123", encoded) is True
+    assert hasher.verify("wrongpassword", encoded) is False
+
+@pytest.mark.parametrize("hasher, encoded", [
+    (PBKDF2Hasher(iterations=1000), "pbkdf2_sha256$mil$c2Fs$aGFzaA"),
+    (PBKDF2Hasher(iterations=1000), "pbkdf2_sha256$1000$c2Fs"),
+    (ScryptHasher(n=2**10), "scrypt$1000$8$1$c2Fs$aGFzaA"),
+    (ScryptHasher(n=2**10), "scrypt$1024$8$1$c2F$aGFzaA"),
+    (SHA256Hasher(), "contraseña"),
+])
+def test_hash_mal_formado(hasher, encoded):
+    # Act & Assert
+    assert hasher.verify("clave", encoded) is False
+
+def test_scrypt_codifica_sus_parametros():
+    # Arrange
+    hasher = ScryptHasher(n=2**10, r=4, p=2)
+    
+    # Act
+    encoded = hasher.hash("clave", salt=b"sal")
+    
+    # Assert
+    assert encoded.startswith("scrypt$1024$4$2$c2Fs$")
+    assert hasher.params(encoded) == (1024, 4, 2, 32)
+    assert ScryptHasher(n=2**11).verify("clave", encoded) is True
+
+def test_necesita_actualizacion():
+    # Arrange
+    hasher = PBKDF2Hasher(iterations=2000)
+    
+    # Act & Assert
+    assert hasher.needs_update(hasher.hash("clave")) is False
+    assert hasher.needs_update(PBKDF2Hasher(iterations=1000).hash("clave")) is True
+    assert hasher.needs_update(SHA256Hasher().hash("clave")) is True
+
+def test_cache_expira_por_ttl():
+    # Arrange
+    ahora = [0.0]
+    cache = VerificationCache(ttl=10, clock=lambda: ahora[0])
+    cache.add("ana", "clave", "hash")
+    
+    # Act & Assert
+    assert cache.contains("ana", "clave", "hash") is True
+    assert cache.contains("ana", "otra", "hash") is False
+    ahora[0] = 10.0
+    assert cache.contains("ana", "clave", "hash") is False
+    assert len(cache) == 0
+
+def test_cache_acotada_descarta_la_menos_reciente():
+    # Arrange
+    cache = VerificationCache(maxsize=2)
+    cache.add("ana", "clave", "hash")
+    cache.add("beto", "clave", "hash")
+    cache.contains("ana", "clave", "hash")
+    
+    # Act
+    cache.add("carla", "clave", "hash")
+    
+    # Assert
+    assert cache.contains("ana", "clave", "hash") is True
+    assert cache.contains("beto", "clave", "hash") is False
+    assert len(cache) == 2
+
+@pytest.mark.parametrize("encoded", [
+    SHA256Hasher().hash("clave"),
+    PBKDF2Hasher(iterations=1000).hash("clave"),
+    ScryptHasher(n=2**10).hash("clave"),
+])
+def test_empaquetar_hash_en_binario(encoded):
+    # Act
+    packed = pack_hash(encoded)
+    
+    # Assert
+    assert unpack_hash(packed) == encoded
+    assert len(packed) < len(encoded)
+
+def test_empaquetar_formato_desconocido():
+    # Act & Assert
+    assert unpack_hash(pack_hash("argon2$formato$desconocido")) == "argon2$formato$desconocido"
@@ -0,0 +1,100 @@
+import pytest
+from hashers import PBKDF2Hasher, SHA256Hasher
+from storage import BloomFilter, CompactStorage, InMemoryStorage, SQLiteStorage
+
+@pytest.fixture(params=["memoria", "sqlite", "compacto"])
+def storage(request):
+    if request.param == "memoria":
+        yield InMemoryStorage()
+    elif request.param == "compacto":
+        yield CompactStorage(expected_users=2)
+    else:
+        storage = SQLiteStorage()
+        yield storage
+        storage.close()
+
+def test_guardar_y_leer_usuario(storage):
+    # Act
+    storage["kapumota"] = "hash1"
+    storage["kapumota"] = "hash2"
+    
+    # Assert
+    assert "kapumota" in storage
+    assert "ghostuser" not in storage
+    assert storage["kapumota"] == "hash2"
+    assert len(storage) == 1
+
+def test_leer_usuario_inexistente(storage):
+    # Act & Assert
+    with pytest.raises(KeyError):
+        storage["ghostuser"]
+
+def test_insertar_y_detectar_existentes_por_lote(storage):
+    # Arrange
+    storage.insert_many([("ana", "h1"), ("beto", "h2")])
+    
+    # Act
+    existentes = storage.existing(["beto", "carla", "ana", "beto"])
+    
+    # Assert
+    assert existentes == {"ana", "beto"}
+    assert len(storage) == 2
+
+def test_sqlite_persiste_en_disco(tmp_path):
+    # Arrange
+    path = tmp_path / "users.db"
+    storage = SQLiteStorage(path)
+    storage.insert_many([("ana", "h1")])
+    storage.close()
+    
+    # Act
+    reabierto = SQLiteStorage(path)
+    
+    # Assert
+    assert reabierto["ana"] == "h1"
+
+def test_compacto_conserva_hashes_al_crecer():
+    # Arrange
+    storage = CompactStorage(expected_users=2)
+    hashes = {f"usuário{i}": PBKDF2Hasher(iterations=1).hash(f"clave{i}") for i in range(200)}
+    
+    # Act
+    storage.insert_many(hashes.items())
+    storage["usuário7"] = SHA256Hasher().hash("nueva")
+    
+    # Assert
+    assert len(storage) == 200
+    assert storage["usuário7"] == SHA256Hasher().hash("nueva")
+    assert all(storage[name] == hashes[name] for name in hashes if name != "usuário7")
+    assert "usuário200" not in storage
+
+def test_compacto_no_crece_al_reemplazar_hashes():
+    # Arrange
+    storage = CompactStorage(expected_users=4)
+    hashes = [SHA256Hasher().hash("clave"), PBKDF2Hasher(iterations=1).hash("clave")]
+    for i in range(4):
+        storage[f"user{i}"] = hashes[0]
+    tamaño = storage.nbytes
+    
+    # Act
+    for vuelta in range(100):
+        for i in range(4):
+            storage[f"user{i}"] = hashes[(vuelta + i) % 2]
+    
+    # Assert
+    assert storage.nbytes <= 3 * tamaño
+    assert [storage[f"user{i}"] for i in range(4)] == [hashes[(99 + i) % 2] for i in range(4)]
+    assert len(storage) == 4
+
+def test_filtro_de_bloom_sin_falsos_negativos():
+    # Arrange
+    bloom = BloomFilter(expected_items=1000, error_rate=0.01)
+    for i in range(1000):
+        bloom.add(f"user{i}".encode())
+    
+    # Act
+    falsos_positivos = sum(bloom.might_contain(f"otro{i}".encode()) for i in range(1000))
+    
+    # Assert
+    assert all(bloom.might_contain(f"user{i}".encode()) for i in range(1000))
+    assert falsos_positivos < 50
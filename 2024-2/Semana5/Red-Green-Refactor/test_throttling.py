@@ -0,0 +1,119 @@
+import pytest
+from throttling import Throttle, TooManyAttemptsError
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def test_token_bucket_por_usuario():
+    # Arrange
+    clock = FakeClock()
+    throttle = Throttle(user_capacity=2, user_rate=1.0, clock=clock)
+    throttle.check("kapumota")
+    throttle.check("kapumota")
+    
+    # Act & Assert
+    with pytest.raises(TooManyAttemptsError) as exc_info:
+        throttle.check("kapumota")
+    assert str(exc_info.value) == "Demasiados intentos para el usuario 'kapumota'. Reintente en 1 s."
+    throttle.check("chaloZeta")
+    clock.now = 1.0
+    throttle.check("kapumota")
+
+def test_token_bucket_por_origen():
+    # Arrange
+    clock = FakeClock()
+    throttle = Throttle(source_capacity=2, source_rate=1.0, clock=clock)
+    throttle.check("ana", source="10.0.0.1")
+    throttle.check("beto", source="10.0.0.1")
+    
+    # Act & Assert
+    with pytest.raises(TooManyAttemptsError) as exc_info:
+        throttle.check("carla", source="10.0.0.1")
+    assert str(exc_info.value) == "Demasiados intentos desde el origen '10.0.0.1'. Reintente en 1 s."
+    throttle.check("carla", source="10.0.0.2")
+
+def test_bloqueo_exponencial_tras_fallos():
+    # Arrange
+    clock = FakeClock()
+    throttle = Throttle(max_failures=2, base_lockout=10, clock=clock)
+    throttle.record_failure("kapumota")
+    throttle.check("kapumota")
+    
+    # Act
+    throttle.record_failure("kapumota")
+    
+    # Assert
+    with pytest.raises(TooManyAttemptsError):
+        throttle.check("kapumota")
+    clock.now = 10.0
+    throttle.check("kapumota")
+    throttle.record_failure("kapumota")
+    clock.now = 29.0
+    with pytest.raises(TooManyAttemptsError):
+        throttle.check("kapumota")
+    clock.now = 30.0
+    throttle.check("kapumota")
+
+def test_exito_reinicia_fallos():
+    # Arrange
+    clock = FakeClock()
+    throttle = Throttle(max_failures=2, clock=clock)
+    throttle.record_failure("kapumota")
+    
+    # Act
+    throttle.record_success("kapumota")
+    throttle.record_failure("kapumota")
+    
+    # Assert
+    throttle.check("kapumota")
+
+def test_estado_acotado_y_con_expiracion():
+    # Arrange
+    clock = FakeClock()
+    throttle = Throttle(user_capacity=1, user_rate=1.0, max_lockout=5,
+                        max_entries=3, clock=clock)
+    
+    # Act
+    for i in range(10):
+        throttle.check(f"user{i}")
+    
+    # Assert
+    assert len(throttle.users) == 3
+    clock.now = 100.0
+    throttle.check("nuevo")
+    assert len(throttle.users) == 1
+
+def test_no_descarta_claves_bloqueadas():
+    # Arrange
+    clock = FakeClock()
+    throttle = Throttle(max_failures=1, base_lockout=60, max_entries=3, clock=clock)
+    throttle.check("victima")
+    throttle.record_failure("victima")
+    
+    # Act: muchos usuarios inventados llenan la tabla
+    for i in range(10):
+        throttle.check(f"falso{i}")
+    
+    # Assert
+    assert len(throttle.users) == 3
+    with pytest.raises(TooManyAttemptsError):
+        throttle.check("victima")
+
+def test_rechaza_claves_nuevas_si_todas_estan_bloqueadas():
+    # Arrange
+    clock = FakeClock()
+    throttle = Throttle(max_failures=1, base_lockout=60, max_entries=2, clock=clock)
+    for username in ("ana", "beto"):
+        throttle.check(username)
+        throttle.record_failure(username)
+    
+    # Act & Assert
+    with pytest.raises(TooManyAttemptsError) as exc_info:
+        throttle.check("carla")
+    assert "en curso" in str(exc_info.value)
+    clock.now = 60.0
+    throttle.check("carla")
@@ -15,7 +15,11 @@ def test_agregar_usuario_exitoso():
     assert manager.user_exists(username)
 """
 import pytest
-from user_manager import UserManager, UserAlreadyExistsError, UserNotFoundError
+from unittest.mock import patch
+from hashers import PBKDF2Hasher, SHA256Hasher
+from storage import InMemoryStorage, SQLiteStorage
+from throttling import Throttle
+from user_manager import UserManager, UserAlreadyExistsError, UserNotFoundError, TooManyAttemptsError
 
 def test_agregar_usuario_exitoso():
     # Arrange
@@ -77,3 +81,130 @@ def test_autenticar_usuario_inexistente():
     with pytest.raises(UserNotFoundError) as exc_info:
         manager.authenticate_user(username, password)
     assert str(exc_info.value) == "El usuario 'ghostuser' no existe."
+
+def test_contraseña_almacenada_con_sal_y_parametros():
+    # Arrange
+    manager = UserManager(hasher=PBKDF2Hasher(iterations=1000))
+    
+    # Act
+    manager.add_user("ana", "clave")
+    manager.add_user("beto", "clave")
+    
+    # Assert
+    assert manager.users["ana"].startswith("pbkdf2_sha256$1000$")
+    assert manager.users["ana"] != manager.users["beto"]
+
+def test_autenticar_actualiza_hash_heredado():
+    # Arrange
+    manager = UserManager(hasher=PBKDF2Hasher(iterations=1000))
+    manager.users["legado"] = SHA256Hasher().hash("viejaclave")
+    
+    # Act
+    resultado = manager.authenticate_user("legado", "viejaclave")
+    
+    # Assert
+    assert resultado is True
+    assert manager.users["legado"].startswith("pbkdf2_sha256$1000$")
+    assert manager.authenticate_user("legado", "viejaclave") is True
+
+def test_autenticar_actualiza_parametros_de_la_kdf():
+    # Arrange
+    manager = UserManager(hasher=PBKDF2Hasher(iterations=1000))
+    manager.add_user("kapumota", "securepassword123")
+    manager.hasher = PBKDF2Hasher(iterations=2000)
+    
+    # Act
+    resultado = manager.authenticate_user("kapumota", "securepassword123")
+    
+    # Assert
+    assert resultado is True
+    assert manager.users["kapumota"].startswith("pbkdf2_sha256$2000$")
+
+def test_autenticar_usa_cache_de_verificaciones():
+    # Arrange
+    manager = UserManager(hasher=PBKDF2Hasher(iterations=1000))
+    manager.add_user("chaloZeta", "anothersecurepassword")
+    manager.authenticate_user("chaloZeta", "anothersecurepassword")
+    
+    # Act
+    with patch.object(manager, "_verify_password") as mock_verify:
+        resultado = manager.authenticate_user("chaloZeta", "anothersecurepassword")
+    
+    # Assert
+    assert resultado is True
+    mock_verify.assert_not_called()
+
+def test_cache_no_guarda_intentos_fallidos():
+    # Arrange
+    manager = UserManager(hasher=PBKDF2Hasher(iterations=1000))
+    manager.add_user("chaloZeta", "anothersecurepassword")
+    
+    # Act
+    manager.authenticate_user("chaloZeta", "wrongpassword")
+    
+    # Assert
+    assert len(manager.cache) == 0
+
+def test_autenticar_usuarios_en_paralelo():
+    # Arrange
+    with UserManager(hasher=PBKDF2Hasher(iterations=1000), max_workers=4) as manager:
+        manager.add_user("ana", "clave1")
+        manager.add_user("beto", "clave2")
+        
+        # Act
+        resultados = manager.authenticate_users([
+            ("ana", "clave1"), ("beto", "incorrecta"), ("beto", "clave2"),
+        ])
+    
+    # Assert
+    assert resultados == [True, False, True]
+
+@pytest.fixture(params=["memoria", "sqlite"])
+def storage(request):
+    # Un almacenamiento nuevo por prueba, cerrado al terminar
+    storage = InMemoryStorage() if request.param == "memoria" else SQLiteStorage()
+    yield storage
+    if hasattr(storage, "close"):
+        storage.close()
+
+def test_agregar_usuarios_en_bloque(storage):
+    # Arrange
+    manager = UserManager(hasher=PBKDF2Hasher(iterations=1000), storage=storage)
+    manager.add_user("kapumota", "securepassword123")
+    usuarios = [(f"user{i}", f"clave{i}") for i in range(10)]
+    usuarios += [("kapumota", "otra"), ("user3", "repetida")]
+    
+    # Act
+    omitidos = manager.add_users_bulk(usuarios, batch_size=4, processes=2)
+    
+    # Assert
+    assert sorted(omitidos) == ["kapumota", "user3"]
+    assert len(manager.users) == 11
+    assert manager.authenticate_user("user3", "clave3") is True
+    assert manager.authenticate_user("kapumota", "securepassword123") is True
+
+def test_agregar_usuarios_en_bloque_vacio():
+    # Arrange
+    manager = UserManager(hasher=PBKDF2Hasher(iterations=1000))
+    
+    # Act
+    with patch("user_manager.ProcessPoolExecutor") as mock_pool:
+        omitidos = manager.add_users_bulk([])
+    
+    # Assert
+    assert omitidos == []
+    mock_pool.assert_not_called()
+
+def test_autenticar_rechaza_sin_calcular_hash_tras_bloqueo():
+    # Arrange
+    manager = UserManager(hasher=PBKDF2Hasher(iterations=1000),
+                          throttle=Throttle(max_failures=3))
+    manager.add_user("chaloZeta", "anothersecurepassword")
+    for _ in range(3):
+        manager.authenticate_user("chaloZeta", "wrongpassword", source="10.0.0.1")
+    
+    # Act & Assert
+    with patch.object(manager, "_verify_password") as mock_verify:
+        with pytest.raises(TooManyAttemptsError):
+            manager.authenticate_user("chaloZeta", "anothersecurepassword", source="10.0.0.1")
+    mock_verify.assert_not_called()
@@ -0,0 +1,156 @@
+"""
+Limitación de intentos de autenticación
+
+Cada usuario y cada origen tienen un token bucket (un intento consume un
+token) y un contador de fallos consecutivos que, al superar el umbral,
+bloquea la clave por un tiempo que crece exponencialmente. El rechazo se
+decide antes de derivar la contraseña, así que no cuesta una KDF.
+
+El estado de cada clave es una tupla (tokens, actualizado, fallos,
+bloqueado_hasta) en un OrderedDict ordenado por última actualización: las
+claves inactivas se purgan desde el frente y el total está acotado. Para
+hacer lugar nunca se descarta una clave con un bloqueo vigente, porque eso
+lo levantaría; si todas lo tienen, los intentos de claves nuevas se rechazan.
+"""
+import math
+import threading
+import time
+from collections import OrderedDict
+
+
+class TooManyAttemptsError(Exception):
+    pass
+
+
+class _Limiter:
+    """Token buckets y bloqueos exponenciales indexados por una clave"""
+
+    def __init__(self, capacity, rate, max_failures, base_lockout, max_lockout,
+                 max_entries):
+        self.capacity = capacity
+        self.rate = rate
+        self.max_failures = max_failures
+        self.base_lockout = base_lockout
+        self.max_lockout = max_lockout
+        self.max_entries = max_entries
+        # Pasado este tiempo inactiva, una clave tiene el bucket lleno y ningún
+        # bloqueo vigente, así que olvidarla equivale a su estado inicial
+        self.idle_ttl = max(capacity / rate, max_lockout)
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def retry_after(self, key, now):
+        """Segundos que faltan para poder intentar, o 0 si puede intentarlo ya"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return 0
+        tokens, updated, _, locked_until = entry
+        if locked_until > now:
+            return locked_until - now
+        tokens = min(self.capacity, tokens + (now - updated) * self.rate)
+        if tokens < 1:
+            return (1 - tokens) / self.rate
+        return 0
+
+    def make_room(self, key, now):
+        """Descarta claves sin bloqueo vigente hasta que quepa la clave
+
+        Devuelve False si no cabe porque todas las claves están bloqueadas.
+        """
+        if key in self._entries:
+            return True
+        for _ in range(len(self._entries)):
+            if len(self._entries) < self.max_entries:
+                break
+            oldest_key, oldest = next(iter(self._entries.items()))
+            if oldest[3] > now:
+                self._entries.move_to_end(oldest_key)
+            else:
+                del self._entries[oldest_key]
+        return len(self._entries) < self.max_entries
+
+    def consume(self, key, now):
+        """Consume un token de la clave"""
+        tokens, updated, failures, locked_until = self._entries.pop(
+            key, (self.capacity, now, 0, 0.0))
+        tokens = min(self.capacity, tokens + (now - updated) * self.rate)
+        self._store(key, (tokens - 1, now, failures, locked_until), now)
+
+    def record_failure(self, key, now):
+        """Cuenta un fallo y bloquea la clave si supera el umbral"""
+        self.make_room(key, now)
+        tokens, updated, failures, locked_until = self._entries.pop(
+            key, (self.capacity, now, 0, 0.0))
+        tokens = min(self.capacity, tokens + (now - updated) * self.rate)
+        failures += 1
+        if failures >= self.max_failures:
+            lockout = self.base_lockout * 2 ** (failures - self.max_failures)
+            locked_until = now + min(lockout, self.max_lockout)
+        self._store(key, (tokens, now, failures, locked_until), now)
+
+    def reset_failures(self, key):
+        """Olvida los fallos consecutivos de la clave"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries[key] = (entry[0], entry[1], 0, 0.0)
+
+    def _store(self, key, entry, now):
+        self._entries[key] = entry
+        while self._entries:
+            oldest_key, oldest = next(iter(self._entries.items()))
+            if oldest[1] + self.idle_ttl > now or oldest[3] > now:
+                break
+            del self._entries[oldest_key]
+
+
+class Throttle:
+    """Limita los intentos de autenticación por usuario y por origen"""
+
+    def __init__(self, user_capacity=10, user_rate=1 / 6, source_capacity=100,
+                 source_rate=10.0, max_failures=5, source_max_failures=50,
+                 base_lockout=1.0, max_lockout=900.0, max_entries=100_000,
+                 clock=time.monotonic):
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.users = _Limiter(user_capacity, user_rate, max_failures,
+                              base_lockout, max_lockout, max_entries)
+        self.sources = _Limiter(source_capacity, source_rate, source_max_failures,
+                                base_lockout, max_lockout, max_entries)
+
+    def check(self, username, source=None):
+        """Registra un intento o lanza TooManyAttemptsError sin consumir nada"""
+        with self._lock:
+            now = self._clock()
+            user_wait = self.users.retry_after(username, now)
+            source_wait = self.sources.retry_after(source, now) if source is not None else 0
+            if source_wait > user_wait:
+                raise TooManyAttemptsError(
+                    f"Demasiados intentos desde el origen '{source}'. "
+                    f"Reintente en {math.ceil(source_wait)} s."
+                )
+            if user_wait > 0:
+                raise TooManyAttemptsError(
+                    f"Demasiados intentos para el usuario '{username}'. "
+                    f"Reintente en {math.ceil(user_wait)} s."
+                )
+            if not self.users.make_room(username, now) or (
+                    source is not None and not self.sources.make_room(source, now)):
+                raise TooManyAttemptsError("Demasiados intentos en curso. Reintente más tarde.")
+            self.users.consume(username, now)
+            if source is not None:
+                self.sources.consume(source, now)
+
+    def record_failure(self, username, source=None):
+        """Registra un intento fallido"""
+        with self._lock:
+            now = self._clock()
+            self.users.record_failure(username, now)
+            if source is not None:
+                self.sources.record_failure(source, now)
+
+    def record_success(self, username, source=None):
+        """Registra un intento exitoso, que reinicia los fallos del usuario"""
+        with self._lock:
+            self.users.reset_failures(username)
@@ -14,7 +14,13 @@ class UserManager:
     def user_exists(self, username):
         return username in self.users 
 """
-import hashlib
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import islice
+from hashers import HASHERS, ScryptHasher, VerificationCache, identify_algorithm
+from storage import InMemoryStorage
+from throttling import Throttle, TooManyAttemptsError
 
 class UserAlreadyExistsError(Exception):
     pass
@@ -23,8 +29,15 @@ class UserNotFoundError(Exception):
     pass
 
 class UserManager:
-    def __init__(self):
-        self.users = {}
+    def __init__(self, hasher=None, cache=None, max_workers=None, storage=None,
+                 throttle=None):
+        self.users = storage if storage is not None else InMemoryStorage()
+        self.hasher = hasher if hasher is not None else ScryptHasher()
+        self.cache = cache if cache is not None else VerificationCache()
+        self.throttle = throttle if throttle is not None else Throttle()
+        self.max_workers = max_workers
+        self._executor = None
+        self._executor_lock = threading.Lock()
     
     def add_user(self, username, password):
         if self.user_exists(username):
@@ -32,14 +45,106 @@ class UserManager:
         hashed_password = self._hash_password(password)
         self.users[username] = hashed_password
     
-    def authenticate_user(self, username, password):
+    def add_users_bulk(self, users, batch_size=10_000, processes=None):
+        """Agrega en lotes los pares (usuario, contraseña) de un iterable
+
+        Los duplicados de cada lote se detectan con una sola consulta al
+        almacenamiento, las contraseñas se derivan en paralelo en un pool de
+        procesos y cada lote se inserta en una transacción. Devuelve la lista
+        de usuarios omitidos por existir ya.
+        """
+        skipped = []
+        users = iter(users)
+
+        def next_batch():
+            batch = {}
+            for username, password in islice(users, batch_size):
+                if username in batch:
+                    skipped.append(username)
+                else:
+                    batch[username] = password
+            return batch
+
+        batch = next_batch()
+        if not batch:
+            # Sin usuarios no vale la pena arrancar el pool de procesos
+            return skipped
+        workers = processes or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            while batch:
+                existing = self.users.existing(batch)
+                skipped.extend(username for username in batch if username in existing)
+                new_users = [username for username in batch if username not in existing]
+                passwords = [batch[username] for username in new_users]
+                chunksize = max(1, len(passwords) // (4 * workers))
+                hashed = pool.map(self.hasher.hash, passwords, chunksize=chunksize)
+                self.users.insert_many(zip(new_users, hashed))
+                batch = next_batch()
+        return skipped
+
+    def authenticate_user(self, username, password, source=None):
+        # Rechaza los intentos por encima del límite antes de pagar la KDF
+        self.throttle.check(username, source)
         if not self.user_exists(username):
             raise UserNotFoundError(f"El usuario '{username}' no existe.")
-        hashed_password = self._hash_password(password)
-        return self.users[username] == hashed_password
+        hashed_password = self.users[username]
+        if self.cache.contains(username, password, hashed_password):
+            self.throttle.record_success(username, source)
+            return True
+        if not self._verify_password(password, hashed_password):
+            self.throttle.record_failure(username, source)
+            return False
+        self.throttle.record_success(username, source)
+        if self.hasher.needs_update(hashed_password):
+            # Migra el hash a la KDF y parámetros actuales aprovechando la contraseña en claro
+            hashed_password = self._hash_password(password)
+            self.users[username] = hashed_password
+        self.cache.add(username, password, hashed_password)
+        return True
+
+    def submit_authentication(self, username, password, source=None):
+        """Autentica en el pool de hilos y devuelve un Future con el resultado"""
+        return self._get_executor().submit(self.authenticate_user, username, password, source)
+
+    def authenticate_users(self, credentials):
+        """Autentica en paralelo una ráfaga de pares (usuario, contraseña)
+
+        La KDF libera el GIL mientras calcula, así que los hilos del pool
+        derivan las claves en paralelo. Devuelve los resultados en orden.
+        """
+        futures = [self.submit_authentication(username, password)
+                   for username, password in credentials]
+        return [future.result() for future in futures]
+
+    def close(self):
+        """Libera el pool de hilos"""
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
     
     def user_exists(self, username):
         return username in self.users
     
     def _hash_password(self, password):
-        return hashlib.sha256(password.encode()).hexdigest()
+        return self.hasher.hash(password)
+
+    def _verify_password(self, password, hashed_password):
+        algorithm = identify_algorithm(hashed_password)
+        if algorithm == self.hasher.algorithm:
+            return self.hasher.verify(password, hashed_password)
+        if algorithm not in HASHERS:
+            return False
+        return HASHERS[algorithm]().verify(password, hashed_password)
+
+    def _get_executor(self):
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+            return self._executor
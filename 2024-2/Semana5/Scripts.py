@@ -568,3 +568,310 @@ class TestControladorUsuario(unittest.TestCase):
 
 if __name__ == "__main__":
     unittest.main()
+
+# Envío de notificaciones en segundo plano y por lotes
+# ControladorUsuario no cambia: recibe un IServicioNotificacion que solo encola
+# el mensaje, así registrar_usuario no espera al envío del email o SMS.
+import logging
+import queue
+import threading
+import time
+from collections import namedtuple
+
+Notificacion = namedtuple("Notificacion", "canal destinatario asunto mensaje")
+
+class ServicioEmail(IServicioNotificacion):
+    def enviar_notificacion(self, destinatario, asunto, mensaje):
+        print(f"Enviando email a {destinatario} con asunto '{asunto}'.")
+
+    def enviar_lote(self, notificaciones):
+        # Una sola conexión SMTP para todo el lote
+        print(f"Enviando {len(notificaciones)} emails en un lote.")
+
+class ServicioSMS(IServicioNotificacion):
+    def enviar_notificacion(self, destinatario, asunto, mensaje):
+        print(f"Enviando SMS a {destinatario} con mensaje: {mensaje}")
+
+class DespachadorNotificaciones(IServicioNotificacion):
+    """Encola las notificaciones y las entrega por lotes desde un grupo de hilos
+
+    Cada canal (por ejemplo "email" o "sms") tiene su servicio. Si el servicio
+    tiene enviar_lote(notificaciones) recibe el lote completo; si no, se llama
+    a enviar_notificacion por cada una. Cuando la cola está llena,
+    enviar_notificacion espera hasta timeout segundos a que haya lugar y
+    luego lanza queue.Full: así quien produce mensajes se frena en lugar de
+    acumularlos sin límite. Después de cerrar, enviar_notificacion lanza
+    RuntimeError, también a quien estaba esperando lugar en la cola.
+    """
+
+    def __init__(self, canales, canal_por_defecto="email", capacidad=1000, hilos=2,
+                 tam_lote=50, espera_lote=0.05, timeout=None):
+        self.canales = canales
+        self.canal_por_defecto = canal_por_defecto
+        self.tam_lote = tam_lote
+        self.espera_lote = espera_lote
+        self.timeout = timeout
+        self.enviadas = 0
+        self.fallidas = 0
+        self._cola = queue.Queue(maxsize=capacidad)
+        self._cerrado = False
+        self._lock = threading.Lock()
+        # Protege _cerrado junto con el put y avisa cuando los hilos liberan lugar
+        self._estado = threading.Condition()
+        self._hilos = [threading.Thread(target=self._trabajar, daemon=True) for _ in range(hilos)]
+        for hilo in self._hilos:
+            hilo.start()
+
+    def enviar_notificacion(self, destinatario, asunto, mensaje, canal=None):
+        canal = canal or self.canal_por_defecto
+        if canal not in self.canales:
+            raise ValueError(f"Canal desconocido: {canal}")
+        notificacion = Notificacion(canal, destinatario, asunto, mensaje)
+        limite = None if self.timeout is None else time.monotonic() + self.timeout
+        # Con la condición tomada, cerrar no puede enviar las señales de fin entre
+        # la comprobación y el put, así que ninguna notificación queda detrás de ellas
+        with self._estado:
+            while True:
+                if self._cerrado:
+                    raise RuntimeError("El despachador está cerrado")
+                try:
+                    self._cola.put_nowait(notificacion)
+                    return
+                except queue.Full:
+                    restante = None if limite is None else limite - time.monotonic()
+                    if restante is not None and restante <= 0:
+                        raise
+                # wait suelta la condición hasta que un hilo saque notificaciones o se cierre
+                self._estado.wait(restante)
+
+    def pendientes(self):
+        return self._cola.qsize()
+
+    def vaciar(self):
+        """Espera a que se entreguen todas las notificaciones encoladas hasta ahora"""
+        self._cola.join()
+
+    def cerrar(self):
+        """Deja de aceptar notificaciones, entrega las pendientes y detiene los hilos"""
+        with self._estado:
+            if self._cerrado:
+                return
+            self._cerrado = True
+            # Los productores que esperaban lugar se despiertan y lanzan RuntimeError
+            self._estado.notify_all()
+        self.vaciar()
+        for _ in self._hilos:
+            self._cola.put(None)
+        for hilo in self._hilos:
+            hilo.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.cerrar()
+
+    def _trabajar(self):
+        while True:
+            primera = self._cola.get()
+            if primera is None:
+                self._cola.task_done()
+                self._drenar()
+                return
+            lote = [primera]
+            detener = False
+            # Se juntan las notificaciones que llegan durante espera_lote segundos
+            limite = time.monotonic() + self.espera_lote
+            while len(lote) < self.tam_lote:
+                restante = limite - time.monotonic()
+                try:
+                    notificacion = self._cola.get(timeout=restante) if restante > 0 else self._cola.get_nowait()
+                except queue.Empty:
+                    break
+                if notificacion is None:
+                    detener = True
+                    break
+                lote.append(notificacion)
+            with self._estado:
+                self._estado.notify_all()
+            try:
+                self._entregar(lote)
+            finally:
+                for _ in range(len(lote) + detener):
+                    self._cola.task_done()
+            if detener:
+                self._drenar()
+                return
+
+    def _drenar(self):
+        """Entrega lo que haya quedado en la cola detrás de la señal de fin"""
+        restantes, senales = [], 0
+        while True:
+            try:
+                notificacion = self._cola.get_nowait()
+            except queue.Empty:
+                break
+            if notificacion is None:
+                senales += 1
+            else:
+                restantes.append(notificacion)
+        try:
+            for inicio in range(0, len(restantes), self.tam_lote):
+                self._entregar(restantes[inicio:inicio + self.tam_lote])
+        finally:
+            for _ in range(len(restantes) + senales):
+                self._cola.task_done()
+        # Las señales de fin de los otros hilos vuelven a la cola
+        for _ in range(senales):
+            self._cola.put(None)
+
+    def _entregar(self, lote):
+        por_canal = {}
+        for notificacion in lote:
+            por_canal.setdefault(notificacion.canal, []).append(notificacion)
+        for canal, notificaciones in por_canal.items():
+            servicio = self.canales[canal]
+            try:
+                if hasattr(servicio, "enviar_lote"):
+                    servicio.enviar_lote(notificaciones)
+                else:
+                    for n in notificaciones:
+                        servicio.enviar_notificacion(n.destinatario, n.asunto, n.mensaje)
+                enviadas, fallidas = len(notificaciones), 0
+            except Exception:
+                # Un error del servicio no detiene al hilo; el lote se cuenta como fallido
+                logging.exception("No se pudo enviar un lote de %s", canal)
+                enviadas, fallidas = 0, len(notificaciones)
+            with self._lock:
+                self.enviadas += enviadas
+                self.fallidas += fallidas
+
+# Pruebas unitarias para DespachadorNotificaciones
+import unittest
+from unittest.mock import Mock
+
+class TestDespachadorNotificaciones(unittest.TestCase):
+    def test_registrar_usuario_no_espera_el_envio(self):
+        # Un servicio lento que tarda medio segundo por email
+        servicio_lento = Mock(spec=["enviar_notificacion"])
+        servicio_lento.enviar_notificacion.side_effect = lambda *args: time.sleep(0.5)
+        with DespachadorNotificaciones({"email": servicio_lento}) as despachador:
+            controlador = ControladorUsuario(despachador)
+            inicio = time.perf_counter()
+            controlador.registrar_usuario(Usuario("Ana Martínez", "ana.martinez@example.com"))
+            self.assertLess(time.perf_counter() - inicio, 0.1)
+            despachador.vaciar()
+        servicio_lento.enviar_notificacion.assert_called_once_with(
+            "ana.martinez@example.com", "Bienvenido!", "Gracias por registrarte.")
+
+    def test_agrupa_por_canal(self):
+        email = Mock(spec=["enviar_notificacion", "enviar_lote"])
+        sms = Mock(spec=["enviar_notificacion"])
+        with DespachadorNotificaciones({"email": email, "sms": sms}, hilos=1,
+                                       espera_lote=0.2) as despachador:
+            for i in range(10):
+                despachador.enviar_notificacion(f"u{i}@example.com", "Hola", "Mensaje")
+            despachador.enviar_notificacion("+51 999", "Hola", "Mensaje", canal="sms")
+            despachador.vaciar()
+        enviados = sum(len(llamada.args[0]) for llamada in email.enviar_lote.call_args_list)
+        self.assertEqual(enviados, 10)
+        self.assertLess(email.enviar_lote.call_count, 10)
+        sms.enviar_notificacion.assert_called_once_with("+51 999", "Hola", "Mensaje")
+        self.assertEqual(despachador.enviadas, 11)
+
+    def test_cola_llena(self):
+        # El servicio no termina hasta que la prueba lo libera
+        liberar = threading.Event()
+        servicio = Mock(spec=["enviar_notificacion"])
+        servicio.enviar_notificacion.side_effect = lambda *args: liberar.wait()
+        despachador = DespachadorNotificaciones({"email": servicio}, capacidad=2, hilos=1,
+                                                tam_lote=1, timeout=0.1)
+        with self.assertRaises(queue.Full):
+            for i in range(10):
+                despachador.enviar_notificacion(f"u{i}@example.com", "Hola", "Mensaje")
+        liberar.set()
+        despachador.cerrar()
+        self.assertEqual(despachador.fallidas, 0)
+
+    def test_cerrar_no_pierde_notificaciones(self):
+        # Productores que envían mientras se cierra: lo aceptado se entrega completo
+        servicio = Mock(spec=["enviar_notificacion"])
+        despachador = DespachadorNotificaciones({"email": servicio}, capacidad=5, hilos=3,
+                                                tam_lote=2)
+        aceptadas = []
+
+        def producir():
+            for i in range(200):
+                try:
+                    despachador.enviar_notificacion(f"u{i}@example.com", "Hola", "Mensaje")
+                except RuntimeError:
+                    return
+                aceptadas.append(i)
+
+        productores = [threading.Thread(target=producir) for _ in range(4)]
+        for productor in productores:
+            productor.start()
+        time.sleep(0.01)
+        despachador.cerrar()
+        for productor in productores:
+            productor.join()
+        self.assertEqual(servicio.enviar_notificacion.call_count, len(aceptadas))
+        self.assertEqual(despachador.enviadas, len(aceptadas))
+        self.assertEqual(despachador.pendientes(), 0)
+
+    def test_cerrar_libera_a_los_productores_bloqueados(self):
+        liberar = threading.Event()
+        servicio = Mock(spec=["enviar_notificacion"])
+        servicio.enviar_notificacion.side_effect = lambda *args: liberar.wait()
+        despachador = DespachadorNotificaciones({"email": servicio}, capacidad=1, hilos=1,
+                                                tam_lote=1)
+        errores = []
+
+        def producir():
+            try:
+                for i in range(3):
+                    despachador.enviar_notificacion(f"u{i}@example.com", "Hola", "Mensaje")
+            except RuntimeError as error:
+                errores.append(error)
+
+        productor = threading.Thread(target=producir)
+        productor.start()
+        # El hilo entrega la primera, la segunda ocupa la cola y la tercera espera lugar
+        while not (servicio.enviar_notificacion.called and despachador.pendientes() == 1):
+            time.sleep(0.01)
+        cierre = threading.Thread(target=despachador.cerrar)
+        cierre.start()
+        productor.join(timeout=5)
+        self.assertFalse(productor.is_alive())
+        self.assertEqual(len(errores), 1)
+        liberar.set()
+        cierre.join()
+        self.assertEqual(despachador.enviadas, 2)
+
+def main():
+    despachador = DespachadorNotificaciones({"email": ServicioEmail(), "sms": ServicioSMS()})
+    controlador = ControladorUsuario(despachador)
+
+    inicio = time.perf_counter()
+    for i in range(100):
+        controlador.registrar_usuario(Usuario(f"Usuario {i}", f"usuario{i}@example.com"))
+    print(f"100 registros en {time.perf_counter() - inicio:.3f} s")
+
+    despachador.enviar_notificacion("+51 999 999 999", "Código", "Tu código es 1234", canal="sms")
+    # Antes de terminar se entregan las notificaciones pendientes
+    despachador.cerrar()
+    print(f"Enviadas: {despachador.enviadas}, fallidas: {despachador.fallidas}")
+
+# Cada sección de este archivo es un script aparte: se ejecuta el ejemplo y
+# después sus pruebas, en un solo bloque al final
+if __name__ == "__main__":
+    main()
+    unittest.main()
+
+# Registrando usuario: Usuario 0
+# ...
+# 100 registros en 0.002 s
+# Enviando 50 emails en un lote.
+# Enviando 50 emails en un lote.
+# Enviando SMS a +51 999 999 999 con mensaje: Tu código es 1234
+# Enviadas: 101, fallidas: 0
@@ -0,0 +1,70 @@
+"""
+Mide el rendimiento de las pilas compartidas variando el número de hilos
+
+Cada hilo alterna push y pop sobre la misma pila. Se compara Stack protegida
+con un candado externo (el uso actual), ConcurrentStack y
+BoundedBlockingStack.
+
+Uso: python benchmark_concurrent_stack.py [operaciones_por_hilo]
+"""
+import sys
+import threading
+import time
+from stack import BoundedBlockingStack, ConcurrentStack, Stack
+
+
+class LockedStack:
+    """Stack envuelta en un candado grueso, como se usa hoy"""
+
+    def __init__(self):
+        self.stack = Stack()
+        self.lock = threading.Lock()
+
+    def push(self, data):
+        with self.lock:
+            self.stack.push(data)
+
+    def pop(self):
+        with self.lock:
+            return self.stack.pop()
+
+
+def worker(stack, operations, barrier):
+    barrier.wait()
+    for i in range(operations):
+        stack.push(i)
+        stack.pop()
+
+
+def run(factory, threads, operations):
+    stack = factory()
+    barrier = threading.Barrier(threads + 1)
+    pool = [threading.Thread(target=worker, args=(stack, operations, barrier))
+            for _ in range(threads)]
+    for thread in pool:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in pool:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    return 2 * threads * operations / elapsed
+
+
+def main():
+    operations = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    cases = [
+        ("Stack + candado", LockedStack),
+        ("ConcurrentStack", ConcurrentStack),
+        ("BoundedBlockingStack", lambda: BoundedBlockingStack(maxsize=1024)),
+    ]
+    thread_counts = [1, 2, 4, 8, 16]
+    print(f"{operations} push+pop por hilo, operaciones por segundo")
+    print(f"{'pila':22}" + "".join(f"{f'{n} hilos':>12}" for n in thread_counts))
+    for name, factory in cases:
+        rates = [run(factory, n, operations) for n in thread_counts]
+        print(f"{name:22}" + "".join(f"{rate:12,.0f}" for rate in rates))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Compara memoria y velocidad de Stack (lista) y TypedStack (array.array)
+
+Uso: python benchmark_stack.py [numero_de_elementos]
+"""
+import sys
+import time
+import tracemalloc
+from stack import Stack, TypedStack
+
+
+def measure_memory(factory, n):
+    tracemalloc.start()
+    stack = factory()
+    for i in range(n):
+        stack.push(float(i))
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size
+
+
+def measure_time(function):
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+def push_pop(factory, n):
+    stack = factory()
+    for i in range(n):
+        stack.push(float(i))
+    while not stack.is_empty():
+        stack.pop()
+
+
+def push_pop_many(n):
+    stack = TypedStack("d")
+    stack.push_many(float(i) for i in range(n))
+    stack.pop_many(n)
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    cases = [
+        ("Stack (lista)", Stack),
+        ("TypedStack", lambda: TypedStack("d")),
+        ("TypedStack capacidad fija", lambda: TypedStack("d", capacity=n)),
+    ]
+    print(f"{n} números de punto flotante")
+    print(f"{'pila':28} {'bytes/elemento':>15} {'push+pop (s)':>13}")
+    for name, factory in cases:
+        per_item = measure_memory(factory, n) / n
+        seconds = measure_time(lambda: push_pop(factory, n))
+        print(f"{name:28} {per_item:15.1f} {seconds:13.3f}")
+    seconds = measure_time(lambda: push_pop_many(n))
+    print(f"{'TypedStack push/pop_many':28} {'':>15} {seconds:13.3f}")
+
+
+if __name__ == "__main__":
+    main()
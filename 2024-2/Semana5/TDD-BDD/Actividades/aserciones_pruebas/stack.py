@@ -1,5 +1,9 @@
 """Implementa una estructura de datos de Pila"""
-from typing import Any
+import threading
+from array import array
+from collections import deque
+from queue import Empty, Full
+from typing import Any, Iterable, Iterator, Optional
 
 class Stack:
     """Implementa una estructura de datos de Pila"""
@@ -23,3 +27,284 @@ class Stack:
     def is_empty(self) -> bool:
         """Devuelve True si la pila está vacía, de lo contrario devuelve False"""
         return len(self.items) == 0
+
+
+class TypedStack:
+    """Implementa una pila de números respaldada por un array.array
+
+    Los elementos se guardan sin encapsular en un búfer contiguo del tipo
+    indicado por typecode (ver el módulo array). Con capacity el búfer se
+    reserva completo al inicio y nunca se realoja; sin capacity crece al doble
+    cuando se llena.
+    """
+
+    __slots__ = ("items", "capacity", "_size")
+
+    def __init__(self, typecode: str = "d", capacity: Optional[int] = None):
+        """Constructor"""
+        if capacity is not None and capacity < 0:
+            raise ValueError("La capacidad no puede ser negativa")
+        self.capacity = capacity
+        length = capacity if capacity is not None else 16
+        self.items = array(typecode, bytes(array(typecode).itemsize * length))
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def push(self, data: Any) -> None:
+        """Coloca un elemento en la pila"""
+        if self._size == len(self.items):
+            self._reserve(1)
+        self.items[self._size] = data
+        self._size += 1
+
+    def pop(self) -> Any:
+        """Elimina un elemento de la pila y lo devuelve"""
+        if self._size == 0:
+            raise IndexError("pop de una pila vacía")
+        self._size -= 1
+        return self.items[self._size]
+
+    def peek(self) -> Any:
+        """Devuelve el elemento en la parte superior de la pila sin eliminarlo"""
+        if self._size == 0:
+            raise IndexError("peek de una pila vacía")
+        return self.items[self._size - 1]
+
+    def is_empty(self) -> bool:
+        """Devuelve True si la pila está vacía, de lo contrario devuelve False"""
+        return self._size == 0
+
+    def push_many(self, values: Iterable[Any]) -> None:
+        """Coloca varios elementos en la pila, el último queda en la parte superior"""
+        if not isinstance(values, array) or values.typecode != self.items.typecode:
+            values = array(self.items.typecode, values)
+        count = len(values)
+        if self._size + count > len(self.items):
+            self._reserve(count)
+        self.items[self._size:self._size + count] = values
+        self._size += count
+
+    def pop_many(self, count: int) -> array:
+        """Elimina count elementos y los devuelve en el orden en que pop() lo haría"""
+        if count < 0:
+            raise ValueError("pop_many de una cantidad negativa")
+        if count > self._size:
+            raise IndexError("pop_many de más elementos de los que hay en la pila")
+        start = self._size - count
+        values = self.items[start:self._size]
+        values.reverse()
+        self._size = start
+        return values
+
+    def _reserve(self, count: int) -> None:
+        """Amplía el búfer para que quepan count elementos más"""
+        needed = self._size + count
+        if self.capacity is not None:
+            raise OverflowError(f"La pila está llena (capacidad {self.capacity})")
+        new_length = max(needed, 2 * len(self.items))
+        extra = new_length - len(self.items)
+        self.items.frombytes(bytes(extra * self.items.itemsize))
+
+
+class ConcurrentStack:
+    """Implementa una pila que se puede compartir entre hilos sin candados
+
+    En CPython, append y pop de collections.deque son operaciones atómicas,
+    de modo que cada push y pop es una única instrucción indivisible, el
+    equivalente al compare-and-swap de una pila de Treiber. Ningún hilo
+    espera un candado, así que no hay convoyes con muchos hilos.
+    """
+
+    __slots__ = ("items",)
+
+    def __init__(self):
+        """Constructor"""
+        self.items = deque()
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def push(self, data: Any) -> None:
+        """Coloca un elemento en la pila"""
+        self.items.append(data)
+
+    def pop(self) -> Any:
+        """Elimina un elemento de la pila y lo devuelve"""
+        return self.items.pop()
+
+    def peek(self) -> Any:
+        """Devuelve el elemento en la parte superior de la pila sin eliminarlo"""
+        return self.items[-1]
+
+    def is_empty(self) -> bool:
+        """Devuelve True si la pila está vacía, de lo contrario devuelve False"""
+        return len(self.items) == 0
+
+    def push_many(self, values: Iterable[Any]) -> None:
+        """Coloca varios elementos en la pila, el último queda en la parte superior"""
+        self.items.extend(values)
+
+
+class BoundedBlockingStack:
+    """Implementa una pila acotada que bloquea a productores y consumidores
+
+    push espera mientras la pila está llena y pop mientras está vacía, con
+    un timeout opcional en segundos. Si el timeout vence, lanzan queue.Full o
+    queue.Empty, como queue.LifoQueue.
+    """
+
+    __slots__ = ("items", "maxsize", "_lock", "_not_empty", "_not_full")
+
+    def __init__(self, maxsize: int):
+        """Constructor"""
+        if maxsize <= 0:
+            raise ValueError("maxsize debe ser un número positivo")
+        self.items = []
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self.items)
+
+    def push(self, data: Any, timeout: Optional[float] = None) -> None:
+        """Coloca un elemento en la pila, esperando si está llena"""
+        with self._not_full:
+            if not self._not_full.wait_for(lambda: len(self.items) < self.maxsize, timeout):
+                raise Full("La pila está llena")
+            self.items.append(data)
+            self._not_empty.notify()
+
+    def pop(self, timeout: Optional[float] = None) -> Any:
+        """Elimina un elemento de la pila y lo devuelve, esperando si está vacía"""
+        with self._not_empty:
+            if not self._not_empty.wait_for(lambda: self.items, timeout):
+                raise Empty("La pila está vacía")
+            data = self.items.pop()
+            self._not_full.notify()
+            return data
+
+    def peek(self) -> Any:
+        """Devuelve el elemento en la parte superior de la pila sin eliminarlo"""
+        with self._lock:
+            return self.items[-1]
+
+    def is_empty(self) -> bool:
+        """Devuelve True si la pila está vacía, de lo contrario devuelve False"""
+        with self._lock:
+            return len(self.items) == 0
+
+
+class _Node:
+    """Nodo inmutable de una pila persistente"""
+
+    __slots__ = ("data", "next")
+
+    def __init__(self, data: Any, next: Optional["_Node"]):
+        self.data = data
+        self.next = next
+
+
+class PersistentStack:
+    """Implementa una pila inmutable que comparte estructura entre versiones
+
+    push y pop no modifican la pila: devuelven una nueva versión que reutiliza
+    los nodos de la anterior, así que ambas operaciones y conservar una
+    versión cuestan O(1).
+    """
+
+    __slots__ = ("_head", "_size")
+
+    def __init__(self, items: Iterable[Any] = ()):
+        """Constructor, los elementos se apilan en el orden dado"""
+        head = None
+        size = 0
+        for data in items:
+            head = _Node(data, head)
+            size += 1
+        self._head = head
+        self._size = size
+
+    @classmethod
+    def _from_head(cls, head: Optional[_Node], size: int) -> "PersistentStack":
+        stack = cls.__new__(cls)
+        stack._head = head
+        stack._size = size
+        return stack
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[Any]:
+        """Recorre los elementos desde la parte superior"""
+        node = self._head
+        while node is not None:
+            yield node.data
+            node = node.next
+
+    def push(self, data: Any) -> "PersistentStack":
+        """Devuelve una nueva pila con el elemento en la parte superior"""
+        return self._from_head(_Node(data, self._head), self._size + 1)
+
+    def pop(self) -> "PersistentStack":
+        """Devuelve una nueva pila sin el elemento de la parte superior"""
+        if self._head is None:
+            raise IndexError("pop de una pila vacía")
+        return self._from_head(self._head.next, self._size - 1)
+
+    def peek(self) -> Any:
+        """Devuelve el elemento en la parte superior de la pila"""
+        if self._head is None:
+            raise IndexError("peek de una pila vacía")
+        return self._head.data
+
+    def is_empty(self) -> bool:
+        """Devuelve True si la pila está vacía, de lo contrario devuelve False"""
+        return self._head is None
+
+
+class SnapshotStack:
+    """Implementa la interfaz de Stack sobre una PersistentStack
+
+    Se usa igual que Stack, y además snapshot() devuelve en O(1) la versión
+    actual para deshacer o reproducir, sin copiar los elementos.
+    """
+
+    __slots__ = ("state",)
+
+    def __init__(self, snapshot: Optional[PersistentStack] = None):
+        """Constructor"""
+        self.state = snapshot if snapshot is not None else PersistentStack()
+
+    def __len__(self) -> int:
+        return len(self.state)
+
+    def push(self, data: Any) -> None:
+        """Coloca un elemento en la pila"""
+        self.state = self.state.push(data)
+
+    def pop(self) -> Any:
+        """Elimina un elemento de la pila y lo devuelve"""
+        data = self.state.peek()
+        self.state = self.state.pop()
+        return data
+
+    def peek(self) -> Any:
+        """Devuelve el elemento en la parte superior de la pila sin eliminarlo"""
+        return self.state.peek()
+
+    def is_empty(self) -> bool:
+        """Devuelve True si la pila está vacía, de lo contrario devuelve False"""
+        return self.state.is_empty()
+
+    def snapshot(self) -> PersistentStack:
+        """Devuelve la versión actual de la pila"""
+        return self.state
+
+    def restore(self, snapshot: PersistentStack) -> None:
+        """Vuelve a una versión obtenida con snapshot()"""
+        self.state = snapshot
@@ -1,4 +1,4 @@
-"""
+'''
 from unittest import TestCase
 from stack import Stack
 
@@ -28,10 +28,13 @@ class TestStack(TestCase):
     def test_is_empty(self):
         """Prueba de si la pila está vacía"""
         raise Exception("no implementado")
-"""
+'''
 
+import threading
+from queue import Empty, Full
 from unittest import TestCase
-from stack import Stack
+from stack import (BoundedBlockingStack, ConcurrentStack, PersistentStack, SnapshotStack,
+                   Stack, TypedStack)
 
 class TestStack(TestCase):
     """Casos de prueba para la Pila"""
@@ -79,3 +82,203 @@ class TestStack(TestCase):
         assert stack.is_empty() == False  # Después de agregar un elemento, la pila no debe estar vacía
         #raise Exception("no implementado")
 
+
+
+class TestTypedStack(TestCase):
+    """Casos de prueba para la Pila respaldada por array.array"""
+
+    def test_misma_conducta_que_stack(self):
+        """Prueba que push, pop, peek e is_empty se comportan como en Stack"""
+        stack = TypedStack("q")
+        assert stack.is_empty() == True
+        for valor in range(100):  # Fuerza varias ampliaciones del búfer
+            stack.push(valor)
+        assert stack.peek() == 99
+        assert stack.pop() == 99
+        assert stack.peek() == 98
+        assert len(stack) == 99
+        assert stack.is_empty() == False
+
+    def test_pila_vacia(self):
+        """Prueba que pop y peek en una pila vacía lanzan IndexError como en Stack"""
+        stack = TypedStack()
+        self.assertRaises(IndexError, stack.pop)
+        self.assertRaises(IndexError, stack.peek)
+        self.assertRaises(IndexError, Stack().pop)
+
+    def test_push_many_pop_many(self):
+        """Prueba las operaciones por lotes"""
+        stack = TypedStack("d")
+        stack.push(0.5)
+        stack.push_many([1.0, 2.0, 3.0])
+        assert stack.peek() == 3.0
+        assert list(stack.pop_many(2)) == [3.0, 2.0]  # Mismo orden que dos pop()
+        assert stack.pop() == 1.0
+        self.assertRaises(IndexError, stack.pop_many, 2)
+        assert stack.pop() == 0.5
+
+    def test_pop_many_negativo(self):
+        """Prueba que una cantidad negativa lanza ValueError sin cambiar la pila"""
+        stack = TypedStack("i")
+        stack.push_many([1, 2, 3])
+        self.assertRaises(ValueError, stack.pop_many, -1)
+        assert len(stack) == 3
+        assert list(stack.pop_many(0)) == []
+        assert stack.peek() == 3
+
+    def test_capacidad_fija(self):
+        """Prueba que con capacidad fija el búfer no se realoja"""
+        stack = TypedStack("i", capacity=3)
+        buffer_address = stack.items.buffer_info()[0]
+        stack.push_many([1, 2])
+        stack.push(3)
+        self.assertRaises(OverflowError, stack.push, 4)
+        self.assertRaises(OverflowError, stack.push_many, [4])
+        assert stack.pop() == 3
+        stack.push(5)
+        assert stack.items.buffer_info()[0] == buffer_address
+        assert len(stack) == 3
+
+    def test_capacidad_cero(self):
+        """Prueba que una pila de capacidad cero no acepta elementos"""
+        stack = TypedStack("i", capacity=0)
+        self.assertRaises(OverflowError, stack.push, 1)
+        self.assertRaises(OverflowError, stack.push_many, [1])
+        assert stack.is_empty()
+        self.assertRaises(ValueError, TypedStack, "i", -1)
+
+    def test_tipo_incorrecto(self):
+        """Prueba que el tipo de los elementos se valida"""
+        stack = TypedStack("q")
+        self.assertRaises(TypeError, stack.push, "texto")
+
+
+class TestConcurrentStack(TestCase):
+    """Casos de prueba para la Pila concurrente"""
+
+    def test_misma_conducta_que_stack(self):
+        """Prueba que push, pop, peek e is_empty se comportan como en Stack"""
+        stack = ConcurrentStack()
+        assert stack.is_empty() == True
+        stack.push(1)
+        stack.push(2)
+        assert stack.peek() == 2
+        assert stack.pop() == 2
+        assert stack.pop() == 1
+        self.assertRaises(IndexError, stack.pop)
+
+    def test_productores_y_consumidores(self):
+        """Prueba que no se pierden ni duplican elementos entre hilos"""
+        stack = ConcurrentStack()
+        consumidos = []
+
+        def producir(inicio):
+            for valor in range(inicio, inicio + 1000):
+                stack.push(valor)
+
+        def consumir():
+            while len(consumidos) < 4000:
+                try:
+                    consumidos.append(stack.pop())
+                except IndexError:
+                    pass
+
+        hilos = [threading.Thread(target=producir, args=(i * 1000,)) for i in range(4)]
+        hilos += [threading.Thread(target=consumir) for _ in range(2)]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+        assert sorted(consumidos[:4000]) == list(range(4000))
+
+
+class TestBoundedBlockingStack(TestCase):
+    """Casos de prueba para la Pila acotada y bloqueante"""
+
+    def test_misma_conducta_que_stack(self):
+        """Prueba que push, pop, peek e is_empty se comportan como en Stack"""
+        stack = BoundedBlockingStack(maxsize=2)
+        assert stack.is_empty() == True
+        stack.push(1)
+        stack.push(2)
+        assert stack.peek() == 2
+        assert stack.pop() == 2
+        assert stack.pop() == 1
+        assert stack.is_empty() == True
+
+    def test_timeout(self):
+        """Prueba que push y pop lanzan Full y Empty cuando vence el timeout"""
+        stack = BoundedBlockingStack(maxsize=1)
+        self.assertRaises(Empty, stack.pop, timeout=0.01)
+        stack.push(1)
+        self.assertRaises(Full, stack.push, 2, timeout=0.01)
+        assert len(stack) == 1
+
+    def test_push_espera_a_un_consumidor(self):
+        """Prueba que push bloqueado se libera cuando otro hilo hace pop"""
+        stack = BoundedBlockingStack(maxsize=1)
+        stack.push(1)
+        hilo = threading.Thread(target=stack.push, args=(2,))
+        hilo.start()
+        assert stack.pop(timeout=1) == 1
+        hilo.join(timeout=1)
+        assert hilo.is_alive() == False
+        assert stack.pop(timeout=1) == 2
+
+
+class TestPersistentStack(TestCase):
+    """Casos de prueba para la Pila persistente"""
+
+    def test_versiones_independientes(self):
+        """Prueba que push y pop devuelven versiones nuevas sin modificar la original"""
+        vacia = PersistentStack()
+        uno = vacia.push(1)
+        dos = uno.push(2)
+        assert vacia.is_empty() == True
+        assert uno.peek() == 1
+        assert dos.peek() == 2
+        assert dos.pop().peek() == 1
+        assert list(dos) == [2, 1]
+        assert len(dos) == 2
+        self.assertRaises(IndexError, vacia.pop)
+        self.assertRaises(IndexError, vacia.peek)
+
+    def test_estructura_compartida(self):
+        """Prueba que las versiones comparten sus nodos"""
+        base = PersistentStack(range(1000))
+        rama_a = base.push("a")
+        rama_b = base.push("b")
+        assert rama_a._head.next is base._head
+        assert rama_b._head.next is base._head
+        assert rama_a.pop()._head is base._head
+
+
+class TestSnapshotStack(TestCase):
+    """Casos de prueba para la Pila con instantáneas"""
+
+    def test_misma_conducta_que_stack(self):
+        """Prueba que push, pop, peek e is_empty se comportan como en Stack"""
+        stack = SnapshotStack()
+        assert stack.is_empty() == True
+        stack.push(1)
+        stack.push(2)
+        assert stack.peek() == 2
+        assert stack.pop() == 2
+        assert stack.peek() == 1
+        assert stack.is_empty() == False
+        stack.pop()
+        self.assertRaises(IndexError, stack.pop)
+
+    def test_snapshot_y_restore(self):
+        """Prueba deshacer cambios volviendo a una instantánea"""
+        stack = SnapshotStack()
+        stack.push(1)
+        stack.push(2)
+        instantanea = stack.snapshot()
+        stack.pop()
+        stack.push(3)
+        assert list(stack.snapshot()) == [3, 1]
+        stack.restore(instantanea)
+        assert stack.pop() == 2
+        assert stack.pop() == 1
+        assert list(instantanea) == [2, 1]
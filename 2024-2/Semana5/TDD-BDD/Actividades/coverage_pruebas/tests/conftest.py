@@ -0,0 +1,116 @@
+"""
+Fixtures de base de datos para las pruebas de Account
+
+Las pruebas usan una base SQLite en un directorio temporal, nunca el
+models/test.db del repositorio, así que cada proceso de pruebas (cada worker
+de pytest-xdist) tiene la suya.
+
+Modo "transaction" (por defecto): cada prueba corre dentro de una
+transacción de una conexión a la que se liga db.session. Los commit de los
+modelos solo liberan un SAVEPOINT y al final la transacción se revierte.
+
+Modo "truncate": las tablas se vacían antes de cada prueba.
+
+Uso: pytest --db-mode=transaction|truncate
+"""
+import sys
+import os
+import pytest
+from sqlalchemy import event
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from models import app, db
+
+
+def pytest_addoption(parser):
+    parser.addoption("--db-mode", choices=("transaction", "truncate"), default="transaction",
+                     help="aislamiento de la base de datos entre pruebas")
+
+
+def _disable_driver_transactions(dbapi_connection, connection_record):
+    # pysqlite abre y cierra transacciones por su cuenta y rompe los SAVEPOINT;
+    # así las emite solo SQLAlchemy
+    dbapi_connection.isolation_level = None
+
+
+def _begin(connection):
+    connection.exec_driver_sql("BEGIN")
+
+
+def query_plan(function, *args):
+    """Ejecuta la función y devuelve el plan de SQLite de la última consulta que emitió"""
+    sentencias = []
+
+    def registrar(conn, cursor, statement, parameters, context, executemany):
+        sentencias.append((statement, parameters))
+
+    event.listen(db.engine, "before_cursor_execute", registrar)
+    try:
+        function(*args)
+    finally:
+        event.remove(db.engine, "before_cursor_execute", registrar)
+    statement, parameters = sentencias[-1]
+    filas = db.session.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+    return [fila[-1] for fila in filas]
+
+
+@pytest.fixture
+def assert_usa_indice():
+    """Comprueba que la última consulta de una función usa el índice y no recorre ninguna tabla"""
+    def check(indice, function, *args):
+        plan = query_plan(function, *args)
+        assert any(f"USING INDEX {indice}" in detalle or f"USING COVERING INDEX {indice}" in detalle
+                   for detalle in plan), plan
+        assert not any(detalle.startswith("SCAN ") and "INDEX" not in detalle for detalle in plan), plan
+    return check
+
+
+@pytest.fixture(scope="session")
+def database(request, tmp_path_factory):
+    """Crea el esquema en una base temporal y devuelve el modo de aislamiento"""
+    mode = request.config.getoption("--db-mode")
+    uri = app.config["SQLALCHEMY_DATABASE_URI"]
+    # Flask-SQLAlchemy crea un motor nuevo cuando cambia la URI
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{tmp_path_factory.mktemp('db') / 'test.db'}"
+    engine = db.engine
+    if mode == "transaction":
+        event.listen(engine, "connect", _disable_driver_transactions)
+        event.listen(engine, "begin", _begin)
+    db.create_all()
+    yield mode
+    db.session.remove()
+    engine.dispose()
+    app.config["SQLALCHEMY_DATABASE_URI"] = uri
+
+
+@pytest.fixture(autouse=True)
+def isolated_session(database):
+    """Aísla cada prueba: transacción con SAVEPOINTs o tablas vaciadas"""
+    if database == "truncate":
+        for table in reversed(db.Model.metadata.sorted_tables):
+            db.session.execute(table.delete())
+        db.session.commit()
+        yield
+        db.session.remove()
+        return
+
+    connection = db.engine.connect()
+    transaction = connection.begin()
+    db.session.remove()
+    # binds vacío para que las tablas no vuelvan al motor
+    db.session.configure(bind=connection, binds={})
+    nested = connection.begin_nested()
+
+    def restart_savepoint(session, trans):
+        # Cada commit de los modelos libera el SAVEPOINT; se abre otro para el siguiente
+        nonlocal nested
+        if not nested.is_active:
+            nested = connection.begin_nested()
+
+    event.listen(db.session, "after_transaction_end", restart_savepoint)
+    yield
+    event.remove(db.session, "after_transaction_end", restart_savepoint)
+    db.session.remove()
+    db.session.configure(bind=None, binds=db.get_binds())
+    transaction.rollback()
+    connection.close()
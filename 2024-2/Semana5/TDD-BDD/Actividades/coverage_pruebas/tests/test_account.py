@@ -1,5 +1,6 @@
 import json
 import pytest
+from datetime import date
 import sys
 import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
@@ -8,14 +9,7 @@ from models.account import Account
 
 ACCOUNT_DATA = {}
 
-@pytest.fixture(scope="module", autouse=True)
-def setup_database():
-    """Configura la base de datos antes y después de todas las pruebas"""
-    # Se ejecuta antes de todas las pruebas
-    db.create_all()
-    yield
-    # Se ejecuta después de todas las pruebas
-    db.session.close()
+# La base de datos y el aislamiento entre pruebas están en conftest.py
 
 class TestAccountModel:
     """Modelo de Pruebas de Cuenta"""
@@ -33,11 +27,6 @@ class TestAccountModel:
         """Desconectar de la base de datos"""
         pass  # Agrega cualquier acción de limpieza si es necesario
 
-    def setup_method(self):
-        """Truncar las tablas antes de cada prueba"""
-        db.session.query(Account).delete()
-        db.session.commit()
-
     def teardown_method(self):
         """Eliminar la sesión después de cada prueba"""
         db.session.remove()
@@ -55,7 +44,35 @@ class TestAccountModel:
 
     def test_create_all_accounts(self):
         """Probar la creación de múltiples cuentas"""
-        for data in ACCOUNT_DATA:
-            account = Account(**data)
-            account.create()
+        assert Account.create_many(ACCOUNT_DATA) == len(ACCOUNT_DATA)
         assert len(Account.all()) == len(ACCOUNT_DATA)
+
+    def test_find_by_email(self, assert_usa_indice):
+        """Probar la búsqueda de una cuenta por email"""
+        for data in ACCOUNT_DATA:
+            Account(**data).create()
+        data = ACCOUNT_DATA[2]
+        account = Account.find_by_email(data["email"])
+        assert account.name == data["name"]
+        assert Account.find_by_email("nadie@example.com") is None
+        assert_usa_indice("ix_account_email", Account.find_by_email, data["email"])
+
+    def test_find_disabled(self, assert_usa_indice):
+        """Probar la búsqueda de las cuentas deshabilitadas"""
+        for data in ACCOUNT_DATA:
+            Account(**data).create()
+        accounts = Account.find_disabled()
+        expected = [data["email"] for data in ACCOUNT_DATA if data["disabled"]]
+        assert [account.email for account in accounts] == expected
+        assert_usa_indice("ix_account_disabled", Account.find_disabled)
+
+    def test_joined_between(self, assert_usa_indice):
+        """Probar la búsqueda de cuentas por rango de fecha de ingreso"""
+        fechas = [date(2020, 1, 1), date(2020, 6, 15), date(2020, 12, 31), date(2021, 1, 1)]
+        for data, fecha in zip(ACCOUNT_DATA, reversed(fechas)):
+            Account(**data, date_joined=fecha).create()
+        accounts = Account.joined_between(date(2020, 1, 1), date(2020, 12, 31))
+        assert [account.date_joined for account in accounts] == fechas[:3]
+        assert Account.joined_between(date(2022, 1, 1), date(2022, 12, 31)) == []
+        assert_usa_indice("ix_account_date_joined", Account.joined_between,
+                          date(2020, 1, 1), date(2020, 12, 31))
@@ -0,0 +1,71 @@
+"""
+Mide filas por segundo de las operaciones de Account fila por fila y en lotes
+
+Usa una base de datos SQLite temporal en disco.
+
+Uso: python benchmark_account.py [numero_de_cuentas]
+"""
+import os
+import sys
+import tempfile
+import time
+from models import app, db
+from models.account import Account
+
+
+def rows_per_second(function, rows):
+    start = time.perf_counter()
+    function()
+    return rows / (time.perf_counter() - start)
+
+
+def account_data(n):
+    return [{"name": f"Cuenta {i}", "email": f"cuenta{i}@example.com",
+             "phone_number": "555-0100"} for i in range(n)]
+
+
+def create_one_by_one(data):
+    for row in data:
+        Account(**row).create()
+
+
+def update_one_by_one():
+    for account in Account.all():
+        account.name = account.name.upper()
+        account.update()
+
+
+def delete_one_by_one():
+    for account in Account.all():
+        account.delete()
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    with tempfile.TemporaryDirectory() as tmpdir:
+        app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{os.path.join(tmpdir, 'bench.db')}"
+        db.create_all()
+        data = account_data(n)
+        results = []
+
+        results.append(("create", "fila por fila", rows_per_second(lambda: create_one_by_one(data), n)))
+        results.append(("update", "fila por fila", rows_per_second(update_one_by_one, n)))
+        results.append(("delete", "fila por fila", rows_per_second(delete_one_by_one, n)))
+
+        results.append(("create", "create_many", rows_per_second(lambda: Account.create_many(data), n)))
+        changes = [{"id": account.id, "name": account.name.upper()} for account in Account.all()]
+        results.append(("update", "update_many", rows_per_second(lambda: Account.update_many(changes), n)))
+        ids = [change["id"] for change in changes]
+        results.append(("delete", "delete_many", rows_per_second(lambda: Account.delete_many(ids), n)))
+
+        db.session.remove()
+        db.engine.dispose()
+
+    print(f"{n} cuentas en SQLite")
+    print(f"{'operación':10} {'método':15} {'filas/s':>12}")
+    for operation, method, rate in results:
+        print(f"{operation:10} {method:15} {rate:12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
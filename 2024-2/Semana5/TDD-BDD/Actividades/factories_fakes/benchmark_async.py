@@ -0,0 +1,99 @@
+"""
+Compara la latencia de peticiones concurrentes con AsyncAccountRepository
+frente al modelo síncrono envuelto en run_in_executor
+
+Cada petición busca una Cuenta por id y una parte de ellas (la mitad por
+defecto) además actualiza su nombre.
+La caché de Account.find se desactiva para que ambos caminos consulten la
+base de datos.
+
+Usa una base de datos SQLite temporal en disco con el perfil wal.
+
+Uso: python benchmark_async.py [peticiones] [concurrencia] [porcentaje_de_escrituras]
+"""
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from models import app, configure_engine, db
+from models.account import Account
+from models.async_account import AsyncAccountRepository
+from models.cache import TTLCache
+
+SEED_ACCOUNTS = 1000
+WRITE_PERCENT = 50
+
+
+def sync_request(i):
+    account = Account.find(1 + i % SEED_ACCOUNTS)
+    if i % 100 < WRITE_PERCENT:
+        account.name = f"Cuenta {i}"
+        account.update()
+    db.session.remove()
+
+
+async def executor_request(i):
+    await asyncio.get_running_loop().run_in_executor(None, sync_request, i)
+
+
+async def async_request(repository, i):
+    account = await repository.find(1 + i % SEED_ACCOUNTS)
+    if i % 100 < WRITE_PERCENT:
+        account.name = f"Cuenta {i}"
+        await repository.update(account)
+
+
+async def measure(request, requests, concurrency):
+    """Ejecuta las peticiones con a lo sumo concurrency en vuelo y devuelve sus latencias"""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def timed(i):
+        async with semaphore:
+            start = time.perf_counter()
+            await request(i)
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(timed(i) for i in range(requests)))
+    return latencies, time.perf_counter() - start
+
+
+def report(name, latencies, elapsed):
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(f"{name:22} {len(latencies) / elapsed:10,.0f} {statistics.median(latencies) * 1000:9.2f} "
+          f"{p95 * 1000:9.2f}")
+
+
+async def main():
+    global WRITE_PERCENT
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    WRITE_PERCENT = int(sys.argv[3]) if len(sys.argv) > 3 else WRITE_PERCENT
+    Account.cache = TTLCache(maxsize=0)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "bench.db")
+        configure_engine(app, uri=f"sqlite:///{path}", profile="wal", pool_size=concurrency)
+        db.create_all()
+        Account.create_many({"name": f"Cuenta {i}", "email": f"cuenta{i}@example.com"}
+                            for i in range(SEED_ACCOUNTS))
+        db.session.remove()
+        repository = AsyncAccountRepository(f"sqlite+aiosqlite:///{path}", profile="wal",
+                                            poolclass=AsyncAdaptedQueuePool, pool_size=concurrency)
+
+        print(f"{requests} peticiones, {concurrency} concurrentes, {WRITE_PERCENT}% con escritura")
+        print(f"{'camino':22} {'pet./s':>10} {'p50 (ms)':>9} {'p95 (ms)':>9}")
+        report("sync + run_in_executor", *await measure(executor_request, requests, concurrency))
+        report("AsyncSession", *await measure(
+            lambda i: async_request(repository, i), requests, concurrency))
+
+        await repository.close()
+        db.engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
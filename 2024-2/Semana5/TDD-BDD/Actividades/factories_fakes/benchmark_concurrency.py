@@ -0,0 +1,104 @@
+"""
+Mide el rendimiento de Account con hilos escritores y lectores concurrentes
+
+Compara los perfiles de SQLite de models.configure_engine: "default"
+(journal de rollback, una conexión nueva por uso, como antes), "wal" con un
+pool de conexiones y "memory" (base en memoria compartida). Cada escritor
+crea Cuentas de una en una y cada lector busca Cuentas por email durante el
+mismo tiempo. Los errores son operaciones que fallaron por bloqueo.
+
+Uso: python benchmark_concurrency.py [segundos] [escritores] [lectores]
+"""
+import os
+import sys
+import tempfile
+import threading
+import time
+from sqlalchemy.exc import OperationalError
+from models import app, configure_engine, db, memory_uri
+from models.account import Account
+
+SEED_ACCOUNTS = 1000
+
+
+def writer(worker, stop, counts):
+    done = errors = 0
+    while not stop.is_set():
+        account = Account(name=f"Escritor {worker}", email=f"w{worker}-{done}-{errors}@example.com")
+        try:
+            account.create()
+            done += 1
+        except OperationalError:
+            # "database is locked" si se agotó el timeout de SQLite, o "database
+            # table is locked" en memoria compartida, donde no se espera al otro escritor
+            db.session.rollback()
+            errors += 1
+    db.session.remove()
+    counts.append(("escrituras", done, errors))
+
+
+def reader(worker, stop, counts):
+    done = errors = 0
+    while not stop.is_set():
+        try:
+            Account.find_by_email(f"semilla{(worker + done) % SEED_ACCOUNTS}@example.com")
+            db.session.rollback()
+            done += 1
+        except OperationalError:
+            db.session.rollback()
+            errors += 1
+    db.session.remove()
+    counts.append(("lecturas", done, errors))
+
+
+def run(seconds, writers, readers):
+    db.create_all()
+    Account.create_many({"name": f"Semilla {i}", "email": f"semilla{i}@example.com"}
+                        for i in range(SEED_ACCOUNTS))
+    db.session.remove()
+    stop = threading.Event()
+    counts = []
+    threads = [threading.Thread(target=writer, args=(i, stop, counts)) for i in range(writers)]
+    threads += [threading.Thread(target=reader, args=(i, stop, counts)) for i in range(readers)]
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    totals = {}
+    for kind, done, errors in counts:
+        previous = totals.get(kind, (0, 0))
+        totals[kind] = (previous[0] + done, previous[1] + errors)
+    db.drop_all()
+    return totals
+
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 3
+    writers = int(sys.argv[2]) if len(sys.argv) > 2 else 2
+    readers = int(sys.argv[3]) if len(sys.argv) > 3 else 6
+    print(f"{writers} escritores y {readers} lectores durante {seconds:g} s")
+    print(f"{'perfil':24} {'escrituras/s':>13} {'lecturas/s':>11} {'errores esc/lec':>16}")
+    with tempfile.TemporaryDirectory() as tmpdir:
+        cases = [
+            ("default, sin pool", dict(uri=f"sqlite:///{os.path.join(tmpdir, 'default.db')}",
+                                      profile="default", pool_size=0)),
+            ("wal, pool", dict(uri=f"sqlite:///{os.path.join(tmpdir, 'wal.db')}",
+                              profile="wal", pool_size=writers + readers, max_overflow=0)),
+            ("memory, pool", dict(uri=memory_uri("benchmark"), profile="memory",
+                                 pool_size=writers + readers, max_overflow=0)),
+        ]
+        for name, options in cases:
+            configure_engine(app, **options)
+            totals = run(seconds, writers, readers)
+            writes, write_errors = totals.get("escrituras", (0, 0))
+            reads, read_errors = totals.get("lecturas", (0, 0))
+            print(f"{name:24} {writes / seconds:13,.0f} {reads / seconds:11,.0f} "
+                  f"{f'{write_errors}/{read_errors}':>16}")
+            db.session.remove()
+            db.engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
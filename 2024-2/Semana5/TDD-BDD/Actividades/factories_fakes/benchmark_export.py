@@ -0,0 +1,70 @@
+"""
+Mide la exportación a JSON de todas las Cuentas
+
+Compara el método anterior (Account.all() y to_dict por objeto recorriendo
+__table__.columns) con to_dicts sobre instancias y con to_json leyendo filas
+sin construir instancias.
+
+Usa una base de datos SQLite temporal en disco.
+
+Uso: python benchmark_export.py [numero_de_cuentas]
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+from models import app, db
+from models.account import Account
+
+
+def rows_per_second(function, rows):
+    start = time.perf_counter()
+    function()
+    return rows / (time.perf_counter() - start)
+
+
+def account_data(n):
+    return [{"name": f"Cuenta {i}", "email": f"cuenta{i}@example.com",
+             "phone_number": "555-0100", "disabled": i % 10 == 0} for i in range(n)]
+
+
+def export_per_object():
+    """La exportación original: una instancia y un getattr por columna"""
+    data = [{c.name: getattr(account, c.name) for c in account.__table__.columns}
+            for account in Account.all()]
+    return json.dumps(data, default=str)
+
+
+def export_instances():
+    return json.dumps(Account.to_dicts(Account.all()), default=str)
+
+
+def run(function):
+    # Cada medición empieza con una sesión vacía para no reutilizar instancias
+    db.session.remove()
+    return function()
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    with tempfile.TemporaryDirectory() as tmpdir:
+        app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{os.path.join(tmpdir, 'bench.db')}"
+        db.create_all()
+        Account.create_many(account_data(n), batch_size=10_000)
+        results = [
+            ("to_dict por objeto", rows_per_second(lambda: run(export_per_object), n)),
+            ("to_dicts con instancias", rows_per_second(lambda: run(export_instances), n)),
+            ("to_json desde filas", rows_per_second(lambda: run(Account.to_json), n)),
+        ]
+        db.session.remove()
+        db.engine.dispose()
+
+    print(f"{n} cuentas exportadas a JSON")
+    print(f"{'método':25} {'filas/s':>12}")
+    for method, rate in results:
+        print(f"{method:25} {rate:12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Mide filas por segundo al generar Cuentas falsas
+
+Compara AccountFactory (una llamada a Faker por atributo y Cuenta) con
+AccountFactory.generate_rows y generate_rows_parallel.
+
+Uso: python benchmark_factories.py [numero_de_cuentas] [procesos]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "tests"))
+
+from factories import AccountFactory  # noqa: E402
+
+
+def rows_per_second(function, rows):
+    start = time.perf_counter()
+    function()
+    return rows / (time.perf_counter() - start)
+
+
+def consume(rows):
+    for _ in rows:
+        pass
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count()
+    # La factory original es mucho más lenta: se mide sobre una muestra
+    sample = min(n, 10_000)
+    results = [
+        ("AccountFactory()", rows_per_second(
+            lambda: consume(AccountFactory().to_dict() for _ in range(sample)), sample)),
+        ("generate_rows", rows_per_second(
+            lambda: consume(AccountFactory.generate_rows(n)), n)),
+        ("generate_rows as_dict", rows_per_second(
+            lambda: consume(AccountFactory.generate_rows(n, as_dict=True)), n)),
+        (f"parallel, {workers} procesos", rows_per_second(
+            lambda: consume(AccountFactory.generate_rows_parallel(n, workers=workers)), n)),
+    ]
+    print(f"{n} cuentas generadas")
+    print(f"{'método':26} {'filas/s':>12}")
+    for method, rate in results:
+        print(f"{method:26} {rate:12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
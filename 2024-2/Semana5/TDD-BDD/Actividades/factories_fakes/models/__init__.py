@@ -1,10 +1,123 @@
 """
 Data Models
+
+El motor de base de datos se configura con configure_engine: la URI, el
+tamaño del pool y un perfil de PRAGMAs de SQLite que se aplica a cada
+conexión nueva. Los valores iniciales se pueden cambiar con las variables
+de entorno DATABASE_URI, DATABASE_PROFILE, DATABASE_POOL_SIZE y
+DATABASE_MAX_OVERFLOW.
 """
+import os
 from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event
+from sqlalchemy.pool import QueuePool
+
+# PRAGMAs que se ejecutan al abrir cada conexión de SQLite
+SQLITE_PROFILES = {
+    # Comportamiento por defecto de SQLite: journal de rollback y synchronous FULL
+    "default": {},
+    # Con WAL los lectores no bloquean al escritor ni al revés, y con WAL
+    # synchronous NORMAL solo sincroniza el disco en los checkpoints
+    "wal": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "mmap_size": 256 * 1024 * 1024,
+        "cache_size": -64 * 1024,  # negativo: en KiB
+    },
+    # Base en memoria compartida entre las conexiones del proceso, solo para
+    # pruebas. read_uncommitted evita que los lectores choquen con el bloqueo
+    # de tabla del escritor, a cambio de lecturas sucias: una conexión ve los
+    # cambios que otra todavía no confirmó. Dos escritores simultáneos fallan
+    # con "database table is locked"
+    "memory": {
+        "cache_size": -64 * 1024,
+        "read_uncommitted": "ON",
+    },
+}
+
+
+def memory_uri(name: str = "test") -> str:
+    """URI de una base SQLite en memoria con caché compartida entre conexiones"""
+    return f"sqlite:///file:{name}?mode=memory&cache=shared&uri=true"
+
+
+class TunedSQLAlchemy(SQLAlchemy):
+    """SQLAlchemy que aplica el perfil de PRAGMAs de la aplicación a cada conexión"""
+
+    def apply_driver_hacks(self, app, sa_url, options):
+        if sa_url.drivername.startswith("sqlite") and sa_url.query.get("uri") == "true":
+            # Flask-SQLAlchemy convertiría la URI "file:..." en una ruta relativa a la app
+            return sa_url, options
+        return super().apply_driver_hacks(app, sa_url, options)
+
+    def create_engine(self, sa_url, engine_opts):
+        engine = super().create_engine(sa_url, engine_opts)
+        if engine.dialect.name == "sqlite":
+            pragmas = SQLITE_PROFILES[self.get_app().config["SQLITE_PROFILE"]]
+            event.listen(engine, "connect", _pragma_listener(pragmas))
+        return engine
+
+
+def _pragma_listener(pragmas: dict):
+    def apply_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name} = {value}")
+        finally:
+            cursor.close()
+
+    return apply_pragmas
+
+
+def configure_engine(app, uri: str = None, profile: str = None,
+                     pool_size: int = None, max_overflow: int = None) -> None:
+    """Configura la base de datos de la aplicación y descarta el motor anterior
+
+    :param uri: la URI de la base de datos; memory_uri() para pruebas
+    :param profile: un perfil de SQLITE_PROFILES; por defecto "memory" para
+        las URIs en memoria y "default" para los archivos. "wal" hay que
+        pedirlo: el modo WAL queda guardado en el archivo de la base y crea
+        los archivos -wal y -shm a su lado
+    :param pool_size: conexiones que el pool mantiene abiertas; 0 abre y
+        cierra una conexión por uso
+    :param max_overflow: conexiones adicionales permitidas en los picos
+    """
+    uri = uri or app.config.get("SQLALCHEMY_DATABASE_URI") or "sqlite:///test.db"
+    if profile is None:
+        profile = "memory" if "mode=memory" in uri else "default"
+    if profile not in SQLITE_PROFILES:
+        raise ValueError(f"Perfil de SQLite desconocido: {profile}")
+    options = {}
+    if pool_size:
+        options = {
+            "poolclass": QueuePool,
+            "pool_size": pool_size,
+            "max_overflow": 10 if max_overflow is None else max_overflow,
+        }
+        if uri.startswith("sqlite"):
+            # El pool entrega cada conexión a un solo hilo a la vez
+            options["connect_args"] = {"check_same_thread": False}
+    app.config["SQLALCHEMY_DATABASE_URI"] = uri
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = options
+    app.config["SQLITE_PROFILE"] = profile
+    state = app.extensions.get("sqlalchemy")
+    if state is not None:
+        for connector in state.connectors.values():
+            engine = getattr(connector, "_engine", None)
+            if engine is not None:
+                engine.dispose()
+        state.connectors.clear()
+
 
 app = Flask(__name__)
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///test.db'
-db = SQLAlchemy(app)
+configure_engine(
+    app,
+    uri=os.environ.get("DATABASE_URI", "sqlite:///test.db"),
+    profile=os.environ.get("DATABASE_PROFILE"),
+    pool_size=int(os.environ.get("DATABASE_POOL_SIZE", 5)),
+    max_overflow=int(os.environ.get("DATABASE_MAX_OVERFLOW", 10)),
+)
+db = TunedSQLAlchemy(app)
@@ -1,10 +1,19 @@
 """
 Clase Account
 """
+import json
 import logging
-from sqlalchemy import Column, Integer, String, Boolean, Date
+from datetime import date
+from itertools import islice
+from operator import attrgetter
+from typing import Iterable, Iterator, Optional, Sequence
+from sqlalchemy import Column, Integer, String, Boolean, Date, Index, event, inspect, true
+from sqlalchemy.orm import make_transient_to_detached
+from sqlalchemy.orm.exc import StaleDataError
+from sqlalchemy.orm.util import identity_key
 from sqlalchemy.sql import func
 from models import db
+from models.cache import TTLCache
 
 logger = logging.getLogger()
 
@@ -13,28 +22,69 @@ class DataValidationError(Exception):
     """Se utiliza para errores de validación de datos al deserializar"""
 
 
+def _batches(iterable: Iterable, batch_size: int):
+    """Divide un iterable en listas de hasta batch_size elementos"""
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+def _json_default(value):
+    """Convierte a JSON los valores que json no sabe serializar, como date_joined"""
+    if isinstance(value, date):
+        return value.isoformat()
+    raise TypeError(f"Objeto de tipo {type(value).__name__} no serializable a JSON")
+
+
 class Account(db.Model):
     """Clase que representa una Cuenta"""
 
     __tablename__ = 'accounts'  # Asegúrate de definir el nombre de la tabla
 
+    # Caché de lectura para find/find_many, compartida entre sesiones
+    cache = TTLCache(maxsize=10_000, ttl=60.0)
+
     id = Column(Integer, primary_key=True)
     name = Column(String(64), nullable=False)
     email = Column(String(64), nullable=False, unique=True)
     phone_number = Column(String(32), nullable=True)
     disabled = Column(Boolean(), nullable=False, default=False)
-    date_joined = Column(Date, nullable=False, server_default=func.now())
+    date_joined = Column(Date, nullable=False, server_default=func.now(), index=True)
+
+    # email ya tiene el índice de su restricción UNIQUE; las Cuentas deshabilitadas
+    # son pocas, así que basta con un índice parcial sobre ellas
+    __table_args__ = (
+        Index("ix_accounts_disabled", disabled,
+              sqlite_where=disabled == true(), postgresql_where=disabled == true()),
+    )
 
     def __repr__(self):
         return f"<Account '{self.name}'>"
 
     def to_dict(self) -> dict:
         """Serializa la clase como un diccionario"""
-        return {c.name: getattr(self, c.name) for c in self.__table__.columns}
+        names, getter, _ = self._accessors()
+        return dict(zip(names, getter(self)))
 
     def from_dict(self, data: dict) -> None:
-        """Establece los atributos desde un diccionario"""
+        """Establece los atributos desde un diccionario
+
+        Solo acepta columnas del modelo; date_joined puede venir como fecha
+        ISO, tal como la deja to_json.
+        """
+        _, _, allowed = self._accessors()
+        unknown = data.keys() - allowed
+        if unknown:
+            raise DataValidationError(f"Campos desconocidos: {', '.join(sorted(unknown))}")
         for key, value in data.items():
+            if key == "date_joined" and isinstance(value, str):
+                try:
+                    value = date.fromisoformat(value)
+                except ValueError:
+                    raise DataValidationError(f"Fecha inválida en date_joined: {value}") from None
             setattr(self, key, value)
 
     def create(self):
@@ -67,14 +117,336 @@ class Account(db.Model):
         stmt = db.select(cls)
         return db.session.execute(stmt).scalars().all()
 
+    @classmethod
+    def _accessors(cls) -> tuple:
+        """Devuelve los nombres de columnas, su attrgetter y el conjunto de nombres
+
+        Se calculan una sola vez por clase en lugar de recorrer
+        __table__.columns en cada serialización.
+        """
+        accessors = cls.__dict__.get("_column_accessors")
+        if accessors is None:
+            names = tuple(cls.__table__.columns.keys())
+            accessors = (names, attrgetter(*names), frozenset(names))
+            cls._column_accessors = accessors
+        return accessors
+
+    @classmethod
+    def iter_dicts(cls, accounts: Optional[Iterable] = None, chunk_size: int = 1000) -> Iterator[dict]:
+        """Serializa varias Cuentas como diccionarios, de a una
+
+        :param accounts: instancias de Account o filas con todas las columnas en
+            el orden del modelo; si es None se recorren todas las Cuentas con
+            iter_all como filas, sin construir instancias ni cargarlas todas
+        :param chunk_size: cantidad de filas que se traen a la vez cuando accounts es None
+        """
+        names, getter, _ = cls._accessors()
+        if accounts is None:
+            accounts = cls.iter_all(chunk_size, columns=names)
+        for account in accounts:
+            yield dict(zip(names, getter(account) if isinstance(account, cls) else account))
+
+    @classmethod
+    def to_dicts(cls, accounts: Optional[Iterable] = None, chunk_size: int = 1000) -> list:
+        """Serializa varias Cuentas como una lista de diccionarios
+
+        Acepta los mismos argumentos que iter_dicts.
+        """
+        return list(cls.iter_dicts(accounts, chunk_size))
+
+    @classmethod
+    def iter_json(cls, accounts: Optional[Iterable] = None, chunk_size: int = 1000) -> Iterator[str]:
+        """Serializa varias Cuentas como fragmentos de un arreglo JSON
+
+        Se puede escribir a un archivo o a una respuesta sin tener todas las
+        Cuentas en memoria. Acepta los mismos argumentos que iter_dicts.
+        """
+        separator = "["
+        for data in cls.iter_dicts(accounts, chunk_size):
+            yield separator + json.dumps(data, default=_json_default)
+            separator = ","
+        yield "[]" if separator == "[" else "]"
+
+    @classmethod
+    def to_json(cls, accounts: Optional[Iterable] = None, chunk_size: int = 1000) -> str:
+        """Serializa varias Cuentas como un arreglo JSON, con date_joined en formato ISO
+
+        Acepta los mismos argumentos que iter_dicts.
+        """
+        return "".join(cls.iter_json(accounts, chunk_size))
+
+    @classmethod
+    def iter_all(cls, chunk_size: int = 1000, columns: Optional[Sequence[str]] = None,
+                 as_dict: bool = False) -> Iterator:
+        """Recorre todas las Cuentas por bloques, sin cargarlas todas en memoria
+
+        :param chunk_size: cantidad de filas que se traen de la base de datos a la vez
+        :param columns: nombres de columnas; si se indican se devuelven filas
+            (tuplas) con esas columnas en lugar de instancias de Account
+        :param as_dict: con columns, devuelve cada fila como un mapeo columna -> valor
+        """
+        logger.info(f"Recorriendo las Cuentas en bloques de {chunk_size}")
+        stmt = cls._select(columns).order_by(cls.id).execution_options(
+            stream_results=True, yield_per=chunk_size
+        )
+        result = db.session.execute(stmt)
+        return cls._rows(result, columns, as_dict)
+
+    @classmethod
+    def page(cls, after_id: Optional[int] = None, limit: int = 100,
+             columns: Optional[Sequence[str]] = None, as_dict: bool = False) -> list:
+        """Devuelve una página de Cuentas ordenadas por id usando paginación por clave
+
+        Filtra con id > after_id en lugar de OFFSET, de modo que cada página
+        recorre el índice de la clave primaria desde donde terminó la anterior.
+
+        :param after_id: el id de la última Cuenta de la página anterior, o None
+        :param limit: la cantidad máxima de Cuentas de la página
+        """
+        logger.info(f"Procesando página de Cuentas después del id {after_id}")
+        stmt = cls._select(columns)
+        if after_id is not None:
+            stmt = stmt.where(cls.id > after_id)
+        stmt = stmt.order_by(cls.id).limit(limit)
+        return list(cls._rows(db.session.execute(stmt), columns, as_dict))
+
+    @classmethod
+    def _select(cls, columns: Optional[Sequence[str]]):
+        if columns is None:
+            return db.select(cls)
+        return db.select(*(cls.__table__.columns[name] for name in columns))
+
+    @staticmethod
+    def _rows(result, columns: Optional[Sequence[str]], as_dict: bool):
+        if columns is None:
+            return result.scalars()
+        if as_dict:
+            return result.mappings()
+        return result
+
+    @classmethod
+    def create_many(cls, accounts: Iterable, batch_size: int = 1000) -> int:
+        """Crea Cuentas en lotes con un INSERT executemany y un commit por lote
+
+        :param accounts: diccionarios de columnas o instancias de Account
+        :param batch_size: cantidad de Cuentas por transacción
+        :return: la cantidad de Cuentas creadas
+        """
+        logger.info(f"Creando Cuentas en lotes de {batch_size}")
+        created = 0
+        for batch in _batches(accounts, batch_size):
+            mappings = [cls._insert_mapping(account) for account in batch]
+            db.session.bulk_insert_mappings(cls, mappings)
+            db.session.commit()
+            created += len(mappings)
+        return created
+
+    @classmethod
+    def update_many(cls, changes: Iterable[dict], batch_size: int = 1000) -> int:
+        """Actualiza Cuentas en lotes a partir de diccionarios que incluyen su id
+
+        Si un lote tiene un id inexistente se revierte entero; los lotes
+        anteriores ya quedaron confirmados.
+
+        :param changes: diccionarios con el id y las columnas a modificar
+        :param batch_size: cantidad de Cuentas por transacción
+        :return: la cantidad de Cuentas distintas actualizadas
+        """
+        logger.info(f"Actualizando Cuentas en lotes de {batch_size}")
+        _, _, allowed = cls._accessors()
+        updated = 0
+        for batch in _batches(changes, batch_size):
+            if any(not mapping.get("id") for mapping in batch):
+                db.session.rollback()
+                raise DataValidationError("Actualización llamada con campo ID vacío")
+            unknown = set().union(*(mapping.keys() for mapping in batch)) - allowed
+            if unknown:
+                db.session.rollback()
+                raise DataValidationError(f"Campos desconocidos: {', '.join(sorted(unknown))}")
+            try:
+                db.session.bulk_update_mappings(cls, batch)
+                db.session.commit()
+            except StaleDataError:
+                db.session.rollback()
+                raise DataValidationError("Actualización de una Cuenta que no existe") from None
+            ids = {mapping["id"] for mapping in batch}
+            cls.cache.invalidate(*ids)
+            # Cada UPDATE coincidió con una fila, así que se actualizó cada id distinto
+            updated += len(ids)
+        return updated
+
+    @classmethod
+    def delete_many(cls, account_ids: Iterable[int], batch_size: int = 1000) -> int:
+        """Elimina Cuentas en lotes con un DELETE ... WHERE id IN (...) por lote
+
+        :param account_ids: los ids de las Cuentas a eliminar
+        :param batch_size: cantidad de Cuentas por transacción
+        :return: la cantidad de Cuentas eliminadas
+        """
+        logger.info(f"Eliminando Cuentas en lotes de {batch_size}")
+        deleted = 0
+        for batch in _batches(account_ids, batch_size):
+            stmt = db.delete(cls).where(cls.id.in_(batch))
+            result = db.session.execute(stmt, execution_options={"synchronize_session": False})
+            db.session.commit()
+            deleted += result.rowcount
+        return deleted
+
+    @classmethod
+    def _insert_mapping(cls, account) -> dict:
+        """Convierte una Cuenta en un diccionario apto para un INSERT por lotes
+
+        Omite los valores None de las columnas no nulas (como id y date_joined)
+        para que la base de datos aplique su valor por defecto.
+        """
+        data = account.to_dict() if isinstance(account, cls) else account
+        _, _, allowed = cls._accessors()
+        unknown = data.keys() - allowed
+        if unknown:
+            raise DataValidationError(f"Campos desconocidos: {', '.join(sorted(unknown))}")
+        columns = cls.__table__.columns
+        return {key: value for key, value in data.items()
+                if value is not None or columns[key].nullable}
+
     @classmethod
     def find(cls, account_id: int):
         """Encuentra una Cuenta por su ID
 
+        Busca primero en la sesión y en la caché de lectura; solo si no está
+        consulta la base de datos y guarda el resultado en la caché.
+
         :param account_id: el id de la Cuenta a encontrar
         :type account_id: int
         :return: una instancia con el account_id, o None si no se encuentra
         :rtype: Account
         """
         logger.info(f"Procesando búsqueda para id {account_id} ...")
-        return db.session.get(cls, account_id)
+        account = cls._find_cached(account_id)
+        if account is not None:
+            return account
+        account = db.session.get(cls, account_id)
+        if account is not None:
+            cls._cache_account(account)
+        return account
+
+    @classmethod
+    def find_many(cls, account_ids: Iterable[int]) -> list:
+        """Encuentra varias Cuentas por sus IDs
+
+        Los aciertos de caché se resuelven localmente y todos los fallos con
+        una sola consulta IN.
+
+        :param account_ids: los ids de las Cuentas a encontrar
+        :return: las Cuentas encontradas, en el orden de account_ids
+        """
+        account_ids = list(account_ids)
+        logger.info(f"Procesando búsqueda para {len(account_ids)} ids ...")
+        found = {}
+        misses = []
+        for account_id in dict.fromkeys(account_ids):
+            account = cls._find_cached(account_id)
+            if account is None:
+                misses.append(account_id)
+            else:
+                found[account_id] = account
+        if misses:
+            stmt = db.select(cls).where(cls.id.in_(misses))
+            for account in db.session.execute(stmt).scalars():
+                cls._cache_account(account)
+                found[account.id] = account
+        return [found[account_id] for account_id in account_ids if account_id in found]
+
+    @classmethod
+    def find_by_email(cls, email: str):
+        """Encuentra una Cuenta por su email
+
+        :param email: el email de la Cuenta a encontrar
+        :return: una instancia con el email, o None si no se encuentra
+        :rtype: Account
+        """
+        logger.info(f"Procesando búsqueda para email {email} ...")
+        stmt = db.select(cls).where(cls.email == email)
+        return db.session.execute(stmt).scalar_one_or_none()
+
+    @classmethod
+    def find_disabled(cls) -> list:
+        """Devuelve las Cuentas deshabilitadas ordenadas por id"""
+        logger.info("Procesando Cuentas deshabilitadas")
+        # Se compara con true() para que la condición coincida con la del índice parcial
+        stmt = db.select(cls).where(cls.disabled == true()).order_by(cls.id)
+        return db.session.execute(stmt).scalars().all()
+
+    @classmethod
+    def joined_between(cls, start: date, end: date) -> list:
+        """Devuelve las Cuentas que se unieron entre start y end, ambos incluidos
+
+        :param start: la primera fecha del rango
+        :param end: la última fecha del rango
+        :return: las Cuentas ordenadas por date_joined y luego por id
+        """
+        logger.info(f"Procesando Cuentas unidas entre {start} y {end}")
+        stmt = (db.select(cls).where(cls.date_joined.between(start, end))
+                .order_by(cls.date_joined, cls.id))
+        return db.session.execute(stmt).scalars().all()
+
+    @classmethod
+    def _find_cached(cls, account_id: int):
+        """Devuelve la Cuenta desde la sesión o la caché sin consultar la base de datos"""
+        account = db.session.identity_map.get(identity_key(cls, account_id))
+        if account is not None:
+            state = inspect(account)
+            if not state.unloaded:
+                if cls.cache.get(account_id) is None:
+                    cls._cache_account(account)
+                return account
+        if account_id in db.session.info.get("changed_accounts", ()):
+            # La sesión tiene cambios sin confirmar de esta Cuenta que la caché no refleja
+            return None
+        data = cls.cache.get(account_id)
+        if data is None:
+            return None
+        # Se reconstruye como instancia ya persistida y se une a la sesión sin un SELECT
+        account = cls(**data)
+        make_transient_to_detached(account)
+        return db.session.merge(account, load=False)
+
+    @classmethod
+    def _cache_account(cls, account) -> None:
+        # Solo se guarda estado confirmado: si la sesión ya envió cambios de Cuentas
+        # sin commit, lo leído podría desaparecer con un rollback
+        session = db.session()
+        if not session.info.get("changed_accounts") and not session.is_modified(account):
+            cls.cache.set(account.id, account.to_dict())
+
+
+@event.listens_for(db.session, "after_flush")
+def _collect_changed_accounts(session, flush_context):
+    """Invalida las Cuentas creadas, modificadas o eliminadas en el flush"""
+    changed = {obj.id for obj in (*session.new, *session.dirty, *session.deleted)
+               if isinstance(obj, Account)}
+    Account.cache.invalidate(*changed)
+    session.info.setdefault("changed_accounts", set()).update(changed)
+
+
+@event.listens_for(db.session, "after_commit")
+def _invalidate_committed_accounts(session):
+    """Vuelve a invalidar al confirmar, por si otra sesión leyó los datos anteriores"""
+    Account.cache.invalidate(*session.info.pop("changed_accounts", ()))
+
+
+@event.listens_for(db.session, "after_rollback")
+def _forget_changed_accounts(session):
+    """Invalida las Cuentas enviadas o pendientes en la transacción revertida"""
+    changed = session.info.pop("changed_accounts", set())
+    changed.update(obj.id for obj in (*session.new, *session.dirty)
+                   if isinstance(obj, Account) and obj.id is not None)
+    Account.cache.invalidate(*changed)
+
+
+@event.listens_for(db.session, "do_orm_execute")
+def _invalidate_on_bulk_statement(orm_execute_state):
+    """Vacía la caché ante UPDATE o DELETE masivos sobre las Cuentas"""
+    if orm_execute_state.is_update or orm_execute_state.is_delete:
+        mapper = orm_execute_state.bind_mapper
+        if mapper is not None and mapper.class_ is Account:
+            Account.cache.clear()
@@ -0,0 +1,110 @@
+"""
+Repositorio asíncrono de Cuentas sobre AsyncSession de SQLAlchemy
+
+Usa el mismo mapeo de Account (y la tabla accounts) que el modelo síncrono,
+pero cada operación abre su propia AsyncSession, así que puede llamarse
+desde muchas corrutinas a la vez sin bloquear el bucle de eventos.
+"""
+import asyncio
+import logging
+import weakref
+from contextlib import asynccontextmanager
+from typing import Optional
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from models import SQLITE_PROFILES, _pragma_listener
+from models.account import Account, DataValidationError
+
+logger = logging.getLogger()
+
+
+class AsyncAccountRepository:
+    """Operaciones CRUD de Account con AsyncSession"""
+
+    def __init__(self, uri: str = "sqlite+aiosqlite:///test.db", profile: Optional[str] = None,
+                 **engine_options):
+        """
+        :param uri: URI con un driver asíncrono, por ejemplo sqlite+aiosqlite:///test.db
+        :param profile: un perfil de SQLITE_PROFILES que se aplica a cada conexión de SQLite
+        :param engine_options: argumentos adicionales para create_async_engine
+        """
+        self.engine = create_async_engine(uri, **engine_options)
+        if profile is not None and self.engine.dialect.name == "sqlite":
+            event.listen(self.engine.sync_engine, "connect",
+                         _pragma_listener(SQLITE_PROFILES[profile]))
+        # Sin expirar al confirmar: las Cuentas devueltas se leen ya fuera de la sesión
+        self._sessions = sessionmaker(self.engine, class_=AsyncSession, expire_on_commit=False)
+        # SQLite admite un solo escritor: las escrituras esperan su turno en el bucle de
+        # eventos en lugar de reintentar con el busy timeout dentro de la base de datos
+        self._serialize_writes = self.engine.dialect.name == "sqlite"
+        self._write_locks = weakref.WeakKeyDictionary()
+
+    @asynccontextmanager
+    async def _writing(self):
+        """Abre una sesión para escribir, de a una por bucle de eventos en SQLite"""
+        if not self._serialize_writes:
+            async with self._sessions() as session:
+                yield session
+            return
+        loop = asyncio.get_running_loop()
+        lock = self._write_locks.get(loop)
+        if lock is None:
+            lock = self._write_locks[loop] = asyncio.Lock()
+        async with lock, self._sessions() as session:
+            yield session
+
+    async def create_all(self) -> None:
+        """Crea la tabla accounts si no existe"""
+        async with self.engine.begin() as conn:
+            await conn.run_sync(Account.metadata.create_all, tables=[Account.__table__])
+
+    async def close(self) -> None:
+        """Cierra las conexiones del motor"""
+        await self.engine.dispose()
+
+    async def create(self, account: Account) -> Account:
+        """Crea una Cuenta en la base de datos"""
+        logger.info(f"Creando {account.name}")
+        async with self._writing() as session:
+            session.add(account)
+            await session.commit()
+            # Carga los valores por defecto del servidor, como date_joined
+            await session.refresh(account)
+        return account
+
+    async def update(self, account: Account) -> Account:
+        """Actualiza una Cuenta en la base de datos"""
+        logger.info(f"Guardando {account.name}")
+        if not account.id:
+            raise DataValidationError("Actualización llamada con campo ID vacío")
+        async with self._writing() as session:
+            account = await session.merge(account)
+            await session.commit()
+        Account.cache.invalidate(account.id)
+        return account
+
+    async def delete(self, account: Account) -> None:
+        """Elimina una Cuenta del almacén de datos"""
+        logger.info(f"Eliminando {account.name}")
+        async with self._writing() as session:
+            await session.delete(await session.merge(account))
+            await session.commit()
+        Account.cache.invalidate(account.id)
+
+    async def all(self) -> list:
+        """Devuelve todas las Cuentas en la base de datos"""
+        logger.info("Procesando todas las Cuentas")
+        async with self._sessions() as session:
+            result = await session.execute(select(Account).order_by(Account.id))
+            return result.scalars().all()
+
+    async def find(self, account_id: int) -> Optional[Account]:
+        """Encuentra una Cuenta por su ID
+
+        :param account_id: el id de la Cuenta a encontrar
+        :return: una instancia con el account_id, o None si no se encuentra
+        """
+        logger.info(f"Procesando búsqueda para id {account_id} ...")
+        async with self._sessions() as session:
+            return await session.get(Account, account_id)
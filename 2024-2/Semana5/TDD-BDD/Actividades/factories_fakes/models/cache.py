@@ -0,0 +1,54 @@
+"""
+Caché LRU acotada con expiración por TTL
+"""
+import threading
+import time
+from collections import OrderedDict
+
+
+class TTLCache:
+    """Caché LRU de hasta maxsize entradas que expiran a los ttl segundos"""
+
+    def __init__(self, maxsize: int = 10_000, ttl: float = 60.0, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key):
+        """Devuelve el valor de la clave o None si no está o expiró"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires = entry
+            if expires <= self._clock():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value) -> None:
+        """Guarda el valor de la clave, descartando la entrada menos usada si no cabe"""
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (value, self._clock() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, *keys) -> None:
+        """Elimina las claves indicadas"""
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Vacía la caché"""
+        with self._lock:
+            self._entries.clear()
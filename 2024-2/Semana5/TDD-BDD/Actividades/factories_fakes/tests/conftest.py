@@ -0,0 +1,38 @@
+"""
+Utilidades compartidas por las pruebas de los modelos
+"""
+import sys
+import os
+import pytest
+from sqlalchemy import event
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from models import db
+
+
+def query_plan(function, *args):
+    """Ejecuta la función y devuelve el plan de SQLite de la última consulta que emitió"""
+    sentencias = []
+
+    def registrar(conn, cursor, statement, parameters, context, executemany):
+        sentencias.append((statement, parameters))
+
+    event.listen(db.engine, "before_cursor_execute", registrar)
+    try:
+        function(*args)
+    finally:
+        event.remove(db.engine, "before_cursor_execute", registrar)
+    statement, parameters = sentencias[-1]
+    filas = db.session.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+    return [fila[-1] for fila in filas]
+
+
+@pytest.fixture
+def assert_usa_indice():
+    """Comprueba que la última consulta de una función usa el índice y no recorre ninguna tabla"""
+    def check(indice, function, *args):
+        plan = query_plan(function, *args)
+        assert any(f"USING INDEX {indice}" in detalle or f"USING COVERING INDEX {indice}" in detalle
+                   for detalle in plan), plan
+        assert not any(detalle.startswith("SCAN ") and "INDEX" not in detalle for detalle in plan), plan
+    return check
@@ -7,11 +7,22 @@ Documentación sobre Faker Providers:
 Documentación sobre Atributos Fuzzy:
     https://factoryboy.readthedocs.io/en/stable/fuzzy.html
 """
+import os
+import random
+import re
+import unicodedata
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 import factory
 from datetime import date
 from factory.fuzzy import FuzzyChoice, FuzzyDate
+from faker import Faker
 from models.account import Account
 
+# Columnas de las filas que generan los métodos en lote, sin id
+ROW_COLUMNS = ("name", "email", "phone_number", "disabled", "date_joined")
+JOINED_FROM = date(2008, 1, 1)
+
 class AccountFactory(factory.Factory):
     """Crea cuentas falsas"""
 
@@ -24,3 +35,78 @@ class AccountFactory(factory.Factory):
     phone_number = factory.Faker("phone_number")
     disabled = FuzzyChoice(choices=[True, False])
     date_joined = FuzzyDate(date(2008, 1, 1))
+
+    @classmethod
+    def generate_rows(cls, count: int, seed: int = 0, start: int = 0, as_dict: bool = False,
+                      pool_size: int = 1000, joined_until: date = None):
+        """Genera filas de Cuentas falsas para inserciones en lote
+
+        En lugar de llamar a Faker por cada Cuenta, genera una vez pools de
+        nombres, teléfonos y dominios con la semilla, y después elige de ellos
+        con un random.Random con la misma semilla. El email combina el nombre
+        con el número de fila (start + i), así que es único entre todas las
+        filas generadas con rangos disjuntos, sea cual sea la semilla.
+
+        :param count: cantidad de filas a generar
+        :param seed: semilla de Faker y de las elecciones; la misma semilla
+            genera las mismas filas
+        :param start: número de la primera fila
+        :param as_dict: devuelve diccionarios, como los que recibe
+            Account.create_many, en lugar de tuplas con ROW_COLUMNS
+        :param pool_size: cantidad de valores de Faker generados por pool
+        :param joined_until: última fecha de ingreso posible; por defecto hoy
+        """
+        fake = Faker()
+        fake.seed_instance(seed)
+        names = [fake.name() for _ in range(pool_size)]
+        local_parts = [_email_local_part(name) for name in names]
+        phones = [fake.phone_number() for _ in range(pool_size)]
+        domains = [fake.safe_domain_name() for _ in range(min(pool_size, 16))]
+        rng = random.Random(seed)
+        first_day = JOINED_FROM.toordinal()
+        last_day = (joined_until or date.today()).toordinal()
+        for number in range(start, start + count):
+            person = rng.randrange(pool_size)
+            row = (
+                names[person],
+                f"{local_parts[person]}.{number}@{domains[number % len(domains)]}",
+                phones[rng.randrange(pool_size)],
+                rng.random() < 0.5,
+                date.fromordinal(rng.randint(first_day, last_day)),
+            )
+            yield dict(zip(ROW_COLUMNS, row)) if as_dict else row
+
+    @classmethod
+    def generate_rows_parallel(cls, count: int, seed: int = 0, workers: int = None,
+                               chunk_size: int = 100_000, as_dict: bool = False,
+                               pool_size: int = 1000, joined_until: date = None):
+        """Genera filas como generate_rows repartiendo bloques entre procesos
+
+        Cada bloque usa la semilla seed + número de bloque, de modo que el
+        resultado no depende de la cantidad de procesos. Las filas se
+        devuelven en orden y solo hay unos pocos bloques en vuelo a la vez.
+        """
+        joined_until = joined_until or date.today()
+        workers = workers or os.cpu_count() or 1
+        tasks = ((min(chunk_size, count - start), seed + index, start, as_dict, pool_size,
+                  joined_until)
+                 for index, start in enumerate(range(0, count, chunk_size)))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending = deque()
+            for task in tasks:
+                pending.append(pool.submit(_generate_chunk, task))
+                if len(pending) >= 2 * workers:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+
+
+def _generate_chunk(task) -> list:
+    count, seed, start, as_dict, pool_size, joined_until = task
+    return list(AccountFactory.generate_rows(count, seed, start, as_dict, pool_size, joined_until))
+
+
+def _email_local_part(name: str) -> str:
+    """Convierte un nombre en la parte local de un email, por ejemplo jose.perez"""
+    ascii_name = unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode()
+    return ".".join(re.findall(r"[a-z0-9]+", ascii_name.lower())) or "cuenta"
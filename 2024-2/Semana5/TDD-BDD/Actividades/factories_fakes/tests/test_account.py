@@ -1,20 +1,25 @@
 """
 Casos de Prueba TestAccountModel
 """
+import json
 import pytest
 import sys
 import os
+from contextlib import contextmanager
+from datetime import date
+from sqlalchemy import event
 
 # Agrega el directorio raíz del proyecto al PYTHONPATH
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from models import db
+from models import app, configure_engine, db, memory_uri
 from models.account import Account, DataValidationError
 from factories import AccountFactory
 
 @pytest.fixture(scope="session", autouse=True)
 def setup_database():
-    """Configura la base de datos antes de las pruebas"""
+    """Configura una base en memoria antes de las pruebas"""
+    configure_engine(app, memory_uri("test_account"))
     db.create_all()
     yield
     db.session.close()
@@ -27,6 +32,20 @@ def clean_tables():
     yield
     db.session.remove()
 
+@contextmanager
+def count_queries():
+    """Registra las sentencias SQL ejecutadas dentro del bloque"""
+    consultas = []
+
+    def registrar(conn, cursor, statement, parameters, context, executemany):
+        consultas.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", registrar)
+    try:
+        yield consultas
+    finally:
+        event.remove(db.engine, "before_cursor_execute", registrar)
+
 class TestAccountModel:
     """Pruebas para el Modelo Account"""
 
@@ -68,6 +87,39 @@ class TestAccountModel:
         assert account.phone_number == data["phone_number"]
         assert account.disabled == data["disabled"]
 
+    def test_from_dict_rechaza_campos_desconocidos(self):
+        """Prueba que from_dict no acepta campos que no son columnas"""
+        account = Account()
+        with pytest.raises(DataValidationError):
+            account.from_dict({"name": "Foo", "password": "secreto"})
+        with pytest.raises(DataValidationError):
+            account.from_dict({"date_joined": "ayer"})
+
+    def test_to_dicts(self):
+        """Prueba la serialización de varias Cuentas desde instancias y desde filas"""
+        cuentas = [AccountFactory(id=None) for _ in range(5)]
+        Account.create_many(cuentas)
+        esperado = [cuenta.to_dict() for cuenta in Account.all()]
+        assert Account.to_dicts(Account.all()) == esperado
+        assert Account.to_dicts() == esperado
+        db.session.remove()
+        with count_queries() as consultas:
+            Account.to_dicts(chunk_size=2)
+        assert len(consultas) == 1
+
+    def test_to_json(self):
+        """Prueba que to_json serializa date_joined y que from_dict lo vuelve a leer"""
+        Account.create_many([AccountFactory(id=None, date_joined=date(2020, 2, 29))])
+        datos = json.loads(Account.to_json())
+        assert datos[0]["date_joined"] == "2020-02-29"
+        assert json.loads(Account.to_json([])) == []
+        fragmentos = Account.iter_json(chunk_size=1)
+        assert next(fragmentos).startswith('[{"id": ')
+        account = Account()
+        account.from_dict(datos[0])
+        assert account.date_joined == date(2020, 2, 29)
+        assert account.to_dict() == Account.all()[0].to_dict()
+
     def test_actualizar_una_cuenta(self):
         """Prueba la actualización de una Cuenta usando datos conocidos"""
         account = AccountFactory()
@@ -92,3 +144,214 @@ class TestAccountModel:
         assert len(Account.all()) == 1
         account.delete()
         assert len(Account.all()) == 0
+
+    def test_crear_cuentas_en_lotes(self):
+        """Prueba la creación de Cuentas en lotes desde diccionarios e instancias"""
+        datos = [AccountFactory(id=None).to_dict() for _ in range(7)]
+        cuentas = [AccountFactory(id=None) for _ in range(3)]
+        creadas = Account.create_many(datos + cuentas, batch_size=4)
+        assert creadas == 10
+        todas = Account.all()
+        assert len(todas) == 10
+        assert {cuenta.email for cuenta in todas} == {d["email"] for d in datos} | {c.email for c in cuentas}
+        assert all(cuenta.id is not None for cuenta in todas)
+
+    def test_crear_cuentas_en_lotes_con_campo_desconocido(self):
+        """Prueba que un campo que no es columna lanza DataValidationError"""
+        with pytest.raises(DataValidationError, match="Campos desconocidos: edad"):
+            Account.create_many([{"name": "Foo", "email": "foo@example.com", "edad": 30}])
+        assert Account.all() == []
+
+    def test_crear_cuentas_en_lotes_con_fecha_por_defecto(self):
+        """Prueba que date_joined toma el valor por defecto de la base de datos"""
+        Account.create_many([{"name": "Foo", "email": "foo@example.com"}])
+        cuenta = Account.all()[0]
+        assert cuenta.date_joined is not None
+        assert cuenta.disabled is False
+
+    def test_crear_cuentas_generadas_en_lote(self):
+        """Prueba que las filas de AccountFactory.generate_rows se insertan con create_many"""
+        creadas = Account.create_many(AccountFactory.generate_rows(500, seed=1, as_dict=True),
+                                      batch_size=200)
+        assert creadas == 500
+        assert len(Account.all()) == 500
+
+    def test_actualizar_cuentas_en_lotes(self):
+        """Prueba la actualización de Cuentas en lotes"""
+        Account.create_many(AccountFactory(id=None).to_dict() for _ in range(5))
+        cambios = [{"id": cuenta.id, "name": f"Cuenta {cuenta.id}"} for cuenta in Account.all()]
+        assert Account.update_many(cambios, batch_size=2) == 5
+        for cuenta in Account.all():
+            assert cuenta.name == f"Cuenta {cuenta.id}"
+
+    def test_id_invalido_al_actualizar_en_lotes(self):
+        """Prueba la actualización en lotes con un ID vacío"""
+        with pytest.raises(DataValidationError):
+            Account.update_many([{"id": None, "name": "Foo"}])
+
+    def test_campos_desconocidos_al_actualizar_en_lotes(self):
+        """Prueba la actualización en lotes con una columna que no existe"""
+        account = AccountFactory()
+        account.create()
+        with pytest.raises(DataValidationError, match="Campos desconocidos: nombre"):
+            Account.update_many([{"id": account.id, "nombre": "Foo"}])
+
+    def test_id_inexistente_al_actualizar_en_lotes(self):
+        """Prueba que un id inexistente revierte el lote y deja la sesión utilizable"""
+        account = AccountFactory()
+        account.create()
+        account_id, name = account.id, account.name
+        with pytest.raises(DataValidationError):
+            Account.update_many([{"id": account_id, "name": "Foo"}, {"id": 999999, "name": "Bar"}])
+        assert Account.find(account_id).name == name
+        assert Account.update_many([{"id": account_id, "name": "Foo"},
+                                    {"id": account_id, "phone_number": "555"}]) == 1
+        assert Account.find(account_id).name == "Foo"
+
+    def test_eliminar_cuentas_en_lotes(self):
+        """Prueba la eliminación de Cuentas en lotes"""
+        Account.create_many(AccountFactory(id=None).to_dict() for _ in range(5))
+        ids = [cuenta.id for cuenta in Account.all()]
+        assert Account.delete_many(ids[:4], batch_size=3) == 4
+        restantes = Account.all()
+        assert [cuenta.id for cuenta in restantes] == ids[4:]
+
+    def test_recorrer_todas_por_bloques(self):
+        """Prueba que iter_all devuelve todas las Cuentas en orden de id"""
+        Account.create_many(AccountFactory(id=None).to_dict() for _ in range(25))
+        ids = [cuenta.id for cuenta in Account.iter_all(chunk_size=10)]
+        assert ids == sorted(cuenta.id for cuenta in Account.all())
+
+    def test_recorrer_solo_columnas(self):
+        """Prueba el modo que devuelve filas en lugar de instancias"""
+        account = AccountFactory()
+        account.create()
+        filas = list(Account.iter_all(columns=["id", "email"]))
+        assert filas == [(account.id, account.email)]
+        dicts = list(Account.iter_all(columns=["name"], as_dict=True))
+        assert dicts == [{"name": account.name}]
+
+    def test_paginar_por_clave(self):
+        """Prueba que page recorre todas las Cuentas sin repetir ni saltar"""
+        Account.create_many(AccountFactory(id=None).to_dict() for _ in range(7))
+        vistas = []
+        after_id = None
+        while True:
+            pagina = Account.page(after_id, limit=3)
+            if not pagina:
+                break
+            assert len(pagina) <= 3
+            vistas.extend(cuenta.id for cuenta in pagina)
+            after_id = pagina[-1].id
+        assert vistas == sorted(cuenta.id for cuenta in Account.all())
+
+    def test_paginar_solo_columnas(self):
+        """Prueba la paginación devolviendo diccionarios"""
+        Account.create_many(AccountFactory(id=None).to_dict() for _ in range(3))
+        primera = Account.page(limit=2, columns=["id"], as_dict=True)
+        segunda = Account.page(primera[-1]["id"], limit=2, columns=["id"], as_dict=True)
+        assert len(primera) == 2
+        assert len(segunda) == 1
+
+    def test_find_usa_la_cache(self):
+        """Prueba que find no consulta la base de datos en un acierto de caché"""
+        account = AccountFactory()
+        account.create()
+        account_id, name, email = account.id, account.name, account.email
+        Account.find(account_id)
+        db.session.remove()
+        with count_queries() as consultas:
+            found = Account.find(account_id)
+            assert found.name == name
+            assert found.email == email
+        assert consultas == []
+
+    def test_find_invalida_al_actualizar(self):
+        """Prueba que update invalida la caché de la Cuenta"""
+        account = AccountFactory()
+        account.create()
+        account_id = account.id
+        Account.find(account_id)
+        account.name = "Rumpelstiltskin"
+        account.update()
+        db.session.remove()
+        assert Account.find(account_id).name == "Rumpelstiltskin"
+
+    def test_find_invalida_al_eliminar(self):
+        """Prueba que delete invalida la caché de la Cuenta"""
+        account = AccountFactory()
+        account.create()
+        account_id = account.id
+        Account.find(account_id)
+        account.delete()
+        db.session.remove()
+        assert Account.find(account_id) is None
+
+    def test_find_invalida_al_actualizar_en_lotes(self):
+        """Prueba que update_many invalida la caché de las Cuentas"""
+        account = AccountFactory()
+        account.create()
+        account_id = account.id
+        Account.find(account_id)
+        Account.update_many([{"id": account_id, "name": "Foo"}])
+        db.session.remove()
+        assert Account.find(account_id).name == "Foo"
+
+    def test_find_no_guarda_cambios_revertidos(self):
+        """Prueba que find no deja en la caché cambios enviados y luego revertidos"""
+        account = AccountFactory()
+        account.create()
+        account_id, name = account.id, account.name
+        account.name = "Rumpelstiltskin"
+        nueva = AccountFactory(id=None)
+        db.session.add(nueva)
+        db.session.flush()
+        nueva_id = nueva.id
+        assert Account.find(account_id).name == "Rumpelstiltskin"
+        assert Account.find(nueva_id) is nueva
+        db.session.rollback()
+        db.session.remove()
+        assert Account.find(account_id).name == name
+        assert Account.find(nueva_id) is None
+
+    def test_find_many(self):
+        """Prueba que find_many resuelve los fallos de caché con una sola consulta"""
+        Account.create_many(AccountFactory(id=None).to_dict() for _ in range(5))
+        ids = [cuenta.id for cuenta in Account.all()]
+        Account.find(ids[0])
+        Account.find(ids[1])
+        db.session.remove()
+        with count_queries() as consultas:
+            encontradas = Account.find_many([ids[4], ids[0], 999999, ids[2], ids[1], ids[3]])
+        assert [cuenta.id for cuenta in encontradas] == [ids[4], ids[0], ids[2], ids[1], ids[3]]
+        assert len(consultas) == 1
+
+    def test_find_by_email(self, assert_usa_indice):
+        """Prueba la búsqueda de una Cuenta por email"""
+        cuentas = [AccountFactory(id=None) for _ in range(3)]
+        Account.create_many(cuentas)
+        encontrada = Account.find_by_email(cuentas[1].email)
+        assert encontrada.name == cuentas[1].name
+        assert Account.find_by_email("nadie@example.com") is None
+        assert_usa_indice("sqlite_autoindex_accounts_1", Account.find_by_email, cuentas[1].email)
+
+    def test_find_disabled(self, assert_usa_indice):
+        """Prueba la búsqueda de las Cuentas deshabilitadas"""
+        Account.create_many(AccountFactory(id=None, disabled=i % 3 == 0).to_dict()
+                            for i in range(9))
+        deshabilitadas = Account.find_disabled()
+        assert len(deshabilitadas) == 3
+        assert all(cuenta.disabled for cuenta in deshabilitadas)
+        assert [cuenta.id for cuenta in deshabilitadas] == sorted(c.id for c in deshabilitadas)
+        assert_usa_indice("ix_accounts_disabled", Account.find_disabled)
+
+    def test_joined_between(self, assert_usa_indice):
+        """Prueba la búsqueda de Cuentas por rango de fecha de ingreso"""
+        fechas = [date(2020, 1, 1), date(2020, 6, 15), date(2020, 12, 31), date(2021, 1, 1)]
+        Account.create_many(AccountFactory(id=None, date_joined=fecha).to_dict()
+                            for fecha in reversed(fechas))
+        cuentas = Account.joined_between(date(2020, 1, 1), date(2020, 12, 31))
+        assert [cuenta.date_joined for cuenta in cuentas] == fechas[:3]
+        assert Account.joined_between(date(2022, 1, 1), date(2022, 12, 31)) == []
+        assert_usa_indice("ix_accounts_date_joined", Account.joined_between,
+                          date(2020, 1, 1), date(2020, 12, 31))
@@ -0,0 +1,78 @@
+"""
+Casos de Prueba del repositorio asíncrono de Cuentas
+"""
+import asyncio
+import pytest
+import sys
+import os
+
+# Agrega el directorio raíz del proyecto al PYTHONPATH
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from models.account import Account, DataValidationError
+from models.async_account import AsyncAccountRepository
+from factories import AccountFactory
+
+@pytest.fixture
+def repository(tmp_path):
+    """Repositorio sobre una base aiosqlite temporal con la tabla accounts creada"""
+    repository = AsyncAccountRepository(f"sqlite+aiosqlite:///{tmp_path / 'async.db'}", profile="wal")
+    asyncio.run(repository.create_all())
+    yield repository
+    asyncio.run(repository.close())
+
+def nueva_cuenta(**kwargs):
+    """Una Cuenta sin id, para que la base de datos lo asigne"""
+    return AccountFactory(id=None, **kwargs)
+
+class TestAsyncAccountRepository:
+    """Pruebas para AsyncAccountRepository"""
+
+    def test_crear_y_buscar(self, repository):
+        """Prueba la creación de una Cuenta y su búsqueda por id"""
+        async def escenario():
+            account = await repository.create(nueva_cuenta(date_joined=None))
+            return account, await repository.find(account.id)
+
+        account, found = asyncio.run(escenario())
+        assert account.id is not None
+        assert account.date_joined is not None
+        assert found.to_dict() == account.to_dict()
+
+    def test_buscar_inexistente(self, repository):
+        """Prueba que find devuelve None si la Cuenta no existe"""
+        assert asyncio.run(repository.find(0)) is None
+
+    def test_listar_todas(self, repository):
+        """Prueba all con Cuentas creadas concurrentemente"""
+        async def escenario():
+            await asyncio.gather(*(repository.create(nueva_cuenta()) for _ in range(10)))
+            return await repository.all()
+
+        accounts = asyncio.run(escenario())
+        assert len(accounts) == 10
+        assert [account.id for account in accounts] == sorted(account.id for account in accounts)
+
+    def test_actualizar(self, repository):
+        """Prueba la actualización de una Cuenta"""
+        async def escenario():
+            account = await repository.create(nueva_cuenta())
+            account.name = "Rumpelstiltskin"
+            await repository.update(account)
+            return await repository.find(account.id)
+
+        assert asyncio.run(escenario()).name == "Rumpelstiltskin"
+
+    def test_actualizar_sin_id(self, repository):
+        """Prueba que update sin id es un error de validación"""
+        with pytest.raises(DataValidationError):
+            asyncio.run(repository.update(Account(name="Foo", email="foo@example.com")))
+
+    def test_eliminar(self, repository):
+        """Prueba la eliminación de una Cuenta"""
+        async def escenario():
+            account = await repository.create(nueva_cuenta())
+            await repository.delete(account)
+            return await repository.all()
+
+        assert asyncio.run(escenario()) == []
@@ -0,0 +1,53 @@
+"""
+Casos de Prueba TTLCache
+"""
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from models.cache import TTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestTTLCache:
+    """Pruebas para la caché LRU con TTL"""
+
+    def test_expira_por_ttl(self):
+        """Prueba que una entrada expira a los ttl segundos"""
+        clock = FakeClock()
+        cache = TTLCache(ttl=10, clock=clock)
+        cache.set(1, "uno")
+        assert cache.get(1) == "uno"
+        clock.now = 10.0
+        assert cache.get(1) is None
+        assert len(cache) == 0
+
+    def test_descarta_la_menos_usada(self):
+        """Prueba que al llenarse se descarta la entrada menos usada"""
+        cache = TTLCache(maxsize=2)
+        cache.set(1, "uno")
+        cache.set(2, "dos")
+        cache.get(1)
+        cache.set(3, "tres")
+        assert cache.get(1) == "uno"
+        assert cache.get(2) is None
+        assert cache.get(3) == "tres"
+
+    def test_invalidar(self):
+        """Prueba la invalidación de claves"""
+        cache = TTLCache()
+        cache.set(1, "uno")
+        cache.set(2, "dos")
+        cache.invalidate(1, 3)
+        assert cache.get(1) is None
+        assert cache.get(2) == "dos"
+        cache.clear()
+        assert len(cache) == 0
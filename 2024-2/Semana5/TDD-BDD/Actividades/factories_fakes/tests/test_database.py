@@ -0,0 +1,87 @@
+"""
+Casos de Prueba de la configuración del motor de base de datos
+"""
+import pytest
+import sys
+import os
+from flask import Flask
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+# Agrega el directorio raíz del proyecto al PYTHONPATH
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from models import SQLITE_PROFILES, TunedSQLAlchemy, configure_engine, memory_uri
+
+def make_db(engine_options=None, **kwargs):
+    """Crea una aplicación y un SQLAlchemy propios para no tocar los de los modelos"""
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    configure_engine(app, **kwargs)
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"].update(engine_options or {})
+    return app, TunedSQLAlchemy(app)
+
+def pragma(engine, name):
+    with engine.connect() as conn:
+        return conn.exec_driver_sql(f"PRAGMA {name}").scalar()
+
+class TestConfigureEngine:
+    """Pruebas para configure_engine y los perfiles de SQLite"""
+
+    def test_perfil_wal(self, tmp_path):
+        """Prueba que el perfil wal se aplica a cada conexión"""
+        _, db = make_db(uri=f"sqlite:///{tmp_path / 'wal.db'}", profile="wal")
+        assert pragma(db.engine, "journal_mode") == "wal"
+        assert pragma(db.engine, "synchronous") == 1  # NORMAL
+        assert pragma(db.engine, "cache_size") == SQLITE_PROFILES["wal"]["cache_size"]
+        db.engine.dispose()
+
+    def test_perfil_por_defecto(self, tmp_path):
+        """Prueba que el perfil default deja el journal de rollback"""
+        _, db = make_db(uri=f"sqlite:///{tmp_path / 'default.db'}", profile="default")
+        assert pragma(db.engine, "journal_mode") == "delete"
+        db.engine.dispose()
+
+    def test_pool(self, tmp_path):
+        """Prueba que el pool entrega pool_size + max_overflow conexiones y ninguna más"""
+        _, db = make_db(uri=f"sqlite:///{tmp_path / 'pool.db'}", pool_size=3, max_overflow=2,
+                        engine_options={"pool_timeout": 0.05})
+        assert db.engine.pool.size() == 3
+        conexiones = [db.engine.connect() for _ in range(5)]
+        with pytest.raises(PoolTimeoutError):
+            db.engine.connect()
+        for conexion in conexiones:
+            conexion.close()
+        db.engine.dispose()
+
+    def test_perfil_por_defecto_para_archivos(self, tmp_path):
+        """Prueba que un archivo no pasa a WAL si no se pide el perfil"""
+        app, db = make_db(uri=f"sqlite:///{tmp_path / 'archivo.db'}")
+        assert app.config["SQLITE_PROFILE"] == "default"
+        assert pragma(db.engine, "journal_mode") == "delete"
+        db.engine.dispose()
+        assert not (tmp_path / "archivo.db-wal").exists()
+
+    def test_memoria_compartida(self):
+        """Prueba que las conexiones de una base en memoria ven los mismos datos"""
+        app, db = make_db(uri=memory_uri("test_memoria_compartida"), pool_size=2)
+        assert app.config["SQLITE_PROFILE"] == "memory"
+        with db.engine.connect() as reader:
+            with db.engine.begin() as writer:
+                writer.exec_driver_sql("CREATE TABLE t (x INTEGER)")
+                writer.exec_driver_sql("INSERT INTO t VALUES (1)")
+            assert reader.exec_driver_sql("SELECT x FROM t").scalar() == 1
+        db.engine.dispose()
+
+    def test_reconfigurar_descarta_el_motor(self, tmp_path):
+        """Prueba que configure_engine crea un motor nuevo con la configuración nueva"""
+        app, db = make_db(uri=f"sqlite:///{tmp_path / 'a.db'}", profile="default")
+        anterior = db.engine
+        configure_engine(app, uri=f"sqlite:///{tmp_path / 'a.db'}", profile="wal")
+        assert db.engine is not anterior
+        assert pragma(db.engine, "journal_mode") == "wal"
+        db.engine.dispose()
+
+    def test_perfil_desconocido(self):
+        """Prueba que un perfil desconocido es un error"""
+        with pytest.raises(ValueError):
+            make_db(uri=memory_uri(), profile="turbo")
@@ -0,0 +1,52 @@
+"""
+Casos de Prueba de la generación de Cuentas falsas en lote
+"""
+import sys
+import os
+from datetime import date
+
+# Agrega el directorio raíz del proyecto al PYTHONPATH
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from factories import AccountFactory, JOINED_FROM, ROW_COLUMNS
+
+HASTA = date(2024, 12, 31)
+
+class TestGenerateRows:
+    """Pruebas para AccountFactory.generate_rows y generate_rows_parallel"""
+
+    def test_misma_semilla_mismas_filas(self):
+        """Prueba que la generación es determinista para una semilla"""
+        primera = list(AccountFactory.generate_rows(200, seed=7, joined_until=HASTA))
+        segunda = list(AccountFactory.generate_rows(200, seed=7, joined_until=HASTA))
+        otra = list(AccountFactory.generate_rows(200, seed=8, joined_until=HASTA))
+        assert primera == segunda
+        assert primera != otra
+
+    def test_emails_unicos(self):
+        """Prueba que los emails no se repiten aunque los nombres sí"""
+        filas = list(AccountFactory.generate_rows(5000, seed=1, pool_size=50))
+        emails = [fila[ROW_COLUMNS.index("email")] for fila in filas]
+        assert len(set(emails)) == len(emails)
+        assert len({fila[0] for fila in filas}) <= 50
+
+    def test_valores(self):
+        """Prueba los tipos y rangos de cada columna"""
+        for fila in AccountFactory.generate_rows(500, seed=3, as_dict=True, joined_until=HASTA):
+            assert set(fila) == set(ROW_COLUMNS)
+            assert "@" in fila["email"]
+            assert isinstance(fila["disabled"], bool)
+            assert JOINED_FROM <= fila["date_joined"] <= HASTA
+
+    def test_paralelo_igual_a_secuencial(self):
+        """Prueba que el resultado en paralelo no depende de la cantidad de procesos"""
+        secuencial = [fila
+                      for inicio, semilla in ((0, 5), (300, 6), (600, 7), (900, 8))
+                      for fila in AccountFactory.generate_rows(min(300, 1000 - inicio), semilla,
+                                                               inicio, joined_until=HASTA)]
+        paralelo = list(AccountFactory.generate_rows_parallel(
+            1000, seed=5, workers=2, chunk_size=300, joined_until=HASTA))
+        un_proceso = list(AccountFactory.generate_rows_parallel(
+            1000, seed=5, workers=1, chunk_size=300, joined_until=HASTA))
+        assert paralelo == secuencial
+        assert un_proceso == secuencial
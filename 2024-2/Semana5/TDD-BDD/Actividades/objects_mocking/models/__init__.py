@@ -1 +1,2 @@
-from .imdb import IMDb
\ No newline at end of file
+from .imdb import IMDb
+from .cache import MemoryCache, SQLiteCache
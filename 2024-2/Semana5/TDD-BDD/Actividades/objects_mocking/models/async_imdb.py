@@ -0,0 +1,178 @@
+"""
+Cliente asíncrono de Internet Movie Database para enriquecer catálogos
+
+Implementa las mismas APIs que IMDb (SearchTitle, Reviews y Ratings) con
+httpx.AsyncClient. Todas las peticiones pasan por un token bucket que
+respeta la cuota de la API y por un semáforo que limita cuántas están en
+vuelo a la vez.
+"""
+import asyncio
+import logging
+import random
+import time
+from typing import AsyncIterator, Iterable, Optional
+import httpx
+from models.imdb import BASE_URL, RETRY_STATUSES
+
+logger = logging.getLogger()
+
+
+class TokenBucket:
+    """Limitador de tasa: rate fichas por segundo con ráfagas de hasta capacity"""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None, clock=time.monotonic,
+                 sleep=asyncio.sleep):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1)
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Espera hasta que haya una ficha y la consume"""
+        # El candado hace que las corrutinas obtengan las fichas en orden de llegada
+        async with self._lock:
+            while True:
+                now = self._clock()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await self._sleep((1 - self._tokens) / self.rate)
+
+
+class AsyncIMDb:
+    """Versión asíncrona de IMDb con límite de tasa y de concurrencia"""
+
+    def __init__(self, apikey: str, base_url: str = BASE_URL, rate: float = 5,
+                 burst: Optional[float] = None, max_concurrency: int = 10, timeout: float = 10,
+                 retries: int = 3, backoff_factor: float = 0.5):
+        """
+        :param apikey: la clave de la API de IMDb
+        :param base_url: la URL base de la API, por ejemplo la de un servidor de prueba
+        :param rate: peticiones por segundo permitidas por la cuota de la API
+        :param burst: peticiones que se pueden hacer seguidas; por defecto rate
+        :param max_concurrency: peticiones en vuelo como máximo
+        :param timeout: segundos de espera de cada petición
+        :param retries: reintentos ante errores de conexión, 429 y 5xx
+        :param backoff_factor: el backoff antes del reintento n es como máximo
+            backoff_factor * 2 ** (n - 1) segundos; si la respuesta trae
+            Retry-After se respeta
+        """
+        self.apikey = apikey
+        self.base_url = base_url.rstrip("/")
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.max_concurrency = max_concurrency
+        self.limiter = TokenBucket(rate, burst)
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._client = httpx.AsyncClient(
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=max_concurrency,
+                                max_keepalive_connections=max_concurrency),
+        )
+
+    async def close(self) -> None:
+        """Cierra las conexiones del cliente"""
+        await self._client.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def search_titles(self, title) -> dict:
+        """Busca una película por título"""
+        logger.info("Buscando en IMDb el título: %s", title)
+        return await self._get("SearchTitle", title)
+
+    async def movie_reviews(self, imdb_id: str) -> dict:
+        """Obtiene reseñas para una película"""
+        logger.info("Buscando en IMDb las reseñas: %s", imdb_id)
+        return await self._get("Reviews", imdb_id)
+
+    async def movie_ratings(self, imdb_id: str) -> dict:
+        """Obtiene calificaciones para una película"""
+        logger.info("Buscando en IMDb las calificaciones: %s", imdb_id)
+        return await self._get("Ratings", imdb_id)
+
+    async def enrich(self, titles: Iterable[str]) -> AsyncIterator[dict]:
+        """Busca cada título con sus reseñas y calificaciones, a medida que terminan
+
+        Devuelve diccionarios con el título buscado y las respuestas con las
+        mismas claves que tests/fixtures/imdb_responses.json: search_title,
+        movie_reviews y movie_ratings. Las reseñas y calificaciones son del
+        primer resultado de la búsqueda, o {} si no hubo resultados. Si un
+        título falla, su diccionario trae solo "title" y "error" y los demás
+        siguen. Los títulos se leen de a poco, así que titles puede ser un
+        iterador largo.
+        """
+        titles = iter(titles)
+        pending = set()
+        try:
+            while True:
+                # Se mantienen unos pocos títulos en curso por cada petición permitida en vuelo
+                for title in titles:
+                    pending.add(asyncio.ensure_future(self._enrich_one(title)))
+                    if len(pending) >= 2 * self.max_concurrency:
+                        break
+                if not pending:
+                    return
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+            # Se espera a que terminen de cancelarse para no dejar tareas sueltas en el loop
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    async def _enrich_one(self, title: str) -> dict:
+        try:
+            search = await self.search_titles(title)
+            results = search.get("results") or []
+            reviews, ratings = {}, {}
+            if results:
+                imdb_id = results[0]["id"]
+                reviews, ratings = await asyncio.gather(self.movie_reviews(imdb_id),
+                                                        self.movie_ratings(imdb_id))
+        except Exception as error:
+            logger.warning("No se pudo enriquecer el título %s: %r", title, error)
+            return {"title": title, "error": repr(error)}
+        return {"title": title, "search_title": search,
+                "movie_reviews": reviews, "movie_ratings": ratings}
+
+    async def _get(self, endpoint: str, argument: str) -> dict:
+        url = f"{self.base_url}/{endpoint}/{self.apikey}/{argument}"
+        for attempt in range(self.retries + 1):
+            last_attempt = attempt == self.retries
+            try:
+                async with self._semaphore:
+                    # La ficha se toma con el lugar ya asegurado; si no, las peticiones
+                    # que esperan el semáforo juntan fichas y salen todas a la vez
+                    await self.limiter.acquire()
+                    resultados = await self._client.get(url)
+            except httpx.TransportError:
+                if last_attempt:
+                    raise
+                await asyncio.sleep(self._backoff(attempt, None))
+                continue
+            if resultados.status_code in RETRY_STATUSES and not last_attempt:
+                await asyncio.sleep(self._backoff(attempt, resultados.headers.get("Retry-After")))
+                continue
+            if resultados.status_code == 200:
+                return resultados.json()
+            return {}
+
+    def _backoff(self, attempt: int, retry_after: Optional[str]) -> float:
+        """Segundos antes del siguiente intento: Retry-After o backoff con jitter completo"""
+        if retry_after is not None:
+            try:
+                return max(0.0, float(retry_after))
+            except ValueError:
+                pass
+        return random.uniform(0, self.backoff_factor * 2 ** attempt)
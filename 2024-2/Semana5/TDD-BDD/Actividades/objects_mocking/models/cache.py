@@ -0,0 +1,119 @@
+"""
+Cachés de respuestas para el cliente de IMDb
+
+Las cachés guardan entradas CacheEntry y no deciden cuándo expiran: el
+cliente compara expires con la hora actual y, si la entrada venció pero
+tiene ETag, la revalida con una petición condicional.
+"""
+import json
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import NamedTuple, Optional
+
+
+class CacheEntry(NamedTuple):
+    """Respuesta guardada: el valor, su ETag (o None) y el instante en que vence"""
+    value: dict
+    etag: Optional[str]
+    expires: float
+
+
+class ResponseCache(ABC):
+    """Interfaz de las cachés de respuestas"""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """Devuelve la entrada de la clave, aunque esté vencida, o None"""
+
+    @abstractmethod
+    def set(self, key: str, entry: CacheEntry) -> None:
+        """Guarda la entrada de la clave"""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Elimina todas las entradas"""
+
+
+class MemoryCache(ResponseCache):
+    """Caché LRU en memoria de hasta maxsize entradas
+
+    Devuelve los mismos diccionarios que guarda, así que no deben modificarse.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class SQLiteCache(ResponseCache):
+    """Caché en un archivo SQLite, compartida entre procesos y reinicios"""
+
+    def __init__(self, path: str = "imdb_cache.db"):
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY, value TEXT NOT NULL, etag TEXT, expires REAL NOT NULL)"
+        )
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, etag, expires FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        return CacheEntry(json.loads(row[0]), row[1], row[2])
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO responses (key, value, etag, expires) VALUES (?, ?, ?, ?)"
+                " ON CONFLICT(key) DO UPDATE SET"
+                " value = excluded.value, etag = excluded.etag, expires = excluded.expires",
+                (key, json.dumps(entry.value), entry.etag, entry.expires),
+            )
+
+    def purge(self, now: float) -> int:
+        """Elimina las entradas vencidas sin ETag y devuelve cuántas eliminó"""
+        with self._lock:
+            return self._conn.execute(
+                "DELETE FROM responses WHERE expires <= ? AND etag IS NULL", (now,)
+            ).rowcount
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
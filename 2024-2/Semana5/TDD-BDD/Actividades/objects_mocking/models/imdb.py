@@ -2,38 +2,217 @@
 Acceso a la base de datos de películas de Internet Movie Database
 
 Implementa las APIs SearchTitle, Reviews y Ratings
+
+El cliente usa una requests.Session propia, así que las conexiones TCP/TLS
+se reutilizan entre llamadas. Cada petición tiene timeout y se reintenta con
+backoff exponencial con jitter ante 429 y errores 5xx.
+
+Con una caché (MemoryCache o SQLiteCache) las respuestas se guardan con un
+TTL por endpoint; las respuestas 200 vacías o con "Invalid API Key" se
+guardan con un TTL corto. Las claves de la caché llevan un hash de la apikey,
+nunca la apikey. Una entrada vencida con ETag se revalida con una petición
+condicional; si la API falla se devuelve la entrada vencida. Las llamadas
+concurrentes idénticas comparten una sola petición.
+
+iter_movie_reviews lee las reseñas a medida que llega la respuesta, sin
+cargar la lista completa en memoria.
 """
+import hashlib
 import logging
+import random
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Iterable, Iterator, Optional
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from models.cache import CacheEntry, ResponseCache
+from models.json_stream import iter_array_items
 
 logger = logging.getLogger()
 
+BASE_URL = "https://imdb-api.com/API"
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+# Segundos que se guarda en caché una respuesta válida de cada endpoint
+DEFAULT_TTLS = {"SearchTitle": 3600, "Reviews": 900, "Ratings": 3600}
+
+
+class JitteredRetry(Retry):
+    """Retry de urllib3 con jitter completo: espera un tiempo al azar entre 0 y el backoff"""
+
+    def get_backoff_time(self) -> float:
+        return random.uniform(0, super().get_backoff_time())
+
+
 class IMDb:
     """Acceso a la base de datos de películas de Internet Movie Database"""
 
-    def __init__(self, apikey: str):
+    def __init__(self, apikey: str, base_url: str = BASE_URL, timeout=(3.05, 10),
+                 retries: int = 3, backoff_factor: float = 0.5, pool_maxsize: int = 10,
+                 cache: Optional[ResponseCache] = None, ttls: Optional[dict] = None,
+                 negative_ttl: float = 60, clock=time.time):
+        """
+        :param apikey: la clave de la API de IMDb
+        :param base_url: la URL base de la API, por ejemplo la de un servidor de prueba
+        :param timeout: segundos para conectar y para leer, como en requests
+        :param retries: reintentos ante errores de conexión, 429 y 5xx
+        :param backoff_factor: el backoff antes del reintento n es como máximo
+            backoff_factor * 2 ** (n - 1) segundos; si la respuesta trae
+            Retry-After se respeta
+        :param pool_maxsize: conexiones que se mantienen abiertas por host
+        :param cache: dónde guardar las respuestas; None no guarda nada
+        :param ttls: segundos de vida por endpoint, que se combinan con DEFAULT_TTLS
+        :param negative_ttl: segundos de vida de las respuestas 200 vacías o con errorMessage
+        """
         self.apikey = apikey
+        # Identifica la apikey en las claves de la caché sin guardarla
+        self._apikey_hash = hashlib.sha256(apikey.encode()).hexdigest()[:16]
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.session = requests.Session()
+        retry = JitteredRetry(
+            total=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=frozenset({"GET"}),
+            # Tras el último reintento se devuelve la respuesta de error en lugar de lanzar
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize, max_retries=retry)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.cache = cache
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.negative_ttl = negative_ttl
+        self._clock = clock
+        self._pool_maxsize = pool_maxsize
+        self._executor = None
+        self._lock = threading.Lock()
+        self._in_flight = {}
+
+    def close(self) -> None:
+        """Cierra las conexiones y los hilos del cliente"""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
 
     def search_titles(self, title) -> dict:
         """Busca una película por título"""
         logger.info("Buscando en IMDb el título: %s", title)
-        resultados = requests.get(f"https://imdb-api.com/API/SearchTitle/{self.apikey}/{title}")
-        if resultados.status_code == 200: 
-            return resultados.json()
-        return {}
+        return self._get("SearchTitle", title)
 
     def movie_reviews(self, imdb_id: str) -> dict:
         """Obtiene reseñas para una película"""
         logger.info("Buscando en IMDb las reseñas: %s", imdb_id)
-        resultados = requests.get(f"https://imdb-api.com/API/Reviews/{self.apikey}/{imdb_id}")
-        if resultados.status_code == 200: 
-            return resultados.json()
-        return {}
+        return self._get("Reviews", imdb_id)
 
     def movie_ratings(self, imdb_id: str) -> dict:
         """Obtiene calificaciones para una película"""
         logger.info("Buscando en IMDb las calificaciones: %s", imdb_id)
-        resultados = requests.get(f"https://imdb-api.com/API/Ratings/{self.apikey}/{imdb_id}")
-        if resultados.status_code == 200: 
-            return resultados.json()
-        return {}
+        return self._get("Ratings", imdb_id)
+
+    def iter_movie_reviews(self, imdb_id: str, fields: Optional[Iterable[str]] = None,
+                           limit: Optional[int] = None,
+                           chunk_size: int = 64 * 1024) -> Iterator[dict]:
+        """Devuelve las reseñas de una película de a una, mientras se descargan
+
+        No usa la caché. Si se deja de iterar, o al llegar a limit, se cierra
+        la conexión sin leer el resto de la respuesta.
+
+        :param fields: claves de cada reseña a conservar; None las conserva todas
+        :param limit: cantidad máxima de reseñas a devolver
+        :param chunk_size: bytes que se leen de la respuesta por vez
+        """
+        logger.info("Leyendo en IMDb las reseñas: %s", imdb_id)
+        if limit is not None and limit <= 0:
+            return
+        fields = tuple(fields) if fields is not None else None
+        url = f"{self.base_url}/Reviews/{self.apikey}/{imdb_id}"
+        resultados = self.session.get(url, timeout=self.timeout, stream=True)
+        try:
+            if resultados.status_code != 200:
+                return
+            items = iter_array_items(resultados.iter_content(chunk_size), "items")
+            for count, item in enumerate(items, 1):
+                if fields is not None:
+                    item = {field: item.get(field) for field in fields}
+                yield item
+                if count == limit:
+                    return
+        finally:
+            resultados.close()
+
+    def fetch_movie_bundle(self, imdb_id: str) -> dict:
+        """Obtiene a la vez las reseñas y las calificaciones de una película
+
+        :return: un diccionario con las claves "reviews" y "ratings"
+        """
+        logger.info("Buscando en IMDb reseñas y calificaciones: %s", imdb_id)
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self._pool_maxsize)
+            executor = self._executor
+        reviews = executor.submit(self.movie_reviews, imdb_id)
+        ratings = executor.submit(self.movie_ratings, imdb_id)
+        return {"reviews": reviews.result(), "ratings": ratings.result()}
+
+    def _get(self, endpoint: str, argument: str) -> dict:
+        key = f"{self.base_url}/{endpoint}/{self._apikey_hash}/{argument}"
+        entry = self.cache.get(key) if self.cache is not None else None
+        if entry is not None and entry.expires > self._clock():
+            return entry.value
+        # Solo la primera llamada para una clave hace la petición; las demás esperan su resultado
+        with self._lock:
+            future = self._in_flight.get(key)
+            leader = future is None
+            if leader:
+                future = self._in_flight[key] = Future()
+        if not leader:
+            return future.result()
+        try:
+            url = f"{self.base_url}/{endpoint}/{self.apikey}/{argument}"
+            value = self._fetch(endpoint, url, key, entry)
+        except BaseException as error:
+            future.set_exception(error)
+            raise
+        else:
+            future.set_result(value)
+            return value
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+
+    def _fetch(self, endpoint: str, url: str, key: str, entry: Optional[CacheEntry]) -> dict:
+        try:
+            if entry is not None and entry.etag:
+                resultados = self.session.get(url, timeout=self.timeout,
+                                              headers={"If-None-Match": entry.etag})
+            else:
+                resultados = self.session.get(url, timeout=self.timeout)
+        except requests.RequestException:
+            if entry is None:
+                raise
+            logger.warning("IMDb no respondió; se usa la respuesta vencida de %s", endpoint)
+            return entry.value
+        if resultados.status_code == 304 and entry is not None:
+            value, etag = entry.value, entry.etag
+        elif resultados.status_code == 200:
+            value = resultados.json()
+            etag = resultados.headers.get("ETag") if self.cache is not None else None
+        else:
+            # Un error de la API no reemplaza la entrada vencida ni se guarda
+            return entry.value if entry is not None else {}
+        if self.cache is not None:
+            negative = not value or value.get("errorMessage")
+            ttl = self.negative_ttl if negative else self.ttls[endpoint]
+            self.cache.set(key, CacheEntry(value, etag, self._clock() + ttl))
+        return value
@@ -0,0 +1,116 @@
+"""
+Lectura incremental de un arreglo dentro de un documento JSON
+
+iter_array_items recorre los fragmentos de la respuesta y devuelve uno a
+uno los elementos del arreglo que está bajo una clave del objeto raíz, por
+ejemplo "items" en la respuesta de Reviews. Solo se guarda en memoria el
+fragmento actual y el elemento que se está decodificando.
+"""
+import codecs
+import json
+import re
+from typing import Iterable, Iterator, Union
+
+_WHITESPACE = re.compile(r"\s*")
+
+
+def iter_array_items(chunks: Iterable[Union[bytes, str]], key: str) -> Iterator:
+    """Devuelve los elementos del arreglo data[key] de un objeto JSON, de a uno
+
+    Si la clave no existe o su valor no es un arreglo (por ejemplo null en
+    una respuesta de error) no devuelve nada. Al dejar de iterar no se leen
+    más fragmentos.
+
+    :param chunks: fragmentos del documento, en bytes UTF-8 o en texto
+    :param key: la clave del objeto raíz que contiene el arreglo
+    """
+    texts = _decode(chunks)
+    buffer = _find_array(texts, key)
+    if buffer is None:
+        return
+    decoder = json.JSONDecoder()
+    pos = 0
+    exhausted = False
+    while True:
+        pos = _WHITESPACE.match(buffer, pos).end()
+        if pos < len(buffer) and buffer[pos] == "]":
+            return
+        if pos < len(buffer) and buffer[pos] == ",":
+            pos = _WHITESPACE.match(buffer, pos + 1).end()
+        try:
+            item, end = decoder.raw_decode(buffer, pos)
+            # El elemento está completo si lo sigue "," o "]": un número al
+            # final del fragmento, como 12 de 123, puede seguir en el próximo
+            following = _WHITESPACE.match(buffer, end).end()
+            complete = exhausted or (following < len(buffer) and buffer[following] in ",]")
+        except json.JSONDecodeError:
+            if exhausted:
+                raise
+            complete = False
+        if complete:
+            yield item
+            pos = end
+            continue
+        # Faltan datos: se descarta lo ya leído y se agrega el siguiente fragmento
+        text = next(texts, None)
+        if text is None:
+            exhausted = True
+        else:
+            buffer = buffer[pos:] + text
+            pos = 0
+
+
+def _decode(chunks: Iterable[Union[bytes, str]]) -> Iterator[str]:
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    for chunk in chunks:
+        text = decoder.decode(chunk) if isinstance(chunk, bytes) else chunk
+        if text:
+            yield text
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+
+def _find_array(texts: Iterator[str], key: str):
+    """Avanza hasta el "[" del arreglo de la clave y devuelve el texto que le sigue
+
+    Recorre el objeto raíz carácter a carácter, saltando cadenas y valores
+    anidados, para que una clave igual dentro de otro valor no confunda.
+    """
+    depth = 0
+    in_string = escape = False
+    string = []
+    last_string = None
+    awaiting_value = False
+    for text in texts:
+        for index, char in enumerate(text):
+            if in_string:
+                if escape:
+                    escape = False
+                elif char == "\\":
+                    escape = True
+                elif char == '"':
+                    in_string = False
+                    if depth == 1:
+                        last_string = json.loads('"' + "".join(string) + '"')
+                        continue
+                if depth == 1:
+                    string.append(char)
+                continue
+            if char.isspace():
+                continue
+            if awaiting_value:
+                # La clave existe: si su valor no es un arreglo no hay elementos
+                return text[index + 1:] if char == "[" else None
+            if char == '"':
+                in_string = True
+                string = []
+            elif char in "{[":
+                depth += 1
+            elif char in "}]":
+                depth -= 1
+                if depth == 0:
+                    return None
+            elif char == ":" and depth == 1 and last_string == key:
+                awaiting_value = True
+    return None
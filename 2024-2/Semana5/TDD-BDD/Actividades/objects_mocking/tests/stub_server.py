@@ -0,0 +1,124 @@
+"""
+Servidor HTTP local que imita la API de IMDb para las pruebas
+
+Responde /API/<Endpoint>/<apikey>/<argumento> con las respuestas de
+fixtures/imdb_responses.json, con ETag y 304 ante If-None-Match. Permite
+forzar errores, agregar demora y registra cada petición junto con la
+conexión por la que llegó, el instante de llegada, el código de la
+respuesta y cuántas peticiones llegó a atender a la vez. Con review_count las reseñas repiten la del
+fixture hasta esa cantidad, para simular películas con muchas reseñas.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures", "imdb_responses.json")
+ENDPOINTS = {"SearchTitle": "search_title", "Reviews": "movie_reviews", "Ratings": "movie_ratings"}
+
+
+class StubIMDbServer:
+    """Servidor de prueba en 127.0.0.1 en un puerto libre"""
+
+    def __init__(self):
+        with open(FIXTURES) as json_data:
+            self.data = json.load(json_data)
+        self.delay = 0.0
+        self.review_count = None
+        self.requests = []
+        self.arrivals = []
+        self.statuses = []
+        self.active = 0
+        self.max_active = 0
+        self._failures = defaultdict(deque)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever,
+                                        kwargs={"poll_interval": 0.05}, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}/API"
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def fail(self, endpoint: str, *statuses: int, retry_after: str = None) -> None:
+        """Las próximas peticiones al endpoint responden estos códigos, en orden"""
+        with self._lock:
+            self._failures[endpoint].extend((status, retry_after) for status in statuses)
+
+    def connections(self) -> int:
+        """Cantidad de conexiones TCP distintas que usaron los clientes"""
+        return len({connection for connection, _ in self.requests})
+
+    def paths(self) -> list:
+        return [path for _, path in self.requests]
+
+    def _respond(self, path: str):
+        parts = path.strip("/").split("/")
+        if len(parts) != 4 or parts[0] != "API" or parts[1] not in ENDPOINTS:
+            return 404, {"errorMessage": "Not Found"}, None
+        _, endpoint, apikey, _ = parts
+        with self._lock:
+            failures = self._failures[endpoint]
+            if failures:
+                status, retry_after = failures.popleft()
+                return status, {"errorMessage": "error forzado"}, retry_after
+        if apikey == "bad-key":
+            return 200, self.data["INVALID_API"], None
+        if endpoint == "Reviews" and self.review_count is not None:
+            reviews = self.data["movie_reviews"]
+            items = [dict(reviews["items"][0], username=f"user{i}") for i in range(self.review_count)]
+            return 200, {**reviews, "items": items}, None
+        return 200, self.data[ENDPOINTS[endpoint]], None
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                with stub._lock:
+                    stub.requests.append((self.client_address, self.path))
+                    stub.arrivals.append(time.monotonic())
+                    stub.active += 1
+                    stub.max_active = max(stub.max_active, stub.active)
+                try:
+                    if stub.delay:
+                        time.sleep(stub.delay)
+                    status, payload, retry_after = stub._respond(self.path)
+                finally:
+                    with stub._lock:
+                        stub.active -= 1
+                body = json.dumps(payload).encode()
+                etag = f'"{hashlib.sha1(body).hexdigest()[:16]}"' if status == 200 else None
+                if etag is not None and self.headers.get("If-None-Match") == etag:
+                    status, body = 304, b""
+                with stub._lock:
+                    stub.statuses.append(status)
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                if etag is not None:
+                    self.send_header("ETag", etag)
+                if retry_after is not None:
+                    self.send_header("Retry-After", retry_after)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
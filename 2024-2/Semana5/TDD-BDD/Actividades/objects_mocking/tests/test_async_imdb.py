@@ -0,0 +1,197 @@
+"""
+Casos de prueba para el cliente asíncrono de IMDb
+"""
+import asyncio
+import os
+import sys
+import threading
+import httpx
+import pytest
+
+# Agregar el directorio raíz al sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from models.async_imdb import AsyncIMDb, TokenBucket
+from stub_server import StubIMDbServer
+
+@pytest.fixture
+def stub_server():
+    """Servidor HTTP local que imita la API de IMDb"""
+    server = StubIMDbServer().start()
+    yield server
+    server.stop()
+
+def run(client_kwargs, scenario):
+    """Ejecuta scenario(imdb) con un AsyncIMDb nuevo dentro de asyncio.run"""
+    async def main():
+        async with AsyncIMDb(**client_kwargs) as imdb:
+            return await scenario(imdb)
+
+    return asyncio.run(main())
+
+async def collect(iterator):
+    return [item async for item in iterator]
+
+class FakeTime:
+    """Reloj y sleep falsos: sleep avanza el reloj sin esperar
+
+    Las pruebas usan tasas potencia de 2 para que las esperas sumen exacto en float
+    """
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    async def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+        await asyncio.sleep(0)
+
+class TestTokenBucket:
+    """Casos de prueba para TokenBucket"""
+
+    def test_respeta_la_tasa(self):
+        """Prueba que tras la ráfaga las fichas salen a la tasa configurada"""
+        fake = FakeTime()
+
+        async def main():
+            bucket = TokenBucket(rate=16, capacity=2, clock=fake, sleep=fake.sleep)
+            for _ in range(6):
+                await bucket.acquire()
+
+        asyncio.run(main())
+        # 2 fichas de ráfaga y 4 más a 16 por segundo
+        assert fake.sleeps == [1 / 16] * 4
+        assert fake.now - 1000.0 == 4 / 16
+
+class TestAsyncIMDb:
+    """Casos de prueba para AsyncIMDb contra un servidor HTTP local"""
+
+    def test_mismas_respuestas_que_los_fixtures(self, stub_server):
+        """Prueba que cada método devuelve la forma de imdb_responses.json"""
+        async def scenario(imdb):
+            return await asyncio.gather(imdb.search_titles("Bambi"),
+                                        imdb.movie_reviews("tt1375666"),
+                                        imdb.movie_ratings("tt1375666"))
+
+        search, reviews, ratings = run({"apikey": "fake_api_key", "base_url": stub_server.base_url},
+                                       scenario)
+        assert search == stub_server.data["search_title"]
+        assert reviews == stub_server.data["movie_reviews"]
+        assert ratings == stub_server.data["movie_ratings"]
+
+    def test_api_key_invalida(self, stub_server):
+        """Prueba que la respuesta de API Key inválida se devuelve tal cual"""
+        resultado = run({"apikey": "bad-key", "base_url": stub_server.base_url},
+                        lambda imdb: imdb.search_titles("Bambi"))
+        assert resultado["errorMessage"] == "Invalid API Key"
+
+    def test_reintenta_y_agota(self, stub_server):
+        """Prueba los reintentos ante 429/5xx y el {} al agotarlos"""
+        stub_server.fail("Ratings", 429, 503, retry_after="0")
+        ratings = run({"apikey": "fake_api_key", "base_url": stub_server.base_url,
+                       "retries": 2, "backoff_factor": 0.01},
+                      lambda imdb: imdb.movie_ratings("tt1375666"))
+        assert ratings == stub_server.data["movie_ratings"]
+        stub_server.fail("Reviews", 500, 500, 500)
+        reviews = run({"apikey": "fake_api_key", "base_url": stub_server.base_url,
+                       "retries": 2, "backoff_factor": 0.01},
+                      lambda imdb: imdb.movie_reviews("tt1375666"))
+        assert reviews == {}
+
+    def test_enrich(self, stub_server):
+        """Prueba que enrich devuelve búsqueda, reseñas y calificaciones de cada título"""
+        titulos = [f"Bambi{i}" for i in range(25)]
+        resultados = run({"apikey": "fake_api_key", "base_url": stub_server.base_url,
+                          "rate": 1000, "max_concurrency": 4},
+                         lambda imdb: collect(imdb.enrich(titulos)))
+        assert sorted(r["title"] for r in resultados) == sorted(titulos)
+        for resultado in resultados:
+            assert resultado["search_title"] == stub_server.data["search_title"]
+            assert resultado["movie_reviews"] == stub_server.data["movie_reviews"]
+            assert resultado["movie_ratings"] == stub_server.data["movie_ratings"]
+        assert len(stub_server.requests) == 75
+
+    def test_enrich_sin_resultados(self, stub_server):
+        """Prueba que un título sin resultados no pide reseñas ni calificaciones"""
+        resultados = run({"apikey": "bad-key", "base_url": stub_server.base_url},
+                         lambda imdb: collect(imdb.enrich(["Bambi"])))
+        assert resultados == [{"title": "Bambi", "search_title": stub_server.data["INVALID_API"],
+                               "movie_reviews": {}, "movie_ratings": {}}]
+
+    def test_concurrencia_acotada(self, stub_server):
+        """Prueba que nunca hay más de max_concurrency peticiones en vuelo"""
+        stub_server.delay = 0.05
+        run({"apikey": "fake_api_key", "base_url": stub_server.base_url,
+             "rate": 1000, "max_concurrency": 3},
+            lambda imdb: collect(imdb.enrich(f"Bambi{i}" for i in range(10))))
+        assert 1 < stub_server.max_active <= 3
+
+    def test_limite_de_tasa(self, stub_server):
+        """Prueba que enrich no supera la tasa de la cuota"""
+        fake = FakeTime()
+
+        async def scenario(imdb):
+            imdb.limiter = TokenBucket(rate=32, capacity=1, clock=fake, sleep=fake.sleep)
+            return await collect(imdb.enrich(f"Bambi{i}" for i in range(4)))
+
+        run({"apikey": "fake_api_key", "base_url": stub_server.base_url}, scenario)
+        # 12 peticiones a 32 por segundo, la primera sin esperar
+        assert len(stub_server.requests) == 12
+        assert fake.sleeps == [1 / 32] * 11
+
+    def test_limite_de_tasa_con_respuestas_lentas(self, stub_server):
+        """Prueba que las peticiones que esperan el semáforo no salen juntas al liberarse"""
+        rate, burst = 20, 4
+        # Las primeras respuestas tardan y el resto llega sin demora
+        stub_server.delay = 0.5
+        threading.Timer(0.1, setattr, (stub_server, "delay", 0)).start()
+
+        async def scenario(imdb):
+            return await asyncio.gather(*(imdb.movie_ratings(f"tt{i}") for i in range(16)))
+
+        run({"apikey": "fake_api_key", "base_url": stub_server.base_url,
+             "rate": rate, "burst": burst, "max_concurrency": 2}, scenario)
+        llegadas = sorted(stub_server.arrivals)
+        assert len(llegadas) == 16
+        # En cualquier intervalo salen como mucho burst + rate * duración (más una de margen)
+        for i in range(len(llegadas)):
+            for j in range(i + 1, len(llegadas)):
+                assert j - i + 1 <= burst + rate * (llegadas[j] - llegadas[i]) + 1, (i, j)
+
+    def test_enrich_sigue_tras_un_error(self, stub_server):
+        """Prueba que un título que falla se informa en su resultado sin cortar los demás"""
+        async def scenario(imdb):
+            search_titles = imdb.search_titles
+
+            async def fallar_con_roto(title):
+                if title == "Roto":
+                    raise httpx.ConnectError("sin red")
+                return await search_titles(title)
+
+            imdb.search_titles = fallar_con_roto
+            return await collect(imdb.enrich(["Bambi", "Roto", "Bambi2"]))
+
+        resultados = run({"apikey": "fake_api_key", "base_url": stub_server.base_url}, scenario)
+        por_titulo = {resultado["title"]: resultado for resultado in resultados}
+        assert sorted(por_titulo) == ["Bambi", "Bambi2", "Roto"]
+        assert por_titulo["Roto"] == {"title": "Roto", "error": "ConnectError('sin red')"}
+        assert por_titulo["Bambi2"]["movie_ratings"] == stub_server.data["movie_ratings"]
+
+    def test_cortar_enrich(self, stub_server):
+        """Prueba que se puede dejar de leer enrich sin pedir todo el catálogo"""
+        async def scenario(imdb):
+            enrich = imdb.enrich(f"Bambi{i}" for i in range(1000))
+            primero = await enrich.__anext__()
+            await enrich.aclose()
+            sueltas = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+            return primero, sueltas
+
+        primero, sueltas = run({"apikey": "fake_api_key", "base_url": stub_server.base_url,
+                                "rate": 1000, "max_concurrency": 2}, scenario)
+        assert primero["movie_ratings"] == stub_server.data["movie_ratings"]
+        # Las tareas canceladas ya terminaron al cerrar enrich
+        assert sueltas == []
+        assert len(stub_server.requests) < 30
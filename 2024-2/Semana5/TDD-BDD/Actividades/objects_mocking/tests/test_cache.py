@@ -0,0 +1,72 @@
+"""
+Casos de prueba para las cachés de respuestas de IMDb
+"""
+import os
+import sys
+import pytest
+
+# Agregar el directorio raíz al sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from models.cache import CacheEntry, MemoryCache, ResponseCache, SQLiteCache
+
+def test_cache_incompleta():
+    """Prueba que una caché sin todos los métodos falla al crearla"""
+    class SinClear(ResponseCache):
+        def get(self, key):
+            return None
+
+        def set(self, key, entry):
+            pass
+
+    with pytest.raises(TypeError):
+        SinClear()
+
+class TestMemoryCache:
+    """Casos de prueba para MemoryCache"""
+
+    def test_guardar_y_leer(self):
+        """Prueba que una entrada guardada se puede leer"""
+        cache = MemoryCache()
+        entry = CacheEntry({"title": "Bambi"}, '"abc"', 10.0)
+        cache.set("k", entry)
+        assert cache.get("k") == entry
+        assert cache.get("otra") is None
+
+    def test_descarta_la_menos_usada(self):
+        """Prueba que al superar maxsize se descarta la entrada menos usada"""
+        cache = MemoryCache(maxsize=2)
+        cache.set("a", CacheEntry({}, None, 1.0))
+        cache.set("b", CacheEntry({}, None, 1.0))
+        cache.get("a")
+        cache.set("c", CacheEntry({}, None, 1.0))
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert len(cache) == 2
+
+class TestSQLiteCache:
+    """Casos de prueba para SQLiteCache"""
+
+    def test_persiste_entre_instancias(self, tmp_path):
+        """Prueba que las entradas sobreviven a cerrar y abrir la caché"""
+        path = str(tmp_path / "cache.db")
+        cache = SQLiteCache(path)
+        cache.set("k", CacheEntry({"title": "Bambi", "year": "1942"}, '"abc"', 10.0))
+        cache.set("k", CacheEntry({"title": "Bambi"}, None, 20.0))
+        cache.close()
+        cache = SQLiteCache(path)
+        assert cache.get("k") == CacheEntry({"title": "Bambi"}, None, 20.0)
+        assert len(cache) == 1
+        cache.close()
+
+    def test_purge(self, tmp_path):
+        """Prueba que purge elimina solo las vencidas que no se pueden revalidar"""
+        cache = SQLiteCache(str(tmp_path / "cache.db"))
+        cache.set("vencida", CacheEntry({}, None, 5.0))
+        cache.set("con_etag", CacheEntry({}, '"abc"', 5.0))
+        cache.set("vigente", CacheEntry({}, None, 50.0))
+        assert cache.purge(now=10.0) == 1
+        assert cache.get("vencida") is None
+        assert len(cache) == 2
+        cache.clear()
+        assert len(cache) == 0
+        cache.close()
@@ -1,16 +1,22 @@
 """
 Casos de prueba para Mocking Lab
 """
+import io
 import os
 import json
+import sqlite3
+import threading
+import tracemalloc
 import pytest
+import requests
 import sys
 
 # Agregar el directorio raíz al sys.path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from unittest.mock import patch, Mock
 from requests import Response
-from models import IMDb
+from models import IMDb, MemoryCache, SQLiteCache
+from stub_server import StubIMDbServer
 
 # Fixture para cargar los datos de IMDb desde un archivo JSON
 @pytest.fixture(scope="session")
@@ -35,7 +41,7 @@ class TestIMDbDatabase:
     #  CASOS DE PRUEBA
     ######################################################################
 
-    @patch('models.imdb.requests.get')
+    @patch('models.imdb.requests.Session.get')
     def test_search_titles_success(self, mock_get):
         """Prueba que la búsqueda de títulos retorna datos correctamente"""
         # Configurar el mock para devolver una respuesta exitosa
@@ -48,9 +54,9 @@ class TestIMDbDatabase:
         resultado = imdb.search_titles("Bambi")
 
         assert resultado == self.imdb_data['search_title']
-        mock_get.assert_called_once_with("https://imdb-api.com/API/SearchTitle/fake_api_key/Bambi")
+        mock_get.assert_called_once_with("https://imdb-api.com/API/SearchTitle/fake_api_key/Bambi", timeout=imdb.timeout)
 
-    @patch('models.imdb.requests.get')
+    @patch('models.imdb.requests.Session.get')
     def test_search_titles_failure(self, mock_get):
         """Prueba que la búsqueda de títulos maneja errores correctamente"""
         # Configurar el mock para devolver una respuesta fallida con json retornando {}
@@ -63,9 +69,9 @@ class TestIMDbDatabase:
         resultado = imdb.search_titles("TituloInexistente")
 
         assert resultado == {}
-        mock_get.assert_called_once_with("https://imdb-api.com/API/SearchTitle/fake_api_key/TituloInexistente")
+        mock_get.assert_called_once_with("https://imdb-api.com/API/SearchTitle/fake_api_key/TituloInexistente", timeout=imdb.timeout)
 
-    @patch('models.imdb.requests.get')
+    @patch('models.imdb.requests.Session.get')
     def test_movie_reviews_success(self, mock_get):
         """Prueba que la obtención de reseñas retorna datos correctamente"""
         # Configurar el mock para devolver una respuesta exitosa
@@ -78,9 +84,9 @@ class TestIMDbDatabase:
         resultado = imdb.movie_reviews("tt1375666")
 
         assert resultado == self.imdb_data['movie_reviews']
-        mock_get.assert_called_once_with("https://imdb-api.com/API/Reviews/fake_api_key/tt1375666")
+        mock_get.assert_called_once_with("https://imdb-api.com/API/Reviews/fake_api_key/tt1375666", timeout=imdb.timeout)
 
-    @patch('models.imdb.requests.get')
+    @patch('models.imdb.requests.Session.get')
     def test_movie_ratings_success(self, mock_get):
         """Prueba que la obtención de calificaciones retorna datos correctamente"""
         # Configurar el mock para devolver una respuesta exitosa
@@ -93,9 +99,9 @@ class TestIMDbDatabase:
         resultado = imdb.movie_ratings("tt1375666")
 
         assert resultado == self.imdb_data['movie_ratings']
-        mock_get.assert_called_once_with("https://imdb-api.com/API/Ratings/fake_api_key/tt1375666")
+        mock_get.assert_called_once_with("https://imdb-api.com/API/Ratings/fake_api_key/tt1375666", timeout=imdb.timeout)
 
-    @patch('models.imdb.requests.get')
+    @patch('models.imdb.requests.Session.get')
     def test_search_by_title_failed(self, mock_get):
         """Prueba de búsqueda por título fallida"""
         # Configurar el mock para devolver una respuesta con API Key inválida
@@ -112,7 +118,7 @@ class TestIMDbDatabase:
         assert resultados is not None
         assert resultados["errorMessage"] == "Invalid API Key"
 
-    @patch('models.imdb.requests.get')
+    @patch('models.imdb.requests.Session.get')
     def test_movie_ratings_good(self, mock_get):
         """Prueba de calificaciones de películas con buenas calificaciones"""
         # Configurar el mock para devolver una respuesta exitosa con buenas calificaciones
@@ -130,3 +136,230 @@ class TestIMDbDatabase:
         assert resultados["title"] == "Bambi"
         assert resultados["filmAffinity"] == 3
         assert resultados["rottenTomatoes"] == 5
+
+
+@pytest.fixture
+def stub_server():
+    """Servidor HTTP local que imita la API de IMDb"""
+    server = StubIMDbServer().start()
+    yield server
+    server.stop()
+
+class TestIMDbHTTP:
+    """Casos de prueba del cliente contra un servidor HTTP local"""
+
+    def test_reutiliza_conexiones(self, stub_server, imdb_data):
+        """Prueba que varias llamadas comparten la conexión de la sesión"""
+        with IMDb("fake_api_key", base_url=stub_server.base_url) as imdb:
+            for _ in range(5):
+                assert imdb.search_titles("Bambi") == imdb_data["search_title"]
+        assert len(stub_server.requests) == 5
+        assert stub_server.connections() == 1
+
+    def test_reintenta_errores_del_servidor(self, stub_server, imdb_data):
+        """Prueba que 503 y 429 se reintentan hasta obtener la respuesta"""
+        stub_server.fail("Ratings", 503, 429, retry_after="0")
+        with IMDb("fake_api_key", base_url=stub_server.base_url, backoff_factor=0.01) as imdb:
+            assert imdb.movie_ratings("tt1375666") == imdb_data["movie_ratings"]
+        assert len(stub_server.requests) == 3
+
+    def test_agota_los_reintentos(self, stub_server):
+        """Prueba que tras agotar los reintentos se devuelve un diccionario vacío"""
+        stub_server.fail("Reviews", 500, 500, 500)
+        with IMDb("fake_api_key", base_url=stub_server.base_url, retries=2,
+                  backoff_factor=0.01) as imdb:
+            assert imdb.movie_reviews("tt1375666") == {}
+        assert len(stub_server.requests) == 3
+
+    def test_no_reintenta_errores_del_cliente(self, stub_server):
+        """Prueba que un 404 no se reintenta"""
+        stub_server.fail("SearchTitle", 404)
+        with IMDb("fake_api_key", base_url=stub_server.base_url) as imdb:
+            assert imdb.search_titles("Bambi") == {}
+        assert len(stub_server.requests) == 1
+
+    def test_timeout(self, stub_server):
+        """Prueba que una respuesta lenta corta la petición con el timeout configurado"""
+        stub_server.delay = 0.5
+        with IMDb("fake_api_key", base_url=stub_server.base_url, timeout=0.1, retries=0) as imdb:
+            with pytest.raises(requests.exceptions.ConnectionError, match="Read timed out"):
+                imdb.search_titles("Bambi")
+        assert len(stub_server.requests) == 1
+
+    def test_fetch_movie_bundle(self, stub_server, imdb_data):
+        """Prueba que reseñas y calificaciones se piden a la vez"""
+        stub_server.delay = 0.3
+        with IMDb("fake_api_key", base_url=stub_server.base_url) as imdb:
+            bundle = imdb.fetch_movie_bundle("tt1375666")
+        assert bundle == {"reviews": imdb_data["movie_reviews"],
+                          "ratings": imdb_data["movie_ratings"]}
+        # Con la demora del servidor, las dos peticiones llegan a estar en curso a la vez
+        assert stub_server.max_active == 2
+        assert sorted(path.split("/")[2] for path in stub_server.paths()) == ["Ratings", "Reviews"]
+
+class TestIMDbStreaming:
+    """Casos de prueba de la lectura incremental de reseñas"""
+
+    def test_devuelve_las_resenas(self, stub_server, imdb_data):
+        """Prueba que se obtienen las mismas reseñas que con movie_reviews"""
+        with IMDb("fake_api_key", base_url=stub_server.base_url) as imdb:
+            reviews = list(imdb.iter_movie_reviews("tt1375666", chunk_size=7))
+        assert reviews == imdb_data["movie_reviews"]["items"]
+
+    def test_proyeccion_y_limite(self, stub_server):
+        """Prueba que se conservan solo los campos pedidos y hasta limit reseñas"""
+        stub_server.review_count = 1000
+        with IMDb("fake_api_key", base_url=stub_server.base_url) as imdb:
+            reviews = list(imdb.iter_movie_reviews("tt1375666", fields=["username", "rate"], limit=3))
+            # La conexión se cerró sin leer el resto, así que la siguiente petición abre otra
+            imdb.search_titles("Bambi")
+        assert reviews == [{"username": f"user{i}", "rate": "5"} for i in range(3)]
+        assert stub_server.connections() == 2
+
+    def test_error_sin_resenas(self, stub_server):
+        """Prueba que una respuesta de error o "Invalid API Key" no devuelve reseñas"""
+        stub_server.fail("Reviews", 404)
+        with IMDb("fake_api_key", base_url=stub_server.base_url) as imdb:
+            assert list(imdb.iter_movie_reviews("tt1375666")) == []
+        with IMDb("bad-key", base_url=stub_server.base_url) as imdb:
+            assert list(imdb.iter_movie_reviews("tt1375666")) == []
+
+    def test_memoria_no_crece_con_la_respuesta(self, imdb_data):
+        """Prueba que el pico de memoria es mucho menor que al cargar toda la respuesta"""
+        # La respuesta se arma antes de medir para que solo cuente la memoria del cliente
+        reviews = imdb_data["movie_reviews"]
+        items = [dict(reviews["items"][0], username=f"user{i}") for i in range(5000)]
+        body = json.dumps({**reviews, "items": items}).encode()
+        del items
+
+        def respuesta(*args, **kwargs):
+            response = Response()
+            response.status_code = 200
+            response.raw = io.BytesIO(body)
+            return response
+
+        with IMDb("fake_api_key") as imdb, \
+                patch.object(imdb.session, "get", side_effect=respuesta):
+            tracemalloc.start()
+            total = len(imdb.movie_reviews("tt1375666")["items"])
+            _, pico_completo = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            contadas = sum(1 for _ in imdb.iter_movie_reviews("tt1375666", fields=["rate"]))
+            _, pico_incremental = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+        assert contadas == total == 5000
+        assert pico_incremental * 10 < pico_completo
+
+class FakeClock:
+    """Reloj que solo avanza cuando la prueba lo indica"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+class TestIMDbCache:
+    """Casos de prueba de la caché de respuestas del cliente"""
+
+    def test_acierto_sin_red(self, stub_server, imdb_data):
+        """Prueba que una respuesta vigente se sirve desde la caché"""
+        with IMDb("fake_api_key", base_url=stub_server.base_url, cache=MemoryCache()) as imdb:
+            for _ in range(3):
+                assert imdb.movie_ratings("tt1375666") == imdb_data["movie_ratings"]
+        assert len(stub_server.requests) == 1
+
+    def test_revalida_con_etag(self, stub_server, imdb_data):
+        """Prueba que una entrada vencida se revalida con If-None-Match"""
+        clock = FakeClock()
+        with IMDb("fake_api_key", base_url=stub_server.base_url, cache=MemoryCache(),
+                  ttls={"SearchTitle": 60}, clock=clock) as imdb:
+            imdb.search_titles("Bambi")
+            clock.now += 30
+            imdb.search_titles("Bambi")
+            clock.now += 31
+            assert imdb.search_titles("Bambi") == imdb_data["search_title"]
+            imdb.search_titles("Bambi")
+        assert stub_server.statuses == [200, 304]
+
+    def test_ttl_por_endpoint(self, stub_server):
+        """Prueba que cada endpoint vence según su TTL"""
+        clock = FakeClock()
+        with IMDb("fake_api_key", base_url=stub_server.base_url, cache=MemoryCache(),
+                  ttls={"Reviews": 10, "Ratings": 100}, clock=clock) as imdb:
+            imdb.movie_reviews("tt1375666")
+            imdb.movie_ratings("tt1375666")
+            clock.now += 50
+            imdb.movie_reviews("tt1375666")
+            imdb.movie_ratings("tt1375666")
+        assert [path.split("/")[2] for path in stub_server.paths()] == ["Reviews", "Ratings", "Reviews"]
+
+    def test_cache_negativa(self, stub_server, imdb_data):
+        """Prueba que "Invalid API Key" se guarda con el TTL negativo y un 404 no se guarda"""
+        clock = FakeClock()
+        stub_server.fail("Ratings", 404, 404)
+        with IMDb("bad-key", base_url=stub_server.base_url, cache=MemoryCache(),
+                  negative_ttl=5, clock=clock) as imdb:
+            assert imdb.search_titles("Bambi") == imdb_data["INVALID_API"]
+            assert imdb.movie_ratings("tt1375666") == {}
+            imdb.search_titles("Bambi")
+            assert imdb.movie_ratings("tt1375666") == {}
+            assert len(stub_server.requests) == 3
+            clock.now += 6
+            imdb.search_titles("Bambi")
+        assert len(stub_server.requests) == 4
+
+    def test_error_del_servidor_conserva_la_entrada_vencida(self, stub_server, imdb_data):
+        """Prueba que ante un 5xx se devuelve la entrada vencida sin reemplazarla"""
+        clock = FakeClock()
+        with IMDb("fake_api_key", base_url=stub_server.base_url, cache=MemoryCache(),
+                  ttls={"Ratings": 10}, retries=0, clock=clock) as imdb:
+            imdb.movie_ratings("tt1375666")
+            clock.now += 11
+            stub_server.fail("Ratings", 503)
+            assert imdb.movie_ratings("tt1375666") == imdb_data["movie_ratings"]
+            assert imdb.movie_ratings("tt1375666") == imdb_data["movie_ratings"]
+        assert stub_server.statuses == [200, 503, 304]
+
+    def test_sin_red_usa_la_entrada_vencida(self, stub_server, imdb_data):
+        """Prueba que un error de conexión devuelve la entrada vencida, o se propaga sin ella"""
+        clock = FakeClock()
+        with IMDb("fake_api_key", base_url=stub_server.base_url, cache=MemoryCache(),
+                  ttls={"Ratings": 10}, clock=clock) as imdb:
+            imdb.movie_ratings("tt1375666")
+            clock.now += 11
+            with patch.object(imdb.session, "get", side_effect=requests.ConnectionError("sin red")):
+                assert imdb.movie_ratings("tt1375666") == imdb_data["movie_ratings"]
+                with pytest.raises(requests.ConnectionError):
+                    imdb.movie_reviews("tt1375666")
+                assert len(imdb.cache) == 1
+
+    def test_llamadas_concurrentes_comparten_la_peticion(self, stub_server, imdb_data):
+        """Prueba que las búsquedas idénticas simultáneas hacen una sola petición"""
+        stub_server.delay = 0.2
+        resultados = []
+        with IMDb("fake_api_key", base_url=stub_server.base_url, cache=MemoryCache()) as imdb:
+            hilos = [threading.Thread(target=lambda: resultados.append(imdb.search_titles("Bambi")))
+                     for _ in range(10)]
+            for hilo in hilos:
+                hilo.start()
+            for hilo in hilos:
+                hilo.join()
+        assert resultados == [imdb_data["search_title"]] * 10
+        assert len(stub_server.requests) == 1
+
+    def test_cache_sqlite_entre_clientes(self, stub_server, imdb_data, tmp_path):
+        """Prueba que la caché SQLite sirve las respuestas a otro cliente"""
+        path = str(tmp_path / "imdb_cache.db")
+        with IMDb("fake_api_key", base_url=stub_server.base_url, cache=SQLiteCache(path)) as imdb:
+            imdb.movie_ratings("tt1375666")
+            imdb.cache.close()
+        with IMDb("fake_api_key", base_url=stub_server.base_url, cache=SQLiteCache(path)) as imdb:
+            assert imdb.movie_ratings("tt1375666") == imdb_data["movie_ratings"]
+            imdb.cache.close()
+        assert len(stub_server.requests) == 1
+        conn = sqlite3.connect(path)
+        keys = [key for key, in conn.execute("SELECT key FROM responses")]
+        conn.close()
+        assert len(keys) == 1
+        assert "fake_api_key" not in keys[0]
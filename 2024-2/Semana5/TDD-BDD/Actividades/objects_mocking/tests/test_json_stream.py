@@ -0,0 +1,65 @@
+"""
+Casos de prueba para la lectura incremental de JSON
+"""
+import json
+import os
+import sys
+import pytest
+
+# Agregar el directorio raíz al sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from models.json_stream import iter_array_items
+
+DOCUMENTO = {
+    "title": "items",
+    "note": "a \"items\": [1] ]}",
+    "nested": {"items": [9]},
+    "items": [{"u": "ñandú 😀", "c": "x]}"}, 12, -3.5e2, [1, [2]], "s", None, True, 123456],
+    "after": 1,
+}
+
+def fragmentos(data: bytes, size: int):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+class TestIterArrayItems:
+    """Casos de prueba para iter_array_items"""
+
+    @pytest.mark.parametrize("size", [1, 2, 3, 5, 7, 64, 4096])
+    @pytest.mark.parametrize("indent", [None, 2])
+    def test_cualquier_tamano_de_fragmento(self, size, indent):
+        """Prueba que los elementos no dependen de dónde se corten los fragmentos"""
+        data = json.dumps(DOCUMENTO, ensure_ascii=False, indent=indent).encode()
+        assert list(iter_array_items(fragmentos(data, size), "items")) == DOCUMENTO["items"]
+
+    def test_acepta_texto(self):
+        """Prueba que los fragmentos también pueden ser str"""
+        assert list(iter_array_items(['{"items": [1,', ' 2]}'], "items")) == [1, 2]
+
+    @pytest.mark.parametrize("documento", [
+        '{"items": null, "errorMessage": "Invalid API Key"}',
+        '{"otra": [1, 2]}',
+        '{"items": []}',
+        '{"items": [ ] }',
+    ])
+    def test_sin_elementos(self, documento):
+        """Prueba que una clave ausente, nula o vacía no devuelve elementos"""
+        assert list(iter_array_items([documento.encode()], "items")) == []
+
+    def test_lee_solo_lo_necesario(self):
+        """Prueba que al dejar de iterar no se piden más fragmentos"""
+        leidos = []
+
+        def generador():
+            for fragmento in fragmentos(b'{"items": [1, 2, 3, 4, 5, 6]}', 4):
+                leidos.append(fragmento)
+                yield fragmento
+
+        items = iter_array_items(generador(), "items")
+        assert next(items) == 1
+        items.close()
+        assert len(leidos) < 5
+
+    def test_documento_truncado(self):
+        """Prueba que un documento cortado a mitad de un elemento lanza un error"""
+        with pytest.raises(json.JSONDecodeError):
+            list(iter_array_items([b'{"items": [1, {"a"'], "items"))
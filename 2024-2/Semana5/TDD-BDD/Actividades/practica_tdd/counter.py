@@ -1,7 +1,9 @@
 from flask import Flask
 import status
+from metrics import Metrics
 
 app = Flask(__name__)
+metrics = Metrics(app)
 
 COUNTERS = {}
 
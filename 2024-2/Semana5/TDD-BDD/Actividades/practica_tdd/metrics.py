@@ -0,0 +1,346 @@
+"""
+Métricas de las peticiones de una aplicación Flask en formato Prometheus
+
+Metrics envuelve el wsgi_app de la aplicación y registra, por ruta y método,
+un histograma de la duración de las peticiones y la cantidad de respuestas
+por código de estado, además de las peticiones en curso. Las expone en
+/metrics en el formato de texto de Prometheus.
+
+Cada hilo anota en su propio buffer, sin candados; solo al leer las
+métricas se suman los buffers de todos los hilos. Los buffers de los hilos
+que terminaron se acumulan en uno solo.
+
+Con varios procesos (por ejemplo los workers de gunicorn) cada proceso tiene
+sus propias métricas. Si la variable de entorno METRICS_MULTIPROC_DIR indica
+un directorio, cada proceso escribe ahí las suyas en <pid>.json cada
+segundo y antes de responder /metrics, y /metrics suma los archivos de todos.
+Cuando un proceso termina, mark_process_dead suma sus contadores a
+dead.json, así los totales nunca bajan; lo registrado después de su última
+escritura se pierde. Ver el hook child_exit de gunicorn.conf.py en
+proyecto_iac/ansible/actividad3.
+
+Uso:
+
+    app = Flask(__name__)
+    metrics = Metrics(app)
+"""
+import atexit
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from time import perf_counter
+from typing import Optional
+from flask import current_app, request
+
+try:
+    import fcntl
+except ImportError:  # Windows, donde tampoco hay gunicorn
+    fcntl = None
+
+# Límites superiores en segundos de los buckets del histograma, los mismos
+# que usan por defecto los clientes de Prometheus
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+# Ruta de las peticiones que no coinciden con ninguna regla, como los 404
+UNMATCHED = "<unmatched>"
+MULTIPROC_ENV = "METRICS_MULTIPROC_DIR"
+# Contadores acumulados de los procesos que terminaron
+DEAD_FILE = "dead.json"
+
+
+class _Buffer:
+    """Contadores de un hilo"""
+    __slots__ = ("in_flight", "responses", "histograms")
+
+    def __init__(self):
+        self.in_flight = 0
+        # (ruta, método, código) -> respuestas
+        self.responses = {}
+        # (ruta, método) -> [cantidad por bucket, suma de las duraciones]
+        self.histograms = {}
+
+    def merge(self, other: "_Buffer") -> None:
+        """Suma a este buffer una copia de los contadores de otro"""
+        self.in_flight += other.in_flight
+        # copy() es una sola operación, así que no falla si el otro hilo agrega claves
+        for key, count in other.responses.copy().items():
+            self.responses[key] = self.responses.get(key, 0) + count
+        for key, (counts, total) in other.histograms.copy().items():
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                self.histograms[key] = [counts[:], total]
+            else:
+                histogram[0] = [a + b for a, b in zip(histogram[0], counts)]
+                histogram[1] += total
+
+    def dump(self, path: str) -> None:
+        """Escribe el buffer en un archivo JSON, reemplazándolo de una vez"""
+        data = {
+            "in_flight": self.in_flight,
+            "responses": [[*key, count] for key, count in self.responses.items()],
+            "histograms": [[*key, counts, total] for key, (counts, total) in self.histograms.items()],
+        }
+        temporary = f"{path}.{threading.get_ident()}.tmp"
+        with open(temporary, "w") as file:
+            json.dump(data, file)
+        os.replace(temporary, path)
+
+    @classmethod
+    def load(cls, path: str) -> "_Buffer":
+        """Lee un buffer escrito con dump; si el archivo no existe devuelve uno vacío"""
+        buffer = cls()
+        try:
+            with open(path) as file:
+                data = json.load(file)
+        except FileNotFoundError:
+            return buffer
+        buffer.in_flight = data["in_flight"]
+        for route, method, status, count in data["responses"]:
+            buffer.responses[(route, method, status)] = count
+        for route, method, counts, total in data["histograms"]:
+            buffer.histograms[(route, method)] = [counts, total]
+        return buffer
+
+
+class Metrics:
+    """Registra las métricas de las peticiones de una aplicación Flask"""
+
+    def __init__(self, app=None, buckets=DEFAULT_BUCKETS, path: str = "/metrics",
+                 multiprocess_dir: Optional[str] = None, flush_interval: Optional[float] = 1.0):
+        """
+        :param app: la aplicación; también se puede pasar después a init_app
+        :param buckets: límites superiores en segundos de los buckets del histograma
+        :param path: la ruta donde se exponen las métricas, que no se mide
+        :param multiprocess_dir: directorio donde los procesos suman sus
+            métricas; por defecto METRICS_MULTIPROC_DIR, y sin él cada proceso
+            expone solo las suyas
+        :param flush_interval: segundos entre escrituras en multiprocess_dir;
+            None solo escribe al responder /metrics o al llamar a flush
+        """
+        self.buckets = tuple(sorted(buckets))
+        self.path = path
+        self.multiprocess_dir = multiprocess_dir or os.environ.get(MULTIPROC_ENV) or None
+        self.flush_interval = flush_interval
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        # (hilo, buffer) de los hilos que registraron peticiones
+        self._buffers = []
+        self._retired = _Buffer()
+        # Ordena las escrituras del archivo del proceso para que nunca retroceda
+        self._flush_lock = threading.Lock()
+        self._flusher_pid = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app) -> None:
+        app.add_url_rule(self.path, "metrics", self._export)
+        app.teardown_request(self._remember_route)
+        app.wsgi_app = _MetricsMiddleware(app.wsgi_app, self)
+
+    def observe(self, route: str, method: str, status: str, duration: float) -> None:
+        """Registra una respuesta y su duración en segundos"""
+        buffer = self._buffer()
+        key = (route, method)
+        histogram = buffer.histograms.get(key)
+        if histogram is None:
+            histogram = buffer.histograms[key] = [[0] * (len(self.buckets) + 1), 0.0]
+        histogram[0][bisect_left(self.buckets, duration)] += 1
+        histogram[1] += duration
+        key = (route, method, status)
+        buffer.responses[key] = buffer.responses.get(key, 0) + 1
+
+    def collect(self) -> _Buffer:
+        """Devuelve la suma de los contadores de todos los hilos, o de todos los procesos"""
+        if self.multiprocess_dir is None:
+            return self._collect_threads()
+        # Lo que se informa queda escrito antes, así no se pierde si el proceso termina
+        self.flush()
+        total = _Buffer()
+        with _locked(self.multiprocess_dir, shared=True):
+            for name in os.listdir(self.multiprocess_dir):
+                if name.endswith(".json"):
+                    total.merge(_Buffer.load(os.path.join(self.multiprocess_dir, name)))
+        return total
+
+    def flush(self) -> None:
+        """Escribe las métricas de este proceso en multiprocess_dir"""
+        if self.multiprocess_dir is None:
+            return
+        with self._flush_lock:
+            self._collect_threads().dump(os.path.join(self.multiprocess_dir, f"{os.getpid()}.json"))
+
+    def _collect_threads(self) -> _Buffer:
+        total = _Buffer()
+        with self._lock:
+            self._retire_finished()
+            total.merge(self._retired)
+            for _, buffer in self._buffers:
+                total.merge(buffer)
+        return total
+
+    def render(self) -> str:
+        """Devuelve las métricas en el formato de texto de Prometheus"""
+        total = self.collect()
+        lines = [
+            "# HELP http_request_duration_seconds Duración de las peticiones HTTP",
+            "# TYPE http_request_duration_seconds histogram",
+        ]
+        bounds = [repr(float(bound)) for bound in self.buckets] + ["+Inf"]
+        for (route, method), (counts, duration) in sorted(total.histograms.items()):
+            labels = f'route="{_escape(route)}",method="{method}"'
+            cumulative = 0
+            for bound, count in zip(bounds, counts):
+                cumulative += count
+                lines.append(f'http_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f"http_request_duration_seconds_sum{{{labels}}} {duration!r}")
+            lines.append(f"http_request_duration_seconds_count{{{labels}}} {cumulative}")
+        lines += [
+            "# HELP http_requests_total Respuestas HTTP por código de estado",
+            "# TYPE http_requests_total counter",
+        ]
+        for (route, method, status), count in sorted(total.responses.items()):
+            lines.append(f'http_requests_total{{route="{_escape(route)}",method="{method}",'
+                         f'status="{status}"}} {count}')
+        lines += [
+            "# HELP http_requests_in_flight Peticiones HTTP en curso",
+            "# TYPE http_requests_in_flight gauge",
+            f"http_requests_in_flight {total.in_flight}",
+        ]
+        return "\n".join(lines) + "\n"
+
+    def _export(self):
+        return current_app.response_class(self.render(), content_type=CONTENT_TYPE)
+
+    @staticmethod
+    def _remember_route(exc=None) -> None:
+        # Al terminar la petición Flask la quita del environ, así que el
+        # middleware lee de ahí la regla que coincidió
+        current = request._get_current_object()
+        if current.url_rule is not None:
+            current.environ["metrics.route"] = current.url_rule.rule
+
+    def _buffer(self) -> _Buffer:
+        buffer = getattr(self._local, "buffer", None)
+        if buffer is None:
+            buffer = self._local.buffer = _Buffer()
+            with self._lock:
+                self._retire_finished()
+                self._buffers.append((threading.current_thread(), buffer))
+                self._start_flusher()
+        return buffer
+
+    def _start_flusher(self) -> None:
+        """Arranca el hilo que escribe las métricas, uno por proceso; requiere el candado"""
+        if self.multiprocess_dir is None or self._flusher_pid == os.getpid():
+            return
+        # Se compara el pid porque los hilos no sobreviven al fork de los workers
+        self._flusher_pid = os.getpid()
+        atexit.register(self._flush_at_exit)
+        if self.flush_interval is not None:
+            threading.Thread(target=self._flush_periodically, name="metrics-flush",
+                             daemon=True).start()
+
+    def _flush_periodically(self) -> None:
+        while True:
+            time.sleep(self.flush_interval)
+            self.flush()
+
+    def _flush_at_exit(self) -> None:
+        try:
+            self.flush()
+        except OSError:
+            # El directorio pudo borrarse antes de que termine el proceso
+            pass
+
+    def _retire_finished(self) -> None:
+        """Pasa los buffers de los hilos terminados al acumulado; requiere el candado"""
+        alive = []
+        for thread, buffer in self._buffers:
+            if thread.is_alive():
+                alive.append((thread, buffer))
+            else:
+                self._retired.merge(buffer)
+        self._buffers = alive
+
+
+class _MetricsMiddleware:
+    """Middleware WSGI que mide cada petición hasta que la aplicación devuelve la respuesta"""
+
+    def __init__(self, wsgi_app, metrics: Metrics):
+        self.wsgi_app = wsgi_app
+        self.metrics = metrics
+
+    def __call__(self, environ, start_response):
+        if environ.get("PATH_INFO") == self.metrics.path:
+            return self.wsgi_app(environ, start_response)
+        buffer = self.metrics._buffer()
+        # Si la aplicación lanza una excepción sin responder, se cuenta como 500
+        status = "500"
+
+        def record_status(status_line, headers, exc_info=None):
+            nonlocal status
+            status = status_line[:3]
+            return start_response(status_line, headers, exc_info)
+
+        buffer.in_flight += 1
+        start = perf_counter()
+        try:
+            return self.wsgi_app(environ, record_status)
+        finally:
+            duration = perf_counter() - start
+            buffer.in_flight -= 1
+            route = environ.get("metrics.route", UNMATCHED)
+            self.metrics.observe(route, environ.get("REQUEST_METHOD", "GET"), status, duration)
+
+
+def mark_process_dead(pid: int, directory: Optional[str] = None) -> None:
+    """Pasa los contadores de un proceso que terminó a dead.json, sin sus peticiones en curso
+
+    La llama el proceso que supervisa a los demás, como el maestro de gunicorn
+    en child_exit. Sin directorio ni METRICS_MULTIPROC_DIR no hace nada.
+    """
+    directory = directory or os.environ.get(MULTIPROC_ENV)
+    if not directory:
+        return
+    path = os.path.join(directory, f"{pid}.json")
+    # Con el candado exclusivo nadie lee el proceso dos veces ni ninguna
+    with _locked(directory, shared=False):
+        process = _Buffer.load(path)
+        process.in_flight = 0
+        dead = _Buffer.load(os.path.join(directory, DEAD_FILE))
+        dead.merge(process)
+        dead.dump(os.path.join(directory, DEAD_FILE))
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def clear_multiprocess_dir(directory: Optional[str] = None) -> None:
+    """Crea el directorio de las métricas o borra las de una ejecución anterior"""
+    directory = directory or os.environ.get(MULTIPROC_ENV)
+    if not directory:
+        return
+    os.makedirs(directory, exist_ok=True)
+    for name in os.listdir(directory):
+        if name.endswith((".json", ".tmp")):
+            os.remove(os.path.join(directory, name))
+
+
+@contextmanager
+def _locked(directory: str, shared: bool):
+    """Candado entre procesos sobre el directorio de las métricas"""
+    if fcntl is None:
+        yield
+        return
+    with open(os.path.join(directory, ".lock"), "a") as lock:
+        fcntl.flock(lock, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
@@ -0,0 +1,156 @@
+"""
+Casos de prueba para las métricas de las peticiones
+"""
+import json
+import threading
+import pytest
+from unittest.mock import patch
+from flask import Flask
+from http import HTTPStatus
+from metrics import Metrics, clear_multiprocess_dir, mark_process_dead
+
+@pytest.fixture
+def app():
+    # Aplicación de prueba con una ruta que responde, una que falla y una que espera
+    app = Flask(__name__)
+    app.metrics = Metrics(app, buckets=(0.1, 1))
+    app.release = threading.Event()
+
+    @app.route("/items/<name>")
+    def item(name):
+        return {"name": name}
+
+    @app.route("/error")
+    def error():
+        raise RuntimeError("falla")
+
+    @app.route("/lenta")
+    def lenta():
+        app.release.wait(5)
+        return ""
+
+    return app
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+def test_cuenta_por_ruta_y_codigo(client):
+    """Debe contar las respuestas por regla de la ruta, método y código"""
+    client.get("/items/a")
+    client.get("/items/b")
+    client.get("/no-existe")
+    client.get("/error")
+    text = client.get("/metrics").get_data(as_text=True)
+    assert 'http_requests_total{route="/items/<name>",method="GET",status="200"} 2' in text
+    assert 'http_requests_total{route="<unmatched>",method="GET",status="404"} 1' in text
+    assert 'http_requests_total{route="/error",method="GET",status="500"} 1' in text
+    assert "/metrics" not in text
+
+def test_histograma(app, client):
+    """Debe acumular las duraciones en buckets crecientes"""
+    app.metrics.observe("/x", "GET", "200", 0.05)
+    app.metrics.observe("/x", "GET", "200", 0.5)
+    app.metrics.observe("/x", "GET", "200", 3)
+    result = client.get("/metrics")
+    assert result.status_code == HTTPStatus.OK
+    assert result.content_type == "text/plain; version=0.0.4; charset=utf-8"
+    text = result.get_data(as_text=True)
+    assert 'http_request_duration_seconds_bucket{route="/x",method="GET",le="0.1"} 1' in text
+    assert 'http_request_duration_seconds_bucket{route="/x",method="GET",le="1.0"} 2' in text
+    assert 'http_request_duration_seconds_bucket{route="/x",method="GET",le="+Inf"} 3' in text
+    assert 'http_request_duration_seconds_sum{route="/x",method="GET"} 3.55' in text
+    assert 'http_request_duration_seconds_count{route="/x",method="GET"} 3' in text
+
+def test_peticiones_en_curso(app, client):
+    """Debe contar las peticiones que todavía no respondieron"""
+    hilo = threading.Thread(target=client.get, args=("/lenta",))
+    hilo.start()
+    try:
+        for _ in range(100):
+            if app.metrics.collect().in_flight == 1:
+                break
+            threading.Event().wait(0.01)
+        assert "http_requests_in_flight 1" in client.get("/metrics").get_data(as_text=True)
+    finally:
+        app.release.set()
+        hilo.join()
+    assert "http_requests_in_flight 0" in client.get("/metrics").get_data(as_text=True)
+
+def test_suma_los_hilos_terminados(app):
+    """Debe conservar lo registrado por hilos que ya terminaron"""
+    def pedir():
+        cliente = app.test_client()
+        for _ in range(10):
+            cliente.get("/items/a")
+
+    hilos = [threading.Thread(target=pedir) for _ in range(8)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    total = app.metrics.collect()
+    assert total.responses[("/items/<name>", "GET", "200")] == 80
+    assert len(app.metrics._buffers) <= 1
+
+@pytest.fixture
+def workers(tmp_path):
+    """Dos aplicaciones que comparten el directorio de métricas, como dos workers de gunicorn"""
+    def worker():
+        app = Flask(__name__)
+        app.metrics = Metrics(app, multiprocess_dir=str(tmp_path), flush_interval=None)
+
+        @app.route("/items/<name>")
+        def item(name):
+            return {"name": name}
+
+        return app.test_client()
+
+    return worker(), worker()
+
+def como_proceso(pid):
+    return patch("metrics.os.getpid", return_value=pid)
+
+def total_items(client):
+    text = client.get("/metrics").get_data(as_text=True)
+    for line in text.splitlines():
+        if line.startswith('http_requests_total{route="/items/<name>"'):
+            return int(line.rsplit(" ", 1)[1])
+    return 0
+
+def test_suma_los_procesos(workers):
+    """Debe exponer en /metrics la suma de las métricas de todos los procesos"""
+    primero, segundo = workers
+    with como_proceso(101):
+        primero.get("/items/a")
+        primero.get("/items/b")
+        # Lo que haría el hilo que escribe cada flush_interval
+        primero.application.metrics.flush()
+    with como_proceso(102):
+        segundo.get("/items/c")
+        assert total_items(segundo) == 3
+    with como_proceso(101):
+        assert total_items(primero) == 3
+
+def test_proceso_terminado_no_resta(workers, tmp_path):
+    """Los contadores de un proceso que terminó se conservan, sin sus peticiones en curso"""
+    primero, segundo = workers
+    with como_proceso(102):
+        segundo.get("/items/c")
+        segundo.get("/items/c")
+        assert total_items(segundo) == 2
+    mark_process_dead(102, str(tmp_path))
+    with como_proceso(101):
+        primero.get("/items/a")
+        assert total_items(primero) == 3
+    assert sorted(path.name for path in tmp_path.glob("*.json")) == ["101.json", "dead.json"]
+    assert json.loads((tmp_path / "dead.json").read_text())["in_flight"] == 0
+
+def test_borra_la_ejecucion_anterior(workers, tmp_path):
+    """Al arrancar se descartan las métricas de los procesos de la ejecución anterior"""
+    primero, _ = workers
+    with como_proceso(101):
+        primero.get("/items/a")
+        assert total_items(primero) == 1
+    clear_multiprocess_dir(str(tmp_path))
+    assert list(tmp_path.glob("*.json")) == []
@@ -2,6 +2,9 @@
 Clase Account
 """
 import logging
+from datetime import date
+from itertools import islice
+from sqlalchemy import true
 from sqlalchemy.sql import func
 from models import db
 
@@ -17,10 +20,16 @@ class Account(db.Model):
     
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(64))
-    email = db.Column(db.String(64))
+    email = db.Column(db.String(64), index=True)
     phone_number = db.Column(db.String(32), nullable=True)
     disabled = db.Column(db.Boolean(), nullable=False, default=False)
-    date_joined = db.Column(db.Date, nullable=False, server_default=func.now())
+    date_joined = db.Column(db.Date, nullable=False, server_default=func.now(), index=True)
+
+    # Las cuentas deshabilitadas son pocas, así que basta con un índice parcial sobre ellas
+    __table_args__ = (
+        db.Index("ix_account_disabled", disabled,
+                 sqlite_where=disabled == true(), postgresql_where=disabled == true()),
+    )
 
     def __repr__(self):
         return '<Account %r>' % self.name
@@ -57,6 +66,24 @@ class Account(db.Model):
     # MÉTODOS DE CLASE
     ##################################################
 
+    @classmethod
+    def create_many(cls, accounts, batch_size: int = 1000) -> int:
+        """Crea cuentas a partir de diccionarios con un INSERT por lotes y un commit por lote"""
+        logger.info("Creando cuentas en lotes de %s", batch_size)
+        columns = cls.__table__.columns
+        accounts = iter(accounts)
+        created = 0
+        while True:
+            batch = list(islice(accounts, batch_size))
+            if not batch:
+                return created
+            unknown = set().union(*batch) - set(columns.keys())
+            if unknown:
+                raise DataValidationError(f"Campos desconocidos: {', '.join(sorted(unknown))}")
+            db.session.bulk_insert_mappings(cls, batch)
+            db.session.commit()
+            created += len(batch)
+
     @classmethod
     def all(cls) -> list:
         """Devuelve todas las cuentas en la base de datos"""
@@ -73,3 +100,32 @@ class Account(db.Model):
         """
         logger.info("Buscando cuenta con id %s ...", account_id)
         return cls.query.get(account_id)
+
+    @classmethod
+    def find_by_email(cls, email: str):
+        """Encuentra una cuenta por su email
+        :param email: el email de la cuenta que se quiere encontrar
+        :type email: str
+        :return: una instancia con el email o None si no se encuentra
+        :rtype: Account
+        """
+        logger.info("Buscando cuenta con email %s ...", email)
+        return cls.query.filter(cls.email == email).first()
+
+    @classmethod
+    def find_disabled(cls) -> list:
+        """Devuelve las cuentas deshabilitadas ordenadas por id"""
+        logger.info("Procesando cuentas deshabilitadas")
+        # Se compara con true() para que la condición coincida con la del índice parcial
+        return cls.query.filter(cls.disabled == true()).order_by(cls.id).all()
+
+    @classmethod
+    def joined_between(cls, start: date, end: date) -> list:
+        """Devuelve las cuentas que se unieron entre start y end, ambos incluidos
+        :param start: la primera fecha del rango
+        :param end: la última fecha del rango
+        :return: las cuentas ordenadas por date_joined y luego por id
+        """
+        logger.info("Procesando cuentas unidas entre %s y %s", start, end)
+        return (cls.query.filter(cls.date_joined.between(start, end))
+                .order_by(cls.date_joined, cls.id).all())
@@ -0,0 +1,35 @@
+"""
+Compara area_of_a_triangle en un bucle de Python con areas_of_triangles en lote
+
+Uso: python benchmark_triangle.py [numero_de_triangulos]
+"""
+import sys
+import time
+import numpy as np
+from triangle import area_of_a_triangle, areas_of_triangles
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rng = np.random.default_rng(0)
+    bases = rng.uniform(0, 100, n)
+    heights = rng.uniform(0, 100, n)
+    base_list = bases.tolist()
+    height_list = heights.tolist()
+
+    start = time.perf_counter()
+    loop = [area_of_a_triangle(b, h) for b, h in zip(base_list, height_list)]
+    loop_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = areas_of_triangles(bases, heights)
+    batch_time = time.perf_counter() - start
+
+    assert np.allclose(loop, batch)
+    print(f"{n} triángulos")
+    print(f"bucle con area_of_a_triangle: {loop_time:.3f} s")
+    print(f"areas_of_triangles en lote:   {batch_time:.3f} s ({loop_time / batch_time:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
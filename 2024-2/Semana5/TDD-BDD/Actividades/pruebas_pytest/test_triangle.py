@@ -1,5 +1,6 @@
 from unittest import TestCase
-from triangle import area_of_a_triangle
+import numpy as np
+from triangle import area_of_a_triangle, areas_of_triangles
 
 class TestAreaOfTriangle(TestCase):
 
@@ -51,3 +52,46 @@ class TestAreaOfTriangle(TestCase):
         """Prueba que se lance TypeError con tipos nulos"""
         self.assertRaises(TypeError, area_of_a_triangle, None, 5) # prueba con nulos
         self.assertRaises(TypeError, area_of_a_triangle, 2, None)
+
+
+class TestAreasOfTriangles(TestCase):
+
+    def test_mismos_valores_que_la_version_escalar(self):
+        """Prueba que el lote coincide con area_of_a_triangle"""
+        bases = [3.4556, 2.3, 2, 4, 0, 2, 0]
+        heights = [8.3567, 5.7, 5, 6, 5, 0, 0]
+        areas = areas_of_triangles(np.array(bases), np.array(heights))
+        esperadas = [area_of_a_triangle(b, h) for b, h in zip(bases, heights)]
+        np.testing.assert_allclose(areas, esperadas)
+
+    def test_enteros(self):
+        """Prueba áreas cuando los arreglos son de enteros"""
+        areas = areas_of_triangles(np.array([2, 4], dtype=np.int32), [5, 6])
+        np.testing.assert_array_equal(areas, [5.0, 12.0])
+
+    def test_negativos_reportan_indices(self):
+        """Prueba que se lance ValueError con los índices de los valores negativos"""
+        with self.assertRaises(ValueError) as contexto:
+            areas_of_triangles([2, -2, 3, -1], [5, 5, 5, 5])
+        self.assertEqual(str(contexto.exception),
+                         "La base debe ser un número positivo (índices [1, 3], 2 en total)")
+        self.assertRaises(ValueError, areas_of_triangles, [2, 3], [5, -5])
+        with self.assertRaises(ValueError) as contexto:
+            areas_of_triangles([2, -2], [5, 5], first_index=100)
+        self.assertIn("(índices [101]", str(contexto.exception))
+
+    def test_largos_distintos(self):
+        """Prueba que bases y alturas deban ser listas del mismo largo"""
+        with self.assertRaises(ValueError) as contexto:
+            areas_of_triangles([2, 3, 4], [5, 6])
+        self.assertEqual(str(contexto.exception),
+                         "Hay 3 bases y 2 alturas; deben ser la misma cantidad")
+        self.assertRaises(ValueError, areas_of_triangles, [2, 3], 5)
+        self.assertRaises(ValueError, areas_of_triangles, [[2, 3]], [[5, 6]])
+
+    def test_tipos_invalidos(self):
+        """Prueba que se lance TypeError con booleanos, strings y nulos"""
+        self.assertRaises(TypeError, areas_of_triangles, [True, False], [5, 5])
+        self.assertRaises(TypeError, areas_of_triangles, [2, 3], ["altura", "h"])
+        self.assertRaises(TypeError, areas_of_triangles, [2, None], [5, 5])
+        self.assertRaises(TypeError, areas_of_triangles, [2, [3]], [5, 5])
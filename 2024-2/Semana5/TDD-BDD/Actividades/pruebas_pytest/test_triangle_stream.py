@@ -0,0 +1,107 @@
+import os
+import tempfile
+from unittest import TestCase
+import numpy as np
+from triangle import areas_of_triangles
+from triangle_stream import process_binary, process_csv
+
+
+class TestTriangleStream(TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.rows = np.random.default_rng(0).uniform(0, 10, (1000, 2))
+        self.expected = areas_of_triangles(self.rows[:, 0], self.rows[:, 1])
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.tmpdir.name, name)
+
+    def write_csv(self, rows, header=False):
+        with open(self.path("triangulos.csv"), "w") as archivo:
+            if header:
+                archivo.write("base,altura\n")
+            np.savetxt(archivo, rows, delimiter=",", fmt="%.17g")
+        return self.path("triangulos.csv")
+
+    def write_binary(self, rows):
+        rows.astype("<f8").tofile(self.path("triangulos.bin"))
+        return self.path("triangulos.bin")
+
+    def test_csv_por_bloques(self):
+        """Prueba que el CSV procesado por bloques da las mismas áreas"""
+        procesados = process_csv(self.write_csv(self.rows, header=True), self.path("areas.csv"),
+                                 chunk_size=64, header=True)
+        self.assertEqual(procesados, 1000)
+        np.testing.assert_allclose(np.loadtxt(self.path("areas.csv")), self.expected)
+
+    def test_binario_por_bloques(self):
+        """Prueba que el archivo binario procesado por bloques da las mismas áreas"""
+        procesados = process_binary(self.write_binary(self.rows), self.path("areas.bin"),
+                                    chunk_size=64)
+        self.assertEqual(procesados, 1000)
+        np.testing.assert_array_equal(np.fromfile(self.path("areas.bin"), dtype="<f8"),
+                                      self.expected)
+
+    def test_binario_con_procesos(self):
+        """Prueba que repartir los bloques entre procesos conserva el orden"""
+        process_binary(self.write_binary(self.rows), self.path("areas.bin"),
+                       chunk_size=50, workers=2)
+        np.testing.assert_array_equal(np.fromfile(self.path("areas.bin"), dtype="<f8"),
+                                      self.expected)
+
+    def test_csv_con_procesos(self):
+        """Prueba el CSV repartido entre procesos"""
+        process_csv(self.write_csv(self.rows), self.path("areas.csv"), chunk_size=50, workers=2)
+        np.testing.assert_allclose(np.loadtxt(self.path("areas.csv")), self.expected)
+
+    def test_archivo_vacio(self):
+        """Prueba que un archivo vacío no produce áreas"""
+        self.assertEqual(process_binary(self.write_binary(np.empty((0, 2))), self.path("areas.bin")), 0)
+        self.assertEqual(process_csv(self.write_csv(np.empty((0, 2))), self.path("areas.csv")), 0)
+
+    def test_negativos_indican_la_fila(self):
+        """Prueba que se lance ValueError con la fila del archivo de los valores negativos"""
+        self.rows[130, 1] = -1
+        with self.assertRaises(ValueError) as contexto:
+            process_binary(self.write_binary(self.rows), self.path("areas.bin"), chunk_size=64)
+        self.assertIn("La altura debe ser un número positivo (índices [130]", str(contexto.exception))
+        with self.assertRaises(ValueError) as contexto:
+            process_csv(self.write_csv(self.rows, header=True), self.path("areas.csv"),
+                        chunk_size=64, header=True, workers=2)
+        self.assertIn("(índices [130]", str(contexto.exception))
+
+    def test_csv_columnas_incorrectas(self):
+        """Prueba que una fila con otra cantidad de columnas lance ValueError con su fila"""
+        with open(self.path("triangulos.csv"), "w") as archivo:
+            archivo.write("2,5\n3,4\n1,2,3\n")
+        with self.assertRaises(ValueError) as contexto:
+            process_csv(self.path("triangulos.csv"), self.path("areas.csv"))
+        self.assertIn("fila 2", str(contexto.exception))
+
+    def test_csv_con_lineas_en_blanco(self):
+        """Prueba que la fila del error no dependa del tamaño del bloque si hay líneas en blanco"""
+        with open(self.path("triangulos.csv"), "w") as archivo:
+            archivo.write("1,2\n\n3,4\n# comentario\n5,-6\n")
+        for chunk_size in (2, 10):
+            with self.assertRaises(ValueError) as contexto:
+                process_csv(self.path("triangulos.csv"), self.path("areas.csv"),
+                            chunk_size=chunk_size)
+            self.assertIn("(índices [2]", str(contexto.exception))
+        with open(self.path("triangulos.csv"), "w") as archivo:
+            archivo.write("1,2\n\n3,4\n1,2,3\n")
+        for chunk_size in (2, 10):
+            with self.assertRaises(ValueError) as contexto:
+                process_csv(self.path("triangulos.csv"), self.path("areas.csv"),
+                            chunk_size=chunk_size)
+            self.assertIn("fila 2", str(contexto.exception))
+
+    def test_csv_no_numerico(self):
+        """Prueba que se lance TypeError con valores no numéricos"""
+        with open(self.path("triangulos.csv"), "w") as archivo:
+            archivo.write("2,5\nbase,5\n")
+        with self.assertRaises(TypeError) as contexto:
+            process_csv(self.path("triangulos.csv"), self.path("areas.csv"))
+        self.assertIn("Fila no numérica: 1", str(contexto.exception))
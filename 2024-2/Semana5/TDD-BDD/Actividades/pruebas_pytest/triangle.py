@@ -14,3 +14,57 @@ def area_of_a_triangle(base: float, height: float) -> float:
         raise ValueError("La altura debe ser un número positivo")
 
     return (base / 2) * height
+
+
+def areas_of_triangles(bases, heights, first_index: int = 0) -> "numpy.ndarray":
+    """Calcula en lote las áreas de triángulos a partir de arreglos de bases y alturas
+
+    Valida todo el arreglo de una vez con las mismas reglas que
+    area_of_a_triangle: lanza TypeError si el tipo no es entero o flotante
+    (booleanos, cadenas y nulos incluidos) y ValueError con los índices
+    de los valores negativos. Bases y alturas deben ser arreglos de una
+    dimensión del mismo largo; si no, lanza ValueError. NumPy se importa solo al usar esta función,
+    así que area_of_a_triangle no depende de ella.
+
+    :param first_index: índice del primer elemento en los mensajes de error,
+        para arreglos que son un tramo de uno mayor
+    """
+    bases = _as_numeric_array(bases, "La base debe ser un número")
+    heights = _as_numeric_array(heights, "La altura debe ser un número")
+    if bases.ndim != 1 or heights.ndim != 1:
+        raise ValueError("Las bases y las alturas deben ser secuencias de números")
+    if len(bases) != len(heights):
+        raise ValueError(f"Hay {len(bases)} bases y {len(heights)} alturas; deben ser la misma cantidad")
+
+    _check_non_negative(bases, "La base debe ser un número positivo", first_index)
+    _check_non_negative(heights, "La altura debe ser un número positivo", first_index)
+
+    return (bases / 2) * heights
+
+
+def _as_numeric_array(values, message: str) -> "numpy.ndarray":
+    """Convierte a arreglo y verifica que sea de enteros o flotantes"""
+    import numpy as np
+
+    try:
+        array = np.asarray(values)
+    except ValueError:
+        raise TypeError(message) from None
+    if array.dtype.kind not in "iuf":
+        raise TypeError(message)
+    return array
+
+
+def _check_non_negative(array: "numpy.ndarray", message: str, first_index: int = 0,
+                        max_reported: int = 10) -> None:
+    """Lanza ValueError con los índices de los valores negativos, si los hay"""
+    import numpy as np
+
+    negative = array < 0
+    if not negative.any():
+        return
+    indices = np.flatnonzero(negative) + first_index
+    reported = indices[:max_reported].tolist()
+    if len(indices) > max_reported:
+        reported.append("...")
+    raise ValueError(f"{message} (índices {reported}, {len(indices)} en total)")
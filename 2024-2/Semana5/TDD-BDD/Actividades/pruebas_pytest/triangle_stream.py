@@ -0,0 +1,149 @@
+"""
+Procesa archivos de triángulos por bloques con areas_of_triangles
+
+Formatos de entrada:
+
+- CSV: una fila "base,altura" por triángulo, con encabezado opcional. Las
+  líneas en blanco y los comentarios con "#" se saltan, como en np.loadtxt.
+- Binario: pares de float64 little-endian (base, altura) consecutivos, que
+  se leen con un memmap sin cargar el archivo en memoria.
+
+Las áreas se escriben a medida que se calculan, una por línea en CSV o como
+float64 little-endian en binario, así que la memoria usada depende del
+tamaño del bloque y no del archivo. Con workers > 0 los bloques se reparten
+entre procesos, con un número acotado de bloques en vuelo.
+
+Los errores indican la fila de datos, contando desde 0 sin el encabezado ni
+las líneas que se saltan, así que no dependen del tamaño del bloque.
+"""
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+import numpy as np
+from triangle import areas_of_triangles
+
+BINARY_DTYPE = np.dtype("<f8")
+
+# Filas del archivo binario abierto en este proceso, mapeado una sola vez
+_binary_rows_map = None
+
+
+def process_csv(input_path, output_path, chunk_size: int = 100_000,
+                workers: int = 0, header: bool = False) -> int:
+    """Calcula las áreas de un CSV de triángulos y devuelve cuántas procesó"""
+    with open(input_path) as source, open(output_path, "w") as target:
+        if header:
+            next(source, None)
+
+        def chunks():
+            # Solo las filas con datos: así el número de fila es el mismo en cualquier bloque
+            rows = (line for line in source if _has_data(line))
+            start = 0
+            while True:
+                lines = list(islice(rows, chunk_size))
+                if not lines:
+                    return
+                yield (_csv_chunk_areas, lines, start)
+                start += len(lines)
+
+        def write(areas):
+            np.savetxt(target, areas, fmt="%.17g")
+
+        return _run(chunks(), write, workers)
+
+
+def process_binary(input_path, output_path, chunk_size: int = 1_000_000,
+                   workers: int = 0) -> int:
+    """Calcula las áreas de un archivo binario de triángulos y devuelve cuántas procesó"""
+    total = _binary_rows(input_path)
+    tasks = ((_binary_chunk_areas, min(start + chunk_size, total), start)
+             for start in range(0, total, chunk_size))
+    with open(output_path, "wb") as target:
+        try:
+            return _run(tasks, lambda areas: areas.astype(BINARY_DTYPE).tofile(target), workers,
+                        initializer=_open_binary, initargs=(input_path,))
+        finally:
+            _open_binary(None)
+
+
+def _run(tasks, write, workers: int, initializer=None, initargs=()) -> int:
+    """Ejecuta las tareas en orden y escribe cada resultado en cuanto está listo
+
+    initializer(*initargs) se ejecuta una vez en cada proceso que calcula bloques.
+    """
+    processed = 0
+    if workers <= 0:
+        if initializer is not None:
+            initializer(*initargs)
+        for kernel, data, start in tasks:
+            areas = kernel(data, start)
+            write(areas)
+            processed += len(areas)
+        return processed
+    with ProcessPoolExecutor(max_workers=workers, initializer=initializer,
+                             initargs=initargs) as pool:
+        pending = deque()
+        for kernel, data, start in tasks:
+            pending.append(pool.submit(kernel, data, start))
+            # Limita los bloques en vuelo para que la memoria no crezca con el archivo
+            if len(pending) >= 2 * workers:
+                areas = pending.popleft().result()
+                write(areas)
+                processed += len(areas)
+        while pending:
+            areas = pending.popleft().result()
+            write(areas)
+            processed += len(areas)
+    return processed
+
+
+def _csv_chunk_areas(lines, start: int) -> np.ndarray:
+    try:
+        rows = np.loadtxt(lines, delimiter=",", ndmin=2)
+    except ValueError:
+        _raise_bad_csv_row(lines, start)
+    if len(rows) and rows.shape[1] != 2:
+        raise ValueError(f"Se esperaban columnas base,altura en la fila {start}")
+    return areas_of_triangles(rows[:, 0], rows[:, 1], first_index=start)
+
+
+def _has_data(line: str) -> bool:
+    """False para las líneas que np.loadtxt salta: en blanco o solo un comentario"""
+    return bool(line.split("#", 1)[0].strip())
+
+
+def _raise_bad_csv_row(lines, start: int):
+    """Lanza el error de la primera fila que loadtxt no pudo leer"""
+    for row, line in enumerate(lines, start):
+        fields = line.split("#", 1)[0].strip().split(",")
+        if len(fields) != 2:
+            raise ValueError(f"Se esperaban columnas base,altura en la fila {row}")
+        try:
+            [float(field) for field in fields]
+        except ValueError:
+            raise TypeError(f"Fila no numérica: {row}") from None
+    raise ValueError(f"No se pudo leer el bloque que empieza en la fila {start}")
+
+
+def _binary_rows(path) -> int:
+    size = os.path.getsize(path)
+    if size % (2 * BINARY_DTYPE.itemsize):
+        raise ValueError("El archivo binario debe contener pares (base, altura) de float64")
+    return size // (2 * BINARY_DTYPE.itemsize)
+
+
+def _open_binary(path) -> None:
+    """Mapea el archivo binario para los bloques de este proceso; None lo libera"""
+    global _binary_rows_map
+    _binary_rows_map = None
+    if path is not None:
+        rows = _binary_rows(path)
+        # mmap no acepta archivos vacíos
+        _binary_rows_map = (np.memmap(path, dtype=BINARY_DTYPE, mode="r", shape=(rows, 2))
+                            if rows else np.empty((0, 2), dtype=BINARY_DTYPE))
+
+
+def _binary_chunk_areas(last: int, start: int) -> np.ndarray:
+    block = _binary_rows_map[start:last]
+    return areas_of_triangles(np.asarray(block[:, 0]), np.asarray(block[:, 1]), first_index=start)
@@ -1,11 +1,28 @@
-from flask import Flask
+import os
+import zlib
+from flask import Flask, request
+from metrics import Metrics
+
 app = Flask(__name__)
+metrics = Metrics(app)
+
+# El saludo no cambia: el cuerpo y su ETag se calculan una sola vez al cargar
+# la aplicación y los navegadores pueden guardarlo una hora
+GREETING = b"<h1 style='color:green'>Greetings!</h1>"
+GREETING_ETAG = format(zlib.crc32(GREETING), "08x")
+GREETING_MAX_AGE = int(os.environ.get("GREETING_MAX_AGE", "3600"))
 
 
 @app.route('/')
 def hello():
-    return "<h1 style='color:green'>Greetings!</h1>"
+    response = app.response_class(GREETING, mimetype="text/html")
+    response.set_etag(GREETING_ETAG)
+    response.cache_control.public = True
+    response.cache_control.max_age = GREETING_MAX_AGE
+    return response.make_conditional(request)
 
 
 if __name__ == '__main__':
-    app.run(host='0.0.0.0',debug=True)
+    # Servidor de desarrollo; en producción se usa gunicorn con gunicorn.conf.py
+    # El depurador permite ejecutar código, así que solo se activa con GREETING_DEBUG=1
+    app.run(host='0.0.0.0', debug=os.environ.get("GREETING_DEBUG", "0") == "1")
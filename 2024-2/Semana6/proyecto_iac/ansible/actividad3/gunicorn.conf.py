@@ -0,0 +1,55 @@
+# Configuración de gunicorn para la aplicación Greeting
+#
+# Cada valor se puede cambiar con una variable de entorno GREETING_*, por
+# ejemplo desde greeting.service, sin editar este archivo.
+import multiprocessing
+import os
+
+
+def _env(name, default):
+    return type(default)(os.environ.get(f"GREETING_{name}", default))
+
+
+bind = _env("BIND", "0.0.0.0:5000")
+
+# Procesos: por defecto 2 por núcleo más uno
+workers = _env("WORKERS", multiprocessing.cpu_count() * 2 + 1)
+# Con más de un hilo por proceso se usa el worker gthread
+threads = _env("THREADS", 1)
+worker_class = "gthread" if threads > 1 else "sync"
+
+# Sin preload cada worker importa la aplicación, así que HUP (systemctl
+# reload) reemplaza los workers con el código nuevo sin cortar peticiones.
+# Con GREETING_PRELOAD=1 la aplicación se importa una vez en el maestro antes
+# del fork: los workers arrancan más rápido y comparten memoria, pero HUP ya
+# no carga código nuevo y un cambio en greeting.py requiere systemctl restart
+preload_app = _env("PRELOAD", 0) == 1
+
+# Segundos que se mantiene abierta una conexión sin peticiones (solo gthread)
+keepalive = _env("KEEPALIVE", 5)
+# Un worker que no responde en timeout segundos se reinicia
+timeout = _env("TIMEOUT", 30)
+# Al recargar (HUP) o detener, los workers terminan las peticiones en curso
+graceful_timeout = _env("GRACEFUL_TIMEOUT", 30)
+# Reiniciar cada worker tras unas miles de peticiones, no todos a la vez
+max_requests = _env("MAX_REQUESTS", 10000)
+max_requests_jitter = _env("MAX_REQUESTS_JITTER", 1000)
+
+accesslog = os.environ.get("GREETING_ACCESS_LOG", "-") or None
+errorlog = "-"
+
+
+# Con METRICS_MULTIPROC_DIR los workers escriben sus métricas en ese
+# directorio y /metrics las suma; ver metrics.py
+
+
+def on_starting(server):
+    """Descarta las métricas de la ejecución anterior"""
+    from metrics import clear_multiprocess_dir
+    clear_multiprocess_dir()
+
+
+def child_exit(server, worker):
+    """Conserva los contadores del worker que terminó para que los totales no bajen"""
+    from metrics import mark_process_dead
+    mark_process_dead(worker.pid)
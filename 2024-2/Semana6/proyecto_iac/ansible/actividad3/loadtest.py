@@ -0,0 +1,145 @@
+"""
+Prueba de carga local de la aplicación Greeting
+
+Levanta gunicorn con cada configuración de CONFIGURATIONS (procesos, hilos
+y preload), hace peticiones GET / desde varios clientes con conexiones
+keep-alive durante unos segundos y muestra las peticiones por segundo y la
+latencia p95 de cada una. La configuración "dev" es el servidor de
+desarrollo de Werkzeug, como referencia. Con --url se mide un servidor que
+ya está corriendo.
+
+Uso: python3 loadtest.py [--duration 5] [--clients 16] [--url http://host:5000/]
+"""
+import argparse
+import http.client
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from urllib.parse import urlsplit
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+# metrics.py vive en practica_tdd; el playbook lo copia desde ahí al servidor
+METRICS_SOURCE = os.path.normpath(os.path.join(HERE, "..", "..", "..", "..", "Semana5", "TDD-BDD",
+                                               "Actividades", "practica_tdd"))
+PORT = 5099
+
+# nombre: (procesos, hilos por proceso, preload)
+CONFIGURATIONS = {
+    "dev": None,
+    "1x1": (1, 1, False),
+    "4x1": (4, 1, False),
+    "2x4": (2, 4, False),
+    "4x4": (4, 4, False),
+    "4x4 con preload": (4, 4, True),
+}
+
+
+def server_command(configuration):
+    if configuration is None:
+        code = ("from werkzeug.serving import run_simple; from greeting import app; "
+                f"run_simple('127.0.0.1', {PORT}, app, threaded=True)")
+        return [sys.executable, "-c", code], {}
+    workers, threads, preload = configuration
+    env = {"GREETING_BIND": f"127.0.0.1:{PORT}", "GREETING_WORKERS": str(workers),
+           "GREETING_THREADS": str(threads), "GREETING_PRELOAD": str(int(preload)),
+           "GREETING_ACCESS_LOG": ""}
+    return [sys.executable, "-m", "gunicorn", "--config", "gunicorn.conf.py", "wsgi:app"], env
+
+
+def wait_until_ready(port, timeout=10.0):
+    """Espera la primera respuesta del servidor y devuelve los segundos que tardó"""
+    start = time.perf_counter()
+    while time.perf_counter() - start < timeout:
+        connection = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+        try:
+            connection.request("GET", "/")
+            if connection.getresponse().status == 200:
+                return time.perf_counter() - start
+        except (OSError, http.client.HTTPException):
+            time.sleep(0.02)
+        finally:
+            connection.close()
+    raise RuntimeError(f"el servidor no respondió en el puerto {port}")
+
+
+def run_load(url, duration, clients):
+    """Devuelve (peticiones por segundo, latencia p95 en ms, errores)"""
+    parts = urlsplit(url)
+    path = parts.path or "/"
+    stop = time.perf_counter() + duration
+    latencies, errors = [], []
+    lock = threading.Lock()
+
+    def client():
+        connection = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=5)
+        own, failed = [], 0
+        while time.perf_counter() < stop:
+            start = time.perf_counter()
+            try:
+                connection.request("GET", path)
+                response = connection.getresponse()
+                response.read()
+                if response.status != 200:
+                    failed += 1
+                if response.will_close:
+                    connection.close()
+            except (OSError, http.client.HTTPException):
+                failed += 1
+                connection.close()
+                continue
+            own.append(time.perf_counter() - start)
+        connection.close()
+        with lock:
+            latencies.extend(own)
+            errors.append(failed)
+
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95)] * 1000 if latencies else float("nan")
+    return len(latencies) / elapsed, p95, sum(errors)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--url", help="medir este servidor en lugar de levantar uno")
+    parser.add_argument("--config", action="append", choices=CONFIGURATIONS,
+                        help="configuraciones a medir; por defecto todas")
+    args = parser.parse_args()
+
+    print(f"{'configuración':<16} {'arranque s':>10} {'req/s':>10} {'p95 ms':>8} {'errores':>8}")
+    if args.url:
+        rate, p95, errors = run_load(args.url, args.duration, args.clients)
+        print(f"{args.url:<16} {'-':>10} {rate:>10.0f} {p95:>8.2f} {errors:>8}")
+        return
+    for name in args.config or CONFIGURATIONS:
+        command, env = server_command(CONFIGURATIONS[name])
+        pythonpath = os.pathsep.join(filter(None, [METRICS_SOURCE, os.environ.get("PYTHONPATH")]))
+        with tempfile.TemporaryDirectory() as metrics_dir:
+            # Como en greeting.service, los workers suman sus métricas en un directorio
+            env = {**os.environ, **env, "PYTHONPATH": pythonpath,
+                   "METRICS_MULTIPROC_DIR": metrics_dir}
+            server = subprocess.Popen(command, cwd=HERE, env=env,
+                                      stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            try:
+                startup = wait_until_ready(PORT)
+                rate, p95, errors = run_load(f"http://127.0.0.1:{PORT}/", args.duration,
+                                             args.clients)
+            finally:
+                server.terminate()
+                server.wait()
+        print(f"{name:<16} {startup:>10.2f} {rate:>10.0f} {p95:>8.2f} {errors:>8}")
+
+
+if __name__ == "__main__":
+    main()